@@ -9,6 +9,7 @@ from contrib.models import BaseModel
 from atletas.models import AtletasModels
 from categorias.models import CategoriasModels
 from centro_treinamento.models import CentroTreinamentoModels
+from stats.models import AtletasPorCategoriaModels, AtletasPorCentroTreinamentoModels, AtletasPorSexoModels, AtletasStatsDeltaModels
 from contrib.repository import *
 
 
@@ -0,0 +1,35 @@
+"""add_atletas_keyset_index
+
+Revision ID: 1df6f18be753
+Revises: 2ded450b211c
+Create Date: 2026-10-18 10:03:17.520931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1df6f18be753'
+down_revision: Union[str, Sequence[str], None] = '2ded450b211c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_atletas_created_at_pk_id', 'atletas', ['created_at', 'pk_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_atletas_created_at_pk_id', table_name='atletas',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,41 @@
+"""add_unique_index_on_id
+
+Revision ID: 2ded450b211c
+Revises: 0270930e5616
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ded450b211c'
+down_revision: Union[str, Sequence[str], None] = '0270930e5616'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('categorias', 'centros_treinamento', 'atletas')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                op.f(f'ix_{table}_id'), table, ['id'],
+                unique=True, postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                op.f(f'ix_{table}_id'), table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
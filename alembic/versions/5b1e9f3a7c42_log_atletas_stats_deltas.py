@@ -0,0 +1,206 @@
+"""log_atletas_stats_deltas
+
+Revision ID: 5b1e9f3a7c42
+Revises: dcc4b0154df2
+Create Date: 2026-10-18 22:05:48.226914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e9f3a7c42'
+down_revision: Union[str, Sequence[str], None] = 'dcc4b0154df2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOVAS = "SELECT categoria_id, centro_treinamento_id, sexo, idade, peso, altura, 1 AS sinal FROM novas"
+ANTIGAS = "SELECT categoria_id, centro_treinamento_id, sexo, idade, peso, altura, -1 AS sinal FROM antigas"
+
+
+def _registrar_delta(delta: str) -> str:
+    # Só INSERT num log sem chave única: escritas concorrentes em atletas não
+    # disputam nenhuma linha. O HAVING descarta os grupos em que o UPDATE não
+    # mexeu em nenhuma coluna agregada.
+    return f"""
+        INSERT INTO stats_atletas_delta
+            (categoria_id, centro_treinamento_id, sexo, total, soma_idade, soma_peso, soma_altura)
+        SELECT categoria_id, centro_treinamento_id, sexo,
+               sum(sinal), sum(sinal * idade), sum(sinal * peso::numeric), sum(sinal * altura::numeric)
+        FROM ({delta}) AS delta
+        GROUP BY categoria_id, centro_treinamento_id, sexo
+        HAVING sum(sinal) <> 0 OR sum(sinal * idade) <> 0
+            OR sum(sinal * peso::numeric) <> 0 OR sum(sinal * altura::numeric) <> 0;
+    """
+
+
+def _aplicar_delta_no_resumo(delta: str) -> str:
+    # versão de c26c4ea641a0, restaurada pelo downgrade
+    return f"""
+        WITH delta AS ({delta}),
+        por_categoria AS (
+            INSERT INTO stats_atletas_por_categoria AS s (categoria_id, total)
+            SELECT categoria_id, sum(sinal) FROM delta
+            GROUP BY categoria_id HAVING sum(sinal) <> 0 ORDER BY categoria_id
+            ON CONFLICT (categoria_id) DO UPDATE SET total = s.total + EXCLUDED.total
+        ),
+        por_centro AS (
+            INSERT INTO stats_atletas_por_centro_treinamento AS s (centro_treinamento_id, total)
+            SELECT centro_treinamento_id, sum(sinal) FROM delta
+            GROUP BY centro_treinamento_id HAVING sum(sinal) <> 0 ORDER BY centro_treinamento_id
+            ON CONFLICT (centro_treinamento_id) DO UPDATE SET total = s.total + EXCLUDED.total
+        )
+        INSERT INTO stats_atletas_por_sexo AS s (sexo, total, soma_idade, soma_peso, soma_altura)
+        SELECT sexo, sum(sinal), sum(sinal * idade), sum(sinal * peso), sum(sinal * altura) FROM delta
+        GROUP BY sexo
+        HAVING sum(sinal) <> 0 OR sum(sinal * idade) <> 0 OR sum(sinal * peso) <> 0 OR sum(sinal * altura) <> 0
+        ORDER BY sexo
+        ON CONFLICT (sexo) DO UPDATE SET
+            total = s.total + EXCLUDED.total,
+            soma_idade = s.soma_idade + EXCLUDED.soma_idade,
+            soma_peso = s.soma_peso + EXCLUDED.soma_peso,
+            soma_altura = s.soma_altura + EXCLUDED.soma_altura;
+    """
+
+
+# Move o log para as tabelas de resumo num único comando: o DELETE ... RETURNING
+# trava as linhas que consolida, então rollups simultâneos nunca contam o mesmo
+# delta duas vezes. O advisory lock evita que vários workers disputem a mesma
+# rodada, e os ORDER BY fixam a ordem dos locks nas linhas de resumo.
+ROLLUP = """
+    CREATE OR REPLACE FUNCTION atletas_stats_rollup() RETURNS bigint LANGUAGE plpgsql AS $$
+    DECLARE
+        consolidadas bigint;
+    BEGIN
+        IF NOT pg_try_advisory_xact_lock(hashtext('atletas_stats_rollup')) THEN
+            RETURN 0;
+        END IF;
+
+        WITH movidas AS (
+            DELETE FROM stats_atletas_delta RETURNING *
+        ),
+        por_categoria AS (
+            INSERT INTO stats_atletas_por_categoria AS s (categoria_id, total)
+            SELECT m.categoria_id, sum(m.total) FROM movidas m
+            -- uma categoria só é removida sem atletas; os deltas antigos dela não têm mais destino
+            JOIN categorias c ON c.pk_id = m.categoria_id
+            GROUP BY m.categoria_id HAVING sum(m.total) <> 0 ORDER BY m.categoria_id
+            ON CONFLICT (categoria_id) DO UPDATE SET total = s.total + EXCLUDED.total
+        ),
+        por_centro AS (
+            INSERT INTO stats_atletas_por_centro_treinamento AS s (centro_treinamento_id, total)
+            SELECT m.centro_treinamento_id, sum(m.total) FROM movidas m
+            JOIN centros_treinamento c ON c.pk_id = m.centro_treinamento_id
+            GROUP BY m.centro_treinamento_id HAVING sum(m.total) <> 0 ORDER BY m.centro_treinamento_id
+            ON CONFLICT (centro_treinamento_id) DO UPDATE SET total = s.total + EXCLUDED.total
+        ),
+        por_sexo AS (
+            INSERT INTO stats_atletas_por_sexo AS s (sexo, total, soma_idade, soma_peso, soma_altura)
+            SELECT sexo, sum(total), sum(soma_idade), sum(soma_peso), sum(soma_altura) FROM movidas
+            GROUP BY sexo ORDER BY sexo
+            ON CONFLICT (sexo) DO UPDATE SET
+                total = s.total + EXCLUDED.total,
+                soma_idade = s.soma_idade + EXCLUDED.soma_idade,
+                soma_peso = s.soma_peso + EXCLUDED.soma_peso,
+                soma_altura = s.soma_altura + EXCLUDED.soma_altura
+        )
+        SELECT count(*) INTO consolidadas FROM movidas;
+        RETURN consolidadas;
+    END
+    $$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trava atletas contra escritas até o commit: nenhuma escrita cai entre a
+    # troca dos triggers e o recálculo das somas abaixo.
+    op.execute('LOCK TABLE atletas IN SHARE MODE')
+    op.create_table('stats_atletas_delta',
+    sa.Column('pk_id', sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column('categoria_id', sa.Integer(), nullable=False),
+    sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+    sa.Column('sexo', sa.String(length=1), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('soma_idade', sa.BigInteger(), nullable=False),
+    sa.Column('soma_peso', sa.Numeric(), nullable=False),
+    sa.Column('soma_altura', sa.Numeric(), nullable=False),
+    sa.PrimaryKeyConstraint('pk_id')
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION atletas_stats_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_registrar_delta(NOVAS)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_registrar_delta(ANTIGAS)}
+            ELSE
+                {_registrar_delta(f'{NOVAS} UNION ALL {ANTIGAS}')}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION atletas_stats_reset() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM stats_atletas_delta;
+            DELETE FROM stats_atletas_por_categoria;
+            DELETE FROM stats_atletas_por_centro_treinamento;
+            DELETE FROM stats_atletas_por_sexo;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(ROLLUP)
+
+    # as somas em float acumularam o erro de cada delta: passam a numeric e são recalculadas
+    op.alter_column('stats_atletas_por_sexo', 'soma_peso', type_=sa.Numeric(), existing_type=sa.Float(),
+                    postgresql_using='soma_peso::numeric')
+    op.alter_column('stats_atletas_por_sexo', 'soma_altura', type_=sa.Numeric(), existing_type=sa.Float(),
+                    postgresql_using='soma_altura::numeric')
+    op.execute('DELETE FROM stats_atletas_por_sexo')
+    op.execute("""
+        INSERT INTO stats_atletas_por_sexo (sexo, total, soma_idade, soma_peso, soma_altura)
+        SELECT sexo, count(*), sum(idade), sum(peso::numeric), sum(altura::numeric) FROM atletas GROUP BY sexo
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # consolida o log e volta aos triggers que aplicam o delta direto no resumo (c26c4ea641a0)
+    op.execute('LOCK TABLE atletas IN SHARE MODE')
+    op.execute('SELECT atletas_stats_rollup()')
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION atletas_stats_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_aplicar_delta_no_resumo(NOVAS)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_aplicar_delta_no_resumo(ANTIGAS)}
+            ELSE
+                {_aplicar_delta_no_resumo(f'{NOVAS} UNION ALL {ANTIGAS}')}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION atletas_stats_reset() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM stats_atletas_por_categoria;
+            DELETE FROM stats_atletas_por_centro_treinamento;
+            DELETE FROM stats_atletas_por_sexo;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute('DROP FUNCTION IF EXISTS atletas_stats_rollup()')
+    op.alter_column('stats_atletas_por_sexo', 'soma_peso', type_=sa.Float(), existing_type=sa.Numeric())
+    op.alter_column('stats_atletas_por_sexo', 'soma_altura', type_=sa.Float(), existing_type=sa.Numeric())
+    op.drop_table('stats_atletas_delta')
@@ -0,0 +1,36 @@
+"""add_version_and_updated_at
+
+Revision ID: 803237af398f
+Revises: 1df6f18be753
+Create Date: 2026-10-18 11:41:05.274816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '803237af398f'
+down_revision: Union[str, Sequence[str], None] = '1df6f18be753'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('categorias', 'centros_treinamento', 'atletas')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # defaults constantes/estáveis: o PostgreSQL 11+ adiciona as colunas sem reescrever a tabela
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()))
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'version')
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,149 @@
+"""add_atletas_stats_summaries
+
+Revision ID: c26c4ea641a0
+Revises: d58d4f865b4b
+Create Date: 2026-10-18 14:08:33.917402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c26c4ea641a0'
+down_revision: Union[str, Sequence[str], None] = 'd58d4f865b4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOVAS = "SELECT categoria_id, centro_treinamento_id, sexo, idade, peso, altura, 1 AS sinal FROM novas"
+ANTIGAS = "SELECT categoria_id, centro_treinamento_id, sexo, idade, peso, altura, -1 AS sinal FROM antigas"
+
+
+def _aplicar_delta(delta: str) -> str:
+    # Um único comando aplica o delta do statement nas três tabelas. Os ORDER BY
+    # fixam a ordem dos locks entre transações concorrentes, e os HAVING evitam
+    # tocar (e travar) as linhas de resumo quando o UPDATE não mexe em nenhuma
+    # coluna agregada.
+    return f"""
+        WITH delta AS ({delta}),
+        por_categoria AS (
+            INSERT INTO stats_atletas_por_categoria AS s (categoria_id, total)
+            SELECT categoria_id, sum(sinal) FROM delta
+            GROUP BY categoria_id HAVING sum(sinal) <> 0 ORDER BY categoria_id
+            ON CONFLICT (categoria_id) DO UPDATE SET total = s.total + EXCLUDED.total
+        ),
+        por_centro AS (
+            INSERT INTO stats_atletas_por_centro_treinamento AS s (centro_treinamento_id, total)
+            SELECT centro_treinamento_id, sum(sinal) FROM delta
+            GROUP BY centro_treinamento_id HAVING sum(sinal) <> 0 ORDER BY centro_treinamento_id
+            ON CONFLICT (centro_treinamento_id) DO UPDATE SET total = s.total + EXCLUDED.total
+        )
+        INSERT INTO stats_atletas_por_sexo AS s (sexo, total, soma_idade, soma_peso, soma_altura)
+        SELECT sexo, sum(sinal), sum(sinal * idade), sum(sinal * peso), sum(sinal * altura) FROM delta
+        GROUP BY sexo
+        HAVING sum(sinal) <> 0 OR sum(sinal * idade) <> 0 OR sum(sinal * peso) <> 0 OR sum(sinal * altura) <> 0
+        ORDER BY sexo
+        ON CONFLICT (sexo) DO UPDATE SET
+            total = s.total + EXCLUDED.total,
+            soma_idade = s.soma_idade + EXCLUDED.soma_idade,
+            soma_peso = s.soma_peso + EXCLUDED.soma_peso,
+            soma_altura = s.soma_altura + EXCLUDED.soma_altura;
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stats_atletas_por_categoria',
+    sa.Column('categoria_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['categoria_id'], ['categorias.pk_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('categoria_id')
+    )
+    op.create_table('stats_atletas_por_centro_treinamento',
+    sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['centro_treinamento_id'], ['centros_treinamento.pk_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('centro_treinamento_id')
+    )
+    op.create_table('stats_atletas_por_sexo',
+    sa.Column('sexo', sa.String(length=1), nullable=False),
+    sa.Column('total', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('soma_idade', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('soma_peso', sa.Float(), server_default='0', nullable=False),
+    sa.Column('soma_altura', sa.Float(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('sexo')
+    )
+
+    op.execute(f"""
+        CREATE FUNCTION atletas_stats_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_aplicar_delta(NOVAS)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_aplicar_delta(ANTIGAS)}
+            ELSE
+                {_aplicar_delta(f'{NOVAS} UNION ALL {ANTIGAS}')}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE FUNCTION atletas_stats_reset() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM stats_atletas_por_categoria;
+            DELETE FROM stats_atletas_por_centro_treinamento;
+            DELETE FROM stats_atletas_por_sexo;
+            RETURN NULL;
+        END
+        $$
+    """)
+    # tabelas de transição exigem um trigger por evento
+    op.execute("""
+        CREATE TRIGGER atletas_stats_insert AFTER INSERT ON atletas
+        REFERENCING NEW TABLE AS novas
+        FOR EACH STATEMENT EXECUTE FUNCTION atletas_stats_refresh()
+    """)
+    op.execute("""
+        CREATE TRIGGER atletas_stats_update AFTER UPDATE ON atletas
+        REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+        FOR EACH STATEMENT EXECUTE FUNCTION atletas_stats_refresh()
+    """)
+    op.execute("""
+        CREATE TRIGGER atletas_stats_delete AFTER DELETE ON atletas
+        REFERENCING OLD TABLE AS antigas
+        FOR EACH STATEMENT EXECUTE FUNCTION atletas_stats_refresh()
+    """)
+    op.execute("""
+        CREATE TRIGGER atletas_stats_truncate AFTER TRUNCATE ON atletas
+        FOR EACH STATEMENT EXECUTE FUNCTION atletas_stats_reset()
+    """)
+
+    # Carga inicial. CREATE TRIGGER trava atletas contra escritas até o commit
+    # da migration, então nenhuma linha é contada duas vezes nem fica de fora.
+    op.execute("""
+        INSERT INTO stats_atletas_por_categoria (categoria_id, total)
+        SELECT categoria_id, count(*) FROM atletas GROUP BY categoria_id
+    """)
+    op.execute("""
+        INSERT INTO stats_atletas_por_centro_treinamento (centro_treinamento_id, total)
+        SELECT centro_treinamento_id, count(*) FROM atletas GROUP BY centro_treinamento_id
+    """)
+    op.execute("""
+        INSERT INTO stats_atletas_por_sexo (sexo, total, soma_idade, soma_peso, soma_altura)
+        SELECT sexo, count(*), sum(idade), sum(peso), sum(altura) FROM atletas GROUP BY sexo
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ('atletas_stats_truncate', 'atletas_stats_delete', 'atletas_stats_update', 'atletas_stats_insert'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger} ON atletas')
+    op.execute('DROP FUNCTION IF EXISTS atletas_stats_reset()')
+    op.execute('DROP FUNCTION IF EXISTS atletas_stats_refresh()')
+    op.drop_table('stats_atletas_por_sexo')
+    op.drop_table('stats_atletas_por_centro_treinamento')
+    op.drop_table('stats_atletas_por_categoria')
@@ -0,0 +1,55 @@
+"""add_atletas_search_indexes
+
+Revision ID: d58d4f865b4b
+Revises: 803237af398f
+Create Date: 2026-10-18 13:26:52.604187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58d4f865b4b'
+down_revision: Union[str, Sequence[str], None] = '803237af398f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_atletas_lower_nome', 'atletas', [sa.text('lower(nome) text_pattern_ops')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_atletas_nome_trgm', 'atletas', ['nome'],
+            postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            op.f('ix_atletas_categoria_id'), 'atletas', ['categoria_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            op.f('ix_atletas_centro_treinamento_id'), 'atletas', ['centro_treinamento_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # a extensão pg_trgm fica instalada: outros objetos do banco podem depender dela
+    with op.get_context().autocommit_block():
+        for index in (
+            'ix_atletas_centro_treinamento_id',
+            'ix_atletas_categoria_id',
+            'ix_atletas_nome_trgm',
+            'ix_atletas_lower_nome',
+        ):
+            op.drop_index(index, table_name='atletas', postgresql_concurrently=True, if_exists=True)
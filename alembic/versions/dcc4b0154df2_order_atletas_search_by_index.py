@@ -0,0 +1,54 @@
+"""order_atletas_search_by_index
+
+Revision ID: dcc4b0154df2
+Revises: c26c4ea641a0
+Create Date: 2026-10-18 21:42:17.508331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dcc4b0154df2'
+down_revision: Union[str, Sequence[str], None] = 'c26c4ea641a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Os índices de busca passam a entregar as linhas na ordem da listagem, para
+    # que o LIMIT pare o scan: a busca por prefixo ordena por lower(nome) em
+    # collation "C" (que também atende ao LIKE 'abc%') e a aproximada, pela
+    # distância <->, que só o GiST do pg_trgm sabe percorrer em ordem.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_atletas_lower_nome_pk_id', 'atletas', [sa.text('lower(nome) COLLATE "C"'), 'pk_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_atletas_nome_trgm_gist', 'atletas', ['nome'],
+            postgresql_using='gist', postgresql_ops={'nome': 'gist_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        for index in ('ix_atletas_nome_trgm', 'ix_atletas_lower_nome'):
+            op.drop_index(index, table_name='atletas', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_atletas_lower_nome', 'atletas', [sa.text('lower(nome) text_pattern_ops')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_atletas_nome_trgm', 'atletas', ['nome'],
+            postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        for index in ('ix_atletas_nome_trgm_gist', 'ix_atletas_lower_nome_pk_id'):
+            op.drop_index(index, table_name='atletas', postgresql_concurrently=True, if_exists=True)
@@ -1,18 +1,105 @@
+import csv
+import io
+import json
 from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import Float, String, Uuid, and_, any_, bindparam, false, func, or_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
 from atletas.models import AtletasModels
-from atletas.schema import AtletasIn, AtletasOut, AtletasUpdate, AtletaResumido
+from atletas.schema import (
+    AtletaImportacaoResultado,
+    AtletaResumido,
+    AtletasBatchGetIn,
+    AtletasBatchGetOut,
+    AtletasBulkOut,
+    AtletasBulkUpdate,
+    CategoriaOutResumido,
+    CentroTreinamentoOutResumido,
+    AtletasImportacaoOut,
+    AtletasIn,
+    AtletasOut,
+    AtletasUpdate,
+    FormatoExportacao,
+    ModoBusca,
+    StatusImportacao,
+)
 from categorias.models import CategoriasModels
 from centro_treinamento.models import CentroTreinamentoModels
-from contrib.dependencies import DatabaseDependency
-from fastapi_pagination import LimitOffsetPage, add_pagination
+from configs.database import async_session, read_session
+from configs.settings import settings
+from contrib.dependencies import READ_PRIMARY_INFO, DatabaseDependency, ReadDatabaseDependency
+from contrib.etag import make_etag, not_modified, parse_if_match
+from contrib.group_commit import GroupCommit
+from contrib.pagination import EstrategiaContagem, LimitOffsetPaginaContada, TableCounter, paginate_counted
+from contrib.reference_cache import reference_cache
+from contrib.response_cache import CachedEntity, atleta_cache
+from contrib.serialization import dump_json, json_response
+from contrib.singleflight import lookups
+from contrib.repository.atletas import insert_atletas, resolve_references
+from contrib.repository.base import delete_by_id, delete_where, exists_by_id, update_by_id, update_where
+from fastapi_pagination import add_pagination
+from fastapi_pagination.cursor import CursorPage
 from fastapi_pagination.ext.sqlalchemy import paginate
 
 router = APIRouter()
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id", "nome", "cpf", "idade", "peso", "altura", "sexo", "created_at",
+    "categoria", "centro_treinamento",
+)
+BULK_MAX_ROWS = 10000
+BATCH_GET_MAX_KEYS = 1000
+FOREIGN_KEY_VIOLATION = "23503"
+EXPORT_MEDIA_TYPES = {
+    FormatoExportacao.ndjson: "application/x-ndjson",
+    FormatoExportacao.csv: "text/csv",
+}
+
+
+async def _insert_group(rows: list[dict]) -> list:
+    """Grava um grupo de POSTs num único INSERT ... ON CONFLICT DO NOTHING e um commit.
+
+    Cada linha recebe True se foi ela que entrou: um CPF já cadastrado, ou
+    repetido dentro do grupo, fica com o id de outra linha (ou nenhum).
+    """
+    async with async_session() as db_session:
+        try:
+            inserted = await insert_atletas(db_session, rows)
+            await db_session.commit()
+            return [inserted.get(row["cpf"]) == row["id"] for row in rows]
+        except IntegrityError:
+            await db_session.rollback()
+
+    # uma categoria ou centro removido derruba o grupo: refaz linha a linha para
+    # que só as requisições afetadas recebam o erro
+    results = []
+    for row in rows:
+        async with async_session() as db_session:
+            try:
+                inserted = await insert_atletas(db_session, [row])
+                await db_session.commit()
+                results.append(inserted.get(row["cpf"]) == row["id"])
+            except IntegrityError as exc:
+                results.append(exc)
+    return results
+
+
+atletas_counter = TableCounter(AtletasModels, settings.COUNT_CACHE_RECONCILE_SECONDS)
+
+insert_group = GroupCommit(
+    _insert_group,
+    max_rows=settings.ATLETAS_GROUP_COMMIT_MAX_ROWS,
+    max_wait=settings.ATLETAS_GROUP_COMMIT_MAX_WAIT_MS / 1000,
+)
 
 @router.post(
     "/",
@@ -22,12 +109,10 @@ router = APIRouter()
 )
 async def post(db_session: DatabaseDependency, atleta_in: AtletasIn = Body(...)):
     categoria_nome = atleta_in.categoria.nome
-    centro_treinamento_nome = atleta_in.categoria.nome
+    centro_treinamento_nome = atleta_in.centro_treinamento.nome
 
-    categoria = (
-        (await db_session.execute(select(CategoriasModels).filter_by(nome=categoria_nome)))
-        .scalars()
-        .first()
+    categoria, centro_treinamento = await reference_cache.resolve(
+        db_session, categoria_nome, centro_treinamento_nome
     )
 
     if not categoria:
@@ -36,23 +121,41 @@ async def post(db_session: DatabaseDependency, atleta_in: AtletasIn = Body(...))
             detail=f"A categoria {categoria_nome} não foi encontrada.",
         )
 
-    centro_treinamento = (
-        (
-            await db_session.execute(
-                select(CentroTreinamentoModels).filter_by(nome=centro_treinamento_nome)
-            )
-        )
-        .scalars()
-        .first()
-    )
-
     if not centro_treinamento:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"O centro de treinamento {centro_treinamento_nome} não foi encontrado.",
         )
+    atleta_out = AtletasOut(id=uuid4(), created_at=datetime.now(timezone.utc), **atleta_in.model_dump())
+    if settings.ATLETAS_GROUP_COMMIT:
+        row = {
+            **atleta_out.model_dump(exclude={"categoria", "centro_treinamento"}),
+            "categoria_id": categoria.pk_id,
+            "centro_treinamento_id": centro_treinamento.pk_id,
+        }
+        try:
+            inserted = await insert_group.submit(row)
+        except IntegrityError:
+            # o único erro que sobra por linha é a chave estrangeira; CPF repetido vira inserted=False
+            reference_cache.invalidate()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A categoria {categoria_nome} ou o centro de treinamento {centro_treinamento_nome} não foi encontrado.",
+            )
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ocorreu um erro ao inserir os dados no banco",
+            )
+        if not inserted:
+            raise HTTPException(
+                status_code=status.HTTP_303_SEE_OTHER,
+                detail=f"Atleta já cadastrado com o cpf: {atleta_in.cpf}",
+            )
+        atletas_counter.add(1)
+        return atleta_out
+
     try:
-        atleta_out = AtletasOut(id=uuid4(), created_at=datetime.now(timezone.utc), **atleta_in.model_dump())
         atleta_model = AtletasModels(
             **atleta_out.model_dump(exclude={"categoria", "centro_treinamento"})
         )
@@ -61,7 +164,14 @@ async def post(db_session: DatabaseDependency, atleta_in: AtletasIn = Body(...))
 
         db_session.add(atleta_model)
         await db_session.commit()
-    except IntegrityError:
+    except IntegrityError as exc:
+        if getattr(exc.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+            # a categoria ou o centro foi removido por outro worker depois do cache carregado
+            reference_cache.invalidate()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A categoria {categoria_nome} ou o centro de treinamento {centro_treinamento_nome} não foi encontrado.",
+            )
         raise HTTPException(
             status_code=status.HTTP_303_SEE_OTHER,
             detail=f"Atleta já cadastrado com o cpf: {atleta_in.cpf}",
@@ -72,18 +182,635 @@ async def post(db_session: DatabaseDependency, atleta_in: AtletasIn = Body(...))
             detail="Ocorreu um erro ao inserir os dados no banco",
         )
 
+    atletas_counter.add(1)
     return atleta_out
 
+def _parse_bulk_body(raw: bytes, content_type: str) -> list[tuple[int, object]]:
+    if "ndjson" in content_type:
+        items = []
+        for linha, line in enumerate(raw.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append((linha, json.loads(line)))
+            except ValueError as exc:
+                items.append((linha, exc))
+        return items
+
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O corpo deve ser uma lista JSON ou NDJSON de atletas",
+        )
+    return list(enumerate(payload, start=1))
+
+async def _bulk_rows(
+    db_session: AsyncSession,
+    validos: list[tuple[int, AtletasIn]],
+    created_at: datetime,
+    resultados: dict[int, AtletaImportacaoResultado],
+) -> list[tuple[int, dict]]:
+    """Linhas prontas para o INSERT; as que citam categoria ou centro inexistente vão para `resultados` como erro."""
+    categorias, centros_treinamento = await resolve_references(
+        db_session,
+        {atleta_in.categoria.nome for _, atleta_in in validos},
+        {atleta_in.centro_treinamento.nome for _, atleta_in in validos},
+    )
+
+    rows: list[tuple[int, dict]] = []
+    for linha, atleta_in in validos:
+        categoria_id = categorias.get(atleta_in.categoria.nome)
+        centro_treinamento_id = centros_treinamento.get(atleta_in.centro_treinamento.nome)
+        if categoria_id is None or centro_treinamento_id is None:
+            detalhe = (
+                f"A categoria {atleta_in.categoria.nome} não foi encontrada."
+                if categoria_id is None
+                else f"O centro de treinamento {atleta_in.centro_treinamento.nome} não foi encontrado."
+            )
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha, cpf=atleta_in.cpf, status=StatusImportacao.erro, detalhe=detalhe
+            )
+            continue
+
+        rows.append((linha, {
+            **atleta_in.model_dump(exclude={"categoria", "centro_treinamento"}),
+            "id": uuid4(),
+            "created_at": created_at,
+            "categoria_id": categoria_id,
+            "centro_treinamento_id": centro_treinamento_id,
+        }))
+    return rows
+
+async def _insert_bulk_retry(
+    db_session: AsyncSession,
+    rows: list[tuple[int, dict]],
+    resultados: dict[int, AtletaImportacaoResultado],
+) -> dict[str, UUID]:
+    """Segunda tentativa de um lote que falhou; se falhar de novo, grava linha a linha e marca só as que falham."""
+    try:
+        inseridos = await insert_atletas(db_session, [row for _, row in rows]) if rows else {}
+        await db_session.commit()
+        return inseridos
+    except IntegrityError:
+        await db_session.rollback()
+
+    inseridos: dict[str, UUID] = {}
+    for linha, row in rows:
+        try:
+            inseridos.update(await insert_atletas(db_session, [row]))
+            await db_session.commit()
+        except IntegrityError as exc:
+            await db_session.rollback()
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha, cpf=row["cpf"], status=StatusImportacao.erro, detalhe=f"Erro de integridade: {exc.orig}"
+            )
+    return inseridos
+
+@router.post(
+    "/bulk",
+    summary="Importar atletas em lote",
+    status_code=status.HTTP_200_OK,
+    response_model=AtletasImportacaoOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/AtletasIn"}}
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def post_bulk(request: Request, db_session: DatabaseDependency) -> AtletasImportacaoOut:
+    items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(items) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote deve conter no máximo {BULK_MAX_ROWS} atletas",
+        )
+
+    resultados: dict[int, AtletaImportacaoResultado] = {}
+    validos: list[tuple[int, AtletasIn]] = []
+    cpfs_no_lote: set[str] = set()
+    for linha, item in items:
+        try:
+            if isinstance(item, Exception):
+                raise item
+            atleta_in = AtletasIn.model_validate(item)
+        except ValidationError as exc:
+            detalhe = "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'atleta'}: {error['msg']}" for error in exc.errors()
+            )
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha, status=StatusImportacao.erro, detalhe=detalhe
+            )
+            continue
+        except ValueError as exc:
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha, status=StatusImportacao.erro, detalhe=f"JSON inválido: {exc}"
+            )
+            continue
+
+        if atleta_in.cpf in cpfs_no_lote:
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha,
+                cpf=atleta_in.cpf,
+                status=StatusImportacao.conflito,
+                detalhe=f"CPF repetido no lote: {atleta_in.cpf}",
+            )
+            continue
+
+        cpfs_no_lote.add(atleta_in.cpf)
+        validos.append((linha, atleta_in))
+
+    created_at = datetime.now(timezone.utc)
+    rows = await _bulk_rows(db_session, validos, created_at, resultados)
+    try:
+        inseridos = await insert_atletas(db_session, [row for _, row in rows]) if rows else {}
+        await db_session.commit()
+    except IntegrityError:
+        # o ON CONFLICT só absorve CPFs repetidos: o que sobra costuma ser uma categoria ou
+        # centro removido depois da resolução dos nomes. Resolve de novo, o que marca as
+        # linhas afetadas como erro, e grava o restante.
+        await db_session.rollback()
+        atletas_in = dict(validos)
+        rows = await _bulk_rows(db_session, [(linha, atletas_in[linha]) for linha, _ in rows], created_at, resultados)
+        inseridos = await _insert_bulk_retry(db_session, rows, resultados)
+
+    atletas_counter.add(len(inseridos))
+
+    for linha, row in rows:
+        cpf = row["cpf"]
+        if linha in resultados:
+            continue
+        if cpf in inseridos:
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha, cpf=cpf, status=StatusImportacao.inserido, id=inseridos[cpf]
+            )
+        else:
+            resultados[linha] = AtletaImportacaoResultado(
+                linha=linha,
+                cpf=cpf,
+                status=StatusImportacao.conflito,
+                detalhe=f"Atleta já cadastrado com o cpf: {cpf}",
+            )
+
+    ordenados = [resultados[linha] for linha in sorted(resultados)]
+    return AtletasImportacaoOut(
+        total=len(items),
+        inseridos=len(inseridos),
+        conflitos=sum(r.status == StatusImportacao.conflito for r in ordenados),
+        erros=sum(r.status == StatusImportacao.erro for r in ordenados),
+        resultados=ordenados,
+    )
+
+def _bulk_criteria(categoria: Optional[str], centro_treinamento: Optional[str]) -> list:
+    # subconsultas pelo nome único: o UPDATE/DELETE continua sendo um único statement
+    # e usa os índices das chaves estrangeiras
+    criteria = []
+    if categoria:
+        criteria.append(
+            AtletasModels.categoria_id
+            == select(CategoriasModels.pk_id).filter_by(nome=categoria).scalar_subquery()
+        )
+    if centro_treinamento:
+        criteria.append(
+            AtletasModels.centro_treinamento_id
+            == select(CentroTreinamentoModels.pk_id).filter_by(nome=centro_treinamento).scalar_subquery()
+        )
+    if not criteria:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe a categoria ou o centro de treinamento dos atletas",
+        )
+    return criteria
+
+@router.patch(
+    "/bulk",
+    summary="Editar em lote os atletas de uma categoria ou centro de treinamento",
+    status_code=status.HTTP_200_OK,
+    response_model=AtletasBulkOut,
+)
+async def patch_bulk(
+    db_session: DatabaseDependency,
+    atletas_up: AtletasBulkUpdate = Body(...),
+    categoria: Optional[str] = Query(None, description="Nome da categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Nome do centro de treinamento"),
+) -> AtletasBulkOut:
+    criteria = _bulk_criteria(categoria, centro_treinamento)
+    values = atletas_up.model_dump(exclude_unset=True, exclude={"centro_treinamento"})
+
+    if atletas_up.centro_treinamento:
+        destino = atletas_up.centro_treinamento.nome
+        destino_pk_id = await db_session.scalar(
+            select(CentroTreinamentoModels.pk_id).filter_by(nome=destino)
+        )
+        if destino_pk_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"O centro de treinamento {destino} não foi encontrado.",
+            )
+        values["centro_treinamento_id"] = destino_pk_id
+
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ao menos um campo para alterar",
+        )
+
+    try:
+        afetados = await update_where(db_session, AtletasModels, values, *criteria)
+    except IntegrityError as exc:
+        if getattr(exc.orig, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+            raise
+        # o centro de destino foi removido entre a consulta e o UPDATE
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"O centro de treinamento {atletas_up.centro_treinamento.nome} não foi encontrado.",
+        )
+
+    await atleta_cache.clear()
+    return AtletasBulkOut(afetados=afetados)
+
+@router.delete(
+    "/bulk",
+    summary="Deletar em lote os atletas de uma categoria ou centro de treinamento",
+    status_code=status.HTTP_200_OK,
+    response_model=AtletasBulkOut,
+)
+async def delete_bulk(
+    db_session: DatabaseDependency,
+    categoria: Optional[str] = Query(None, description="Nome da categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Nome do centro de treinamento"),
+) -> AtletasBulkOut:
+    afetados = await delete_where(db_session, AtletasModels, *_bulk_criteria(categoria, centro_treinamento))
+    atletas_counter.add(-afetados)
+    await atleta_cache.clear()
+    return AtletasBulkOut(afetados=afetados)
+
+@router.post(
+    "/batch-get",
+    summary="Consultar vários atletas por id ou CPF",
+    status_code=status.HTTP_200_OK,
+    response_model=AtletasBatchGetOut,
+)
+async def batch_get(
+    db_session: ReadDatabaseDependency, chaves: AtletasBatchGetIn = Body(...)
+) -> AtletasBatchGetOut:
+    ids = list(dict.fromkeys(chaves.ids))
+    cpfs = list(dict.fromkeys(chaves.cpfs))
+    if len(ids) + len(cpfs) > BATCH_GET_MAX_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A consulta deve conter no máximo {BATCH_GET_MAX_KEYS} ids e CPFs",
+        )
+
+    atletas = []
+    if ids or cpfs:
+        # um único parâmetro de array por coluna: o SQL não muda com o tamanho do
+        # lote, então o prepared statement do asyncpg é reaproveitado
+        stmt = (
+            select(AtletasModels)
+            # as chaves estrangeiras são NOT NULL: INNER JOIN em vez do SELECT ... IN do lazy='selectin'
+            .options(
+                joinedload(AtletasModels.categoria, innerjoin=True),
+                joinedload(AtletasModels.centro_treinamento, innerjoin=True),
+            )
+            .filter(
+                or_(
+                    AtletasModels.id == any_(bindparam("ids", ids, type_=ARRAY(Uuid))),
+                    AtletasModels.cpf == any_(bindparam("cpfs", cpfs, type_=ARRAY(String))),
+                )
+            )
+            .order_by(AtletasModels.pk_id)
+        )
+        atletas = (await db_session.execute(stmt)).scalars().all()
+
+    encontrados_ids = {atleta.id for atleta in atletas}
+    encontrados_cpfs = {atleta.cpf for atleta in atletas}
+    return json_response(
+        AtletasBatchGetOut,
+        {
+            "atletas": atletas,
+            "ids_nao_encontrados": [atleta_id for atleta_id in ids if atleta_id not in encontrados_ids],
+            "cpfs_nao_encontrados": [cpf for cpf in cpfs if cpf not in encontrados_cpfs],
+        },
+    )
+
+def _resumido_query():
+    # Projeção explícita: evita hidratar entidades e os SELECT ... IN do lazy='selectin'
+    return (
+        select(
+            AtletasModels.nome,
+            CategoriasModels.nome.label("categoria"),
+            CentroTreinamentoModels.nome.label("centro_treinamento"),
+        )
+        .join(CategoriasModels, AtletasModels.categoria_id == CategoriasModels.pk_id)
+        .join(CentroTreinamentoModels, AtletasModels.centro_treinamento_id == CentroTreinamentoModels.pk_id)
+    )
+
+
+def _to_resumido(rows) -> list[AtletaResumido]:
+    return [
+        AtletaResumido(
+            nome=row.nome,
+            categoria=CategoriaOutResumido(nome=row.categoria),
+            centro_treinamento=CentroTreinamentoOutResumido(nome=row.centro_treinamento),
+        )
+        for row in rows
+    ]
+
 @router.get(
     "/",
     summary="Consultar todos os Atletas ",
     status_code=status.HTTP_200_OK,
-    response_model=LimitOffsetPage[AtletaResumido],
+    response_model=LimitOffsetPaginaContada[AtletaResumido],
 )
 async def query(
-    db_session: DatabaseDependency,
-) -> LimitOffsetPage[AtletaResumido]:
-    return await paginate(db_session, select(AtletasModels))
+    db_session: ReadDatabaseDependency,
+    contagem: Optional[EstrategiaContagem] = Query(None, description="Como obter o total; o padrão vem de COUNT_STRATEGY"),
+) -> LimitOffsetPaginaContada[AtletaResumido]:
+    page = await paginate_counted(
+        db_session,
+        _resumido_query().order_by(AtletasModels.pk_id),
+        AtletasModels,
+        atletas_counter,
+        contagem,
+        transformer=_to_resumido,
+    )
+    return json_response(LimitOffsetPaginaContada[AtletaResumido], page)
+
+@router.get(
+    "/cursor",
+    summary="Consultar todos os Atletas com paginação por cursor",
+    status_code=status.HTTP_200_OK,
+    response_model=CursorPage[AtletaResumido],
+)
+async def query_cursor(
+    db_session: ReadDatabaseDependency,
+) -> CursorPage[AtletaResumido]:
+    page = await paginate(
+        db_session,
+        _resumido_query().order_by(AtletasModels.created_at, AtletasModels.pk_id),
+        transformer=_to_resumido,
+    )
+    return json_response(CursorPage[AtletaResumido], page)
+
+@router.get(
+    "/search",
+    summary="Buscar atletas por nome e filtros",
+    status_code=status.HTTP_200_OK,
+    response_model=LimitOffsetPaginaContada[AtletaResumido],
+)
+async def search(
+    db_session: ReadDatabaseDependency,
+    nome: Optional[str] = Query(None, min_length=1, max_length=50, description="Nome ou parte inicial do nome do atleta"),
+    modo: ModoBusca = Query(ModoBusca.prefixo, description="prefixo: nomes que começam com o valor; aproximado: similaridade por trigramas"),
+    categoria: Optional[str] = Query(None, description="Nome da categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Nome do centro de treinamento"),
+    sexo: Optional[str] = Query(None, max_length=1, description="Gênero do atleta"),
+    idade_min: Optional[int] = Query(None, ge=0, description="Idade mínima"),
+    idade_max: Optional[int] = Query(None, ge=0, description="Idade máxima"),
+    peso_min: Optional[float] = Query(None, ge=0, description="Peso mínimo"),
+    peso_max: Optional[float] = Query(None, ge=0, description="Peso máximo"),
+    contagem: EstrategiaContagem = Query(
+        EstrategiaContagem.estimated, description="Como obter o total; estimated usa a estimativa do planner para os filtros"
+    ),
+) -> LimitOffsetPaginaContada[AtletaResumido]:
+    query = _resumido_query()
+    order_by = [AtletasModels.pk_id]
+
+    if nome and modo == ModoBusca.aproximado:
+        # nome % :nome filtra e nome <-> :nome ordena pelo índice GiST ix_atletas_nome_trgm_gist,
+        # que devolve primeiro os nomes mais próximos sem ordenar todas as ocorrências
+        query = query.filter(AtletasModels.nome.op("%")(nome))
+        order_by = [AtletasModels.nome.op("<->", return_type=Float)(nome), AtletasModels.pk_id]
+    elif nome:
+        # o mesmo lower(nome) COLLATE "C" do índice ix_atletas_lower_nome_pk_id no filtro
+        # e na ordenação: o range scan do LIKE 'abc%' já sai ordenado e o LIMIT encerra o scan
+        lower_nome = func.lower(AtletasModels.nome).collate("C")
+        query = query.filter(lower_nome.startswith(nome.lower(), autoescape=True))
+        order_by = [lower_nome, AtletasModels.pk_id]
+
+    # categorias e centros são tabelas pequenas com nome único: o filtro vira um
+    # lookup pelo nome e o acesso a atletas vai pelos índices das chaves estrangeiras
+    if categoria:
+        query = query.filter(CategoriasModels.nome == categoria)
+    if centro_treinamento:
+        query = query.filter(CentroTreinamentoModels.nome == centro_treinamento)
+    if sexo:
+        query = query.filter(AtletasModels.sexo == sexo)
+    if idade_min is not None:
+        query = query.filter(AtletasModels.idade >= idade_min)
+    if idade_max is not None:
+        query = query.filter(AtletasModels.idade <= idade_max)
+    if peso_min is not None:
+        query = query.filter(AtletasModels.peso >= peso_min)
+    if peso_max is not None:
+        query = query.filter(AtletasModels.peso <= peso_max)
+
+    filtered = query.whereclause is not None
+    page = await paginate_counted(
+        db_session, query.order_by(*order_by), AtletasModels, atletas_counter, contagem, filtered, _to_resumido
+    )
+    return json_response(LimitOffsetPaginaContada[AtletaResumido], page)
+
+def _export_query():
+    return (
+        select(
+            AtletasModels.id,
+            AtletasModels.nome,
+            AtletasModels.cpf,
+            AtletasModels.idade,
+            AtletasModels.peso,
+            AtletasModels.altura,
+            AtletasModels.sexo,
+            AtletasModels.created_at,
+            CategoriasModels.nome.label("categoria"),
+            CentroTreinamentoModels.nome.label("centro_treinamento"),
+        )
+        .join(CategoriasModels, AtletasModels.categoria_id == CategoriasModels.pk_id)
+        .join(CentroTreinamentoModels, AtletasModels.centro_treinamento_id == CentroTreinamentoModels.pk_id)
+        .order_by(AtletasModels.pk_id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(
+            {
+                "nome": row.nome,
+                "cpf": row.cpf,
+                "idade": row.idade,
+                "peso": row.peso,
+                "altura": row.altura,
+                "sexo": row.sexo,
+                "categoria": {"nome": row.categoria},
+                "centro_treinamento": {"nome": row.centro_treinamento},
+                "id": str(row.id),
+                "created_at": row.created_at.isoformat(),
+            },
+            ensure_ascii=False,
+        ) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        (
+            row.id, row.nome, row.cpf, row.idade, row.peso, row.altura, row.sexo,
+            row.created_at.isoformat(), row.categoria, row.centro_treinamento,
+        )
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def _export_rows(formato: FormatoExportacao) -> AsyncIterator[str]:
+    # A sessão da dependência é encerrada antes do corpo ser enviado, por isso
+    # o streaming abre a sua própria sessão e mantém o cursor do servidor aberto
+    # apenas enquanto o cliente consome a resposta.
+    if formato == FormatoExportacao.csv:
+        yield ",".join(EXPORT_COLUMNS) + "\r\n"
+
+    chunk = _csv_chunk if formato == FormatoExportacao.csv else _ndjson_chunk
+    async with read_session() as db_session:
+        result = await db_session.stream(_export_query())
+        async for rows in result.partitions():
+            yield chunk(rows)
+
+
+@router.get(
+    "/export",
+    summary="Exportar todos os atletas em NDJSON ou CSV",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export(
+    formato: FormatoExportacao = Query(FormatoExportacao.ndjson, description="Formato do arquivo exportado"),
+) -> StreamingResponse:
+    return StreamingResponse(
+        _export_rows(formato),
+        media_type=EXPORT_MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="atletas.{formato.value}"'},
+    )
+
+def _versions_query():
+    return (
+        select(AtletasModels.version, CategoriasModels.version, CentroTreinamentoModels.version)
+        .join(CategoriasModels, AtletasModels.categoria_id == CategoriasModels.pk_id)
+        .join(CentroTreinamentoModels, AtletasModels.centro_treinamento_id == CentroTreinamentoModels.pk_id)
+    )
+
+
+def _etag(atleta: AtletasModels) -> str:
+    # a representação inclui os nomes da categoria e do centro, então as versões deles entram na ETag
+    return make_etag(atleta.version, atleta.categoria.version, atleta.centro_treinamento.version)
+
+
+def _if_match_criteria(if_match: str) -> tuple:
+    expected = parse_if_match(if_match)
+    if expected is None:
+        return ()
+
+    categoria_version = (
+        select(CategoriasModels.version)
+        .where(CategoriasModels.pk_id == AtletasModels.categoria_id)
+        .scalar_subquery()
+    )
+    centro_treinamento_version = (
+        select(CentroTreinamentoModels.version)
+        .where(CentroTreinamentoModels.pk_id == AtletasModels.centro_treinamento_id)
+        .scalar_subquery()
+    )
+    return (
+        or_(
+            false(),
+            *(
+                and_(
+                    AtletasModels.version == versions[0],
+                    categoria_version == versions[1],
+                    centro_treinamento_version == versions[2],
+                )
+                for versions in expected
+                if len(versions) == 3
+            ),
+        ),
+    )
+
+
+def _cache_keys(atleta) -> tuple[str, str]:
+    return f"id:{atleta.id}", f"cpf:{atleta.cpf}"
+
+
+def _uses_cache(db_session: AsyncSession) -> bool:
+    # um cliente fixado no primário (read-your-writes) precisa ver a própria escrita, não o cache
+    return atleta_cache.enabled and not db_session.info.get(READ_PRIMARY_INFO)
+
+
+async def _from_cache(db_session: AsyncSession, key: str, if_none_match: Optional[str]) -> Optional[Response]:
+    if not _uses_cache(db_session):
+        return None
+    # um hit responde sem executar nenhuma query: a AsyncSession só pega conexão no primeiro execute
+    cached = await atleta_cache.get(key)
+    if cached is None:
+        return None
+    return not_modified(if_none_match, cached.etag) or cached.to_response()
+
+
+async def _lookup(db_session: AsyncSession, key: str, criteria) -> Optional[CachedEntity]:
+    """Busca e serializa um atleta, compartilhando a consulta entre requisições simultâneas."""
+
+    # A busca roda na sessão da requisição (réplica ou primário) e pode preencher
+    # o cache mesmo vinda de uma réplica: a lápide deixada pela escrita dura mais
+    # que o atraso de replicação e a geração descarta buscas anteriores a ela.
+    fill = _uses_cache(db_session)
+    bind = db_session.bind
+
+    async def fetch() -> Optional[CachedEntity]:
+        generation = atleta_cache.generation
+        # sessão própria: a consulta compartilhada não depende da requisição que a disparou
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            atleta = (await session.execute(select(AtletasModels).filter(criteria))).scalars().first()
+            if atleta is None:
+                return None
+            entity = CachedEntity(_etag(atleta), dump_json(AtletasOut, atleta))
+        if fill:
+            await atleta_cache.set(_cache_keys(atleta), entity, generation)
+        return entity
+
+    # o engine entra na chave: um cliente fixado no primário não recebe o resultado de uma réplica
+    return await lookups.do(("atletas", key, bind), fetch)
+
+
+async def _lookup_etag(db_session: AsyncSession, key: str, criteria) -> Optional[str]:
+    """ETag atual de um atleta lida só das colunas de versão, também compartilhada entre requisições."""
+
+    async def fetch() -> Optional[str]:
+        async with AsyncSession(db_session.bind) as session:
+            versions = (await session.execute(_versions_query().filter(criteria))).first()
+        return make_etag(*versions) if versions else None
+
+    return await lookups.do(("atletas-version", key, db_session.bind), fetch)
+
+
+async def _revalidate(db_session: AsyncSession, key: str, criteria, if_none_match: Optional[str]) -> Optional[Response]:
+    # uma revalidação com a ETag atual responde 304 sem carregar as relações nem serializar o corpo;
+    # quando ela não casa, a requisição segue para a busca completa
+    if not if_none_match:
+        return None
+    etag = await _lookup_etag(db_session, key, criteria)
+    return not_modified(if_none_match, etag) if etag else None
 
 @router.get(
     "/{id}",
@@ -91,7 +818,11 @@ async def query(
     status_code=status.HTTP_200_OK,
     response_model=AtletasOut,
 )
-async def get(id: str, db_session: DatabaseDependency) -> AtletasOut:
+async def get(
+    id: str,
+    db_session: ReadDatabaseDependency,
+    if_none_match: Optional[str] = Header(None),
+) -> AtletasOut:
     try:
         atleta_id = UUID(id)
     except ValueError:
@@ -99,19 +830,22 @@ async def get(id: str, db_session: DatabaseDependency) -> AtletasOut:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado no id: {id}",
         )
-    atleta: AtletasOut = (
-        (await db_session.execute(select(AtletasModels).filter_by(id=atleta_id)))
-        .scalars()
-        .first()
-    )
 
-    if not atleta:
+    if cached := await _from_cache(db_session, f"id:{atleta_id}", if_none_match):
+        return cached
+
+    if revalidated := await _revalidate(db_session, f"id:{atleta_id}", AtletasModels.id == atleta_id, if_none_match):
+        return revalidated
+
+    entity = await _lookup(db_session, f"id:{atleta_id}", AtletasModels.id == atleta_id)
+    if entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado no id: {id}",
         )
 
-    return atleta
+    # a versão pode ter mudado entre as duas consultas
+    return not_modified(if_none_match, entity.etag) or entity.to_response()
 
 @router.get(
     "/nome/{nome}",
@@ -119,20 +853,16 @@ async def get(id: str, db_session: DatabaseDependency) -> AtletasOut:
     status_code=status.HTTP_200_OK,
     response_model=AtletasOut,
 )
-async def get_by_name(nome: str, db_session: DatabaseDependency) -> AtletasOut:
-    atleta: AtletasOut = (
-        (await db_session.execute(select(AtletasModels).filter_by(nome=nome)))
-        .scalars()
-        .first()
-    )
-
-    if not atleta:
+async def get_by_name(nome: str, db_session: ReadDatabaseDependency) -> AtletasOut:
+    entity = await _lookup(db_session, f"nome:{nome}", AtletasModels.nome == nome)
+    if entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado com o nome: {nome}",
         )
 
-    return atleta
+    # o nome não é único, então não vira chave; o resultado só aquece as chaves id e cpf
+    return entity.to_response()
 
 @router.get(
     "/cpf/{cpf}",
@@ -140,20 +870,25 @@ async def get_by_name(nome: str, db_session: DatabaseDependency) -> AtletasOut:
     status_code=status.HTTP_200_OK,
     response_model=AtletasOut,
 )
-async def get_by_cpf(cpf: str, db_session: DatabaseDependency) -> AtletasOut:
-    atleta: AtletasOut = (
-        (await db_session.execute(select(AtletasModels).filter_by(cpf=cpf)))
-        .scalars()
-        .first()
-    )
+async def get_by_cpf(
+    cpf: str,
+    db_session: ReadDatabaseDependency,
+    if_none_match: Optional[str] = Header(None),
+) -> AtletasOut:
+    if cached := await _from_cache(db_session, f"cpf:{cpf}", if_none_match):
+        return cached
 
-    if not atleta:
+    if revalidated := await _revalidate(db_session, f"cpf:{cpf}", AtletasModels.cpf == cpf, if_none_match):
+        return revalidated
+
+    entity = await _lookup(db_session, f"cpf:{cpf}", AtletasModels.cpf == cpf)
+    if entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado com o CPF: {cpf}",
         )
 
-    return atleta
+    return not_modified(if_none_match, entity.etag) or entity.to_response()
 
 @router.patch(
     "/{id}",
@@ -162,7 +897,11 @@ async def get_by_cpf(cpf: str, db_session: DatabaseDependency) -> AtletasOut:
     response_model=AtletasOut,
 )
 async def patch(
-    id: str, db_session: DatabaseDependency, atleta_up: AtletasUpdate = Body(...)
+    id: str,
+    db_session: DatabaseDependency,
+    response: Response,
+    atleta_up: AtletasUpdate = Body(...),
+    if_match: Optional[str] = Header(None),
 ) -> AtletasOut:
     try:
         atleta_id = UUID(id)
@@ -171,25 +910,24 @@ async def patch(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado no id: {id}",
         )
-    atleta: AtletasOut = (
-        (await db_session.execute(select(AtletasModels).filter_by(id=atleta_id)))
-        .scalars()
-        .first()
+    criteria = _if_match_criteria(if_match) if if_match else ()
+    atleta = await update_by_id(
+        db_session, AtletasModels, atleta_id, atleta_up.model_dump(exclude_unset=True), *criteria
     )
 
     if not atleta:
+        if criteria and await exists_by_id(db_session, AtletasModels, atleta_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"O atleta {id} foi alterado desde a versão informada em If-Match",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado no id: {id}",
         )
 
-    atleta_update = atleta_up.model_dump(exclude_unset=True)
-    for key, value in atleta_update.items():
-        setattr(atleta, key, value)
-
-    await db_session.commit()
-    await db_session.refresh(atleta)
-
+    await atleta_cache.invalidate(*_cache_keys(atleta))
+    response.headers["ETag"] = _etag(atleta)
     return atleta
 
 @router.delete(
@@ -205,19 +943,14 @@ async def delete(id: str, db_session: DatabaseDependency) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado no id: {id}",
         )
-    atleta: AtletasOut = (
-        (await db_session.execute(select(AtletasModels).filter_by(id=atleta_id)))
-        .scalars()
-        .first()
-    )
-
-    if not atleta:
+    deleted = await delete_by_id(db_session, AtletasModels, atleta_id, AtletasModels.id, AtletasModels.cpf)
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Atleta não encontrado no id: {id}",
         )
 
-    await db_session.delete(atleta)
-    await db_session.commit()
+    atletas_counter.add(-1)
+    await atleta_cache.invalidate(*_cache_keys(deleted))
 
 add_pagination(router)
@@ -2,7 +2,7 @@ from datetime import datetime
 from sqlalchemy.types import DateTime
 
 from contrib.models import BaseModel
-from sqlalchemy import ForeignKey, Integer, String, Float   
+from sqlalchemy import ForeignKey, Index, Integer, String, Float, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -10,6 +10,14 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 class AtletasModels(BaseModel):
     __tablename__= 'atletas'
+    __table_args__ = (
+        Index('ix_atletas_created_at_pk_id', 'created_at', 'pk_id'),
+        # busca por prefixo: em collation "C", lower(nome) LIKE 'abc%' vira um range scan
+        # que já devolve as linhas na ordem (lower(nome), pk_id) da listagem
+        Index('ix_atletas_lower_nome_pk_id', func.lower(text('nome')).collate('C'), 'pk_id').ddl_if(dialect='postgresql'),
+        # busca aproximada: operador % do pg_trgm, com a ordenação por distância (<->) vinda do índice
+        Index('ix_atletas_nome_trgm_gist', 'nome', postgresql_using='gist', postgresql_ops={'nome': 'gist_trgm_ops'}),
+    )
 
     pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     nome: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -19,7 +27,9 @@ class AtletasModels(BaseModel):
     altura: Mapped[float] = mapped_column(Float, nullable=False)
     sexo: Mapped[str] = mapped_column(String(1), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default='1')
     categoria: Mapped['CategoriasModels'] = relationship(back_populates='atletas', lazy='selectin')
-    categoria_id: Mapped[int] = mapped_column(ForeignKey('categorias.pk_id'))
+    categoria_id: Mapped[int] = mapped_column(ForeignKey('categorias.pk_id'), index=True)
     centro_treinamento: Mapped['CentroTreinamentoModels'] = relationship(back_populates='atletas', lazy='selectin')
-    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
\ No newline at end of file
+    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'), index=True)
\ No newline at end of file
@@ -1,4 +1,6 @@
-from pydantic import Field, PositiveFloat, ConfigDict
+from enum import Enum
+from uuid import UUID
+from pydantic import UUID4, Field, PositiveFloat, ConfigDict
 from typing import Annotated, Optional
 
 # Update the import path below to the correct location of BaseSchema, for example:
@@ -44,4 +46,48 @@ class AtletaResumido(BaseSchema):
     categoria: CategoriaOutResumido
     centro_treinamento: CentroTreinamentoOutResumido
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ModoBusca(str, Enum):
+    prefixo = 'prefixo'
+    aproximado = 'aproximado'
+
+class FormatoExportacao(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+class StatusImportacao(str, Enum):
+    inserido = 'inserido'
+    conflito = 'conflito'
+    erro = 'erro'
+
+class AtletaImportacaoResultado(BaseSchema):
+    linha: Annotated[int, Field(description='Posição do atleta no lote enviado, começando em 1')]
+    cpf: Annotated[Optional[str], Field(None, description='CPF do atleta', example='12345678901')]
+    status: Annotated[StatusImportacao, Field(description='Resultado da importação da linha')]
+    id: Annotated[Optional[UUID4], Field(None, description='Identificador do atleta criado')]
+    detalhe: Annotated[Optional[str], Field(None, description='Motivo do conflito ou erro')]
+
+class AtletasImportacaoOut(BaseSchema):
+    total: Annotated[int, Field(description='Quantidade de linhas recebidas')]
+    inseridos: Annotated[int, Field(description='Quantidade de atletas criados')]
+    conflitos: Annotated[int, Field(description='Quantidade de CPFs já cadastrados ou repetidos no lote')]
+    erros: Annotated[int, Field(description='Quantidade de linhas inválidas')]
+    resultados: list[AtletaImportacaoResultado]
+
+class AtletasBatchGetIn(BaseSchema):
+    ids: Annotated[list[UUID], Field(default_factory=list, description='Identificadores dos atletas')]
+    cpfs: Annotated[list[str], Field(default_factory=list, description='CPFs dos atletas', example=['12345678901'])]
+
+class AtletasBatchGetOut(BaseSchema):
+    atletas: list[AtletasOut]
+    ids_nao_encontrados: Annotated[list[UUID], Field(description='Identificadores sem atleta correspondente')]
+    cpfs_nao_encontrados: Annotated[list[str], Field(description='CPFs sem atleta correspondente')]
+
+class AtletasBulkUpdate(AtletasUpdate):
+    centro_treinamento: Annotated[
+        Optional[CentroTreinamentoAtleta], Field(None, description='Centro de treinamento para onde os atletas serão movidos')
+    ]
+
+class AtletasBulkOut(BaseSchema):
+    afetados: Annotated[int, Field(description='Quantidade de atletas alterados ou removidos')]
@@ -0,0 +1,11 @@
+"""Utilitários compartilhados pelos scripts de benchmarks."""
+from configs.settings import settings
+
+
+def dsn() -> str:
+    return settings.DB_URL.replace('postgresql+asyncpg://', 'postgresql://')
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
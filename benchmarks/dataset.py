@@ -0,0 +1,96 @@
+"""Geração determinística de categorias, centros de treinamento e atletas para os benchmarks."""
+import random
+from itertools import accumulate
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+NOMES = (
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Heitor', 'Isabela', 'João',
+    'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Thiago', 'Valéria', 'Yuri',
+)
+SOBRENOMES = (
+    'Almeida', 'Barbosa', 'Cardoso', 'Costa', 'Ferreira', 'Gomes', 'Lima', 'Martins', 'Oliveira', 'Pereira',
+    'Ribeiro', 'Rocha', 'Santos', 'Silva', 'Souza', 'Teixeira',
+)
+PROPRIETARIOS = ('Felipe', 'Mariana', 'Ricardo', 'Juliana', 'Fernando', 'Camila')
+# data fixa para que a mesma semente gere sempre a mesma base
+REFERENCIA = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _digito(digitos: list[int]) -> int:
+    peso = len(digitos) + 1
+    resto = sum(d * (peso - i) for i, d in enumerate(digitos)) % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def cpf(base: int) -> str:
+    """CPF válido a partir dos 9 primeiros dígitos (`base` entre 0 e 999_999_999)."""
+    digitos = [int(c) for c in f'{base:09d}']
+    digitos.append(_digito(digitos))
+    digitos.append(_digito(digitos))
+    return ''.join(map(str, digitos))
+
+
+def uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def categoria_nome(i: int) -> str:
+    return f'Cat {i}'
+
+
+def centro_nome(i: int) -> str:
+    return f'CT Bench {i}'
+
+
+def categorias(n: int, rng: random.Random, created_at: datetime) -> list[tuple]:
+    return [(uuid(rng), categoria_nome(i), created_at) for i in range(n)]
+
+
+def centros(n: int, rng: random.Random, created_at: datetime) -> list[tuple]:
+    return [
+        (uuid(rng), centro_nome(i), f'Rua {rng.randint(1, 999)}, {rng.randint(1, 2000)}', rng.choice(PROPRIETARIOS), created_at)
+        for i in range(n)
+    ]
+
+
+def atleta(rng: random.Random, base_cpf: int) -> dict:
+    """Campos de um atleta no formato de AtletasIn, sem categoria e centro."""
+    return {
+        'nome': f'{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}',
+        'cpf': cpf(base_cpf),
+        'idade': rng.randint(16, 60),
+        'peso': round(rng.uniform(50, 120), 1),
+        'altura': round(rng.uniform(1.5, 2.05), 2),
+        'sexo': rng.choice('MF'),
+    }
+
+
+def atletas(n: int, rng: random.Random, categoria_ids: list[int], centro_ids: list[int]):
+    """Gera tuplas na ordem das colunas de `ATLETAS_COLUMNS`.
+
+    Os CPFs vêm de uma sequência com passo coprimo de 10^9, então não se repetem
+    e não ficam ordenados; o centro segue uma distribuição enviesada, como na
+    base real, em que poucos centros concentram a maioria dos atletas.
+    """
+    inicio = rng.randrange(10**9)
+    pesos_centros = list(accumulate(1 / (i + 1) for i in range(len(centro_ids))))
+    for i in range(n):
+        dados = atleta(rng, (inicio + i * 7_368_787) % 10**9)
+        yield (
+            uuid(rng),
+            dados['nome'],
+            dados['cpf'],
+            dados['idade'],
+            dados['peso'],
+            dados['altura'],
+            dados['sexo'],
+            REFERENCIA - timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+            rng.choice(categoria_ids),
+            rng.choices(centro_ids, cum_weights=pesos_centros)[0],
+        )
+
+
+ATLETAS_COLUMNS = (
+    'id', 'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo', 'created_at', 'categoria_id', 'centro_treinamento_id',
+)
@@ -0,0 +1,79 @@
+"""Latência da consulta por `id` antes e depois do índice único.
+
+Cria uma tabela descartável com o mesmo formato de `atletas`, popula N linhas
+no próprio servidor e mede `SELECT ... WHERE id = $1` sem índice e com o
+índice criado pela migração `2ded450b211c`.
+
+    python -m benchmarks.id_lookup --rows 1000000 --lookups 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import asyncpg
+
+from benchmarks.common import dsn, percentile
+
+TABLE = 'bench_id_lookup'
+
+
+async def measure(conn: asyncpg.Connection, ids: list, label: str) -> dict:
+    stmt = await conn.prepare(f'SELECT pk_id, nome, cpf FROM {TABLE} WHERE id = $1')
+    plan = await conn.fetchval(f'EXPLAIN (FORMAT TEXT) SELECT pk_id FROM {TABLE} WHERE id = $1', ids[0])
+    samples = []
+    for atleta_id in ids:
+        start = time.perf_counter()
+        await stmt.fetchrow(atleta_id)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'cenario': label,
+        'plano': plan,
+        'p50_ms': round(percentile(samples, 0.50), 3),
+        'p95_ms': round(percentile(samples, 0.95), 3),
+        'media_ms': round(statistics.fmean(samples), 3),
+    }
+
+
+async def main(rows: int, lookups: int) -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await conn.execute(f'DROP TABLE IF EXISTS {TABLE}')
+        await conn.execute(
+            f'CREATE TABLE {TABLE} ('
+            ' pk_id serial PRIMARY KEY, id uuid NOT NULL,'
+            ' nome varchar(50) NOT NULL, cpf varchar(11) NOT NULL)'
+        )
+        await conn.execute(
+            f'INSERT INTO {TABLE} (id, nome, cpf)'
+            " SELECT md5(i::text)::uuid, 'Atleta ' || i, lpad(i::text, 11, '0')"
+            ' FROM generate_series(1, $1) AS i',
+            rows,
+        )
+        await conn.execute(f'ANALYZE {TABLE}')
+        ids = [
+            row['id'] for row in await conn.fetch(
+                f'SELECT id FROM {TABLE} WHERE pk_id = ANY($1::int[])',
+                random.sample(range(1, rows + 1), min(lookups, rows)),
+            )
+        ]
+
+        antes = await measure(conn, ids, 'sem_indice')
+        await conn.execute(f'CREATE UNIQUE INDEX ix_{TABLE}_id ON {TABLE} (id)')
+        await conn.execute(f'ANALYZE {TABLE}')
+        depois = await measure(conn, ids, 'indice_unico')
+
+        print(json.dumps({'linhas': rows, 'consultas': len(ids), 'resultados': [antes, depois]}, indent=2))
+    finally:
+        await conn.execute(f'DROP TABLE IF EXISTS {TABLE}')
+        await conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.lookups))
@@ -0,0 +1,338 @@
+"""Driver de carga assíncrono para todas as rotas de contrib/routers.py.
+
+Lê uma amostra da base (categorias, centros e a primeira parte do export de
+atletas), dispara requisições com um mix ponderado de leituras e escritas por
+N workers durante D segundos e imprime, por rota, p50/p95/p99, vazão e códigos
+de status em JSON. Escritas de PATCH e DELETE só atingem registros criados pela
+própria execução, então a base semeada por benchmarks.seed não se altera: os
+PATCH e DELETE em lote filtram por uma categoria criada no início da execução,
+onde caem os atletas de POST /atletas/bulk.
+
+    python -m benchmarks.load --base-url http://localhost:8000 --duration 30 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+
+from benchmarks import dataset
+from benchmarks.common import percentile
+
+AMOSTRA_ATLETAS = 2000
+BULK_SIZE = 20
+# páginas seguidas pelo cursor antes de voltar à primeira
+CURSOR_PAGINAS = 20
+
+
+@dataclass
+class Amostra:
+    atletas: list[dict] = field(default_factory=list)
+    categorias: list[dict] = field(default_factory=list)
+    centros: list[dict] = field(default_factory=list)
+    # criados por esta execução: os únicos alvos de PATCH e DELETE
+    novos_atletas: list[str] = field(default_factory=list)
+    novas_categorias: list[str] = field(default_factory=list)
+    novos_centros: list[str] = field(default_factory=list)
+    # alvo dos PATCH e DELETE em lote, criada por carregar_amostra
+    categoria_lote: str = ''
+    # posição da navegação por cursor, compartilhada pelos workers
+    cursor_atletas: Optional[str] = None
+    paginas_cursor: int = 0
+
+
+@dataclass
+class Medicoes:
+    latencias: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    status: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+    def registrar(self, rota: str, inicio: float, status: int | str) -> None:
+        self.latencias[rota].append((time.perf_counter() - inicio) * 1000)
+        self.status[rota][str(status)] += 1
+
+
+async def carregar_amostra(client: httpx.AsyncClient) -> Amostra:
+    amostra = Amostra()
+    amostra.categorias = (await client.get('/categorias/', params={'size': 100})).json()['items']
+    amostra.centros = (await client.get('/centro_treinamento/', params={'size': 100})).json()['items']
+    async with client.stream('GET', '/atletas/export') as response:
+        async for line in response.aiter_lines():
+            if line:
+                amostra.atletas.append(json.loads(line))
+            if len(amostra.atletas) >= AMOSTRA_ATLETAS:
+                break
+    if not (amostra.categorias and amostra.centros and amostra.atletas):
+        raise SystemExit('Base vazia: rode `python -m benchmarks.seed` antes do driver')
+    # nome único por execução (máximo de 10 caracteres), fora do gerador com semente
+    amostra.categoria_lote = f'l{random.SystemRandom().getrandbits(32):08x}'
+    response = await client.post('/categorias/', json={'nome': amostra.categoria_lote})
+    response.raise_for_status()
+    return amostra
+
+
+def novo_atleta(amostra: Amostra, rng: random.Random) -> dict:
+    return {
+        **dataset.atleta(rng, rng.randrange(10**9)),
+        'categoria': {'nome': rng.choice(amostra.categorias)['nome']},
+        'centro_treinamento': {'nome': rng.choice(amostra.centros)['nome']},
+    }
+
+
+# Cada operação devolve (rota, response). A rota é o template, não a URL, para agregar as medições.
+
+async def get_atleta(c, a, rng):
+    return 'GET /atletas/{id}', await c.get(f"/atletas/{rng.choice(a.atletas)['id']}")
+
+async def get_atleta_cpf(c, a, rng):
+    return 'GET /atletas/cpf/{cpf}', await c.get(f"/atletas/cpf/{rng.choice(a.atletas)['cpf']}")
+
+async def get_atleta_nome(c, a, rng):
+    return 'GET /atletas/nome/{nome}', await c.get(f"/atletas/nome/{rng.choice(a.atletas)['nome']}")
+
+async def batch_get_atletas(c, a, rng):
+    atletas = rng.sample(a.atletas, min(len(a.atletas), 100))
+    corpo = {'ids': [x['id'] for x in atletas[::2]], 'cpfs': [x['cpf'] for x in atletas[1::2]]}
+    return 'POST /atletas/batch-get', await c.post('/atletas/batch-get', json=corpo)
+
+async def list_atletas(c, a, rng):
+    return 'GET /atletas/', await c.get('/atletas/', params={'limit': 50, 'offset': rng.randrange(0, 5000, 50)})
+
+async def list_atletas_cursor(c, a, rng):
+    # segue o next_page devolvido, para medir o keyset além da primeira página
+    cursor = a.cursor_atletas if a.paginas_cursor < CURSOR_PAGINAS else None
+    params = {'size': 50, **({'cursor': cursor} if cursor else {})}
+    response = await c.get('/atletas/cursor', params=params)
+    a.cursor_atletas = response.json().get('next_page') if response.status_code == 200 else None
+    a.paginas_cursor = a.paginas_cursor + 1 if cursor and a.cursor_atletas else 0
+    return ('GET /atletas/cursor?cursor' if cursor else 'GET /atletas/cursor'), response
+
+async def search_atletas(c, a, rng):
+    atleta = rng.choice(a.atletas)
+    params = rng.choice((
+        {'nome': atleta['nome'][:4]},
+        {'nome': atleta['nome'], 'modo': 'aproximado'},
+        {'categoria': atleta['categoria']['nome'], 'sexo': atleta['sexo'], 'idade_min': 20, 'idade_max': 35},
+        {'centro_treinamento': atleta['centro_treinamento']['nome'], 'peso_min': 60, 'peso_max': 90},
+    ))
+    return 'GET /atletas/search', await c.get('/atletas/search', params={**params, 'limit': 20})
+
+async def export_atletas(c, a, rng):
+    async with c.stream('GET', '/atletas/export', params={'formato': rng.choice(('ndjson', 'csv'))}) as response:
+        async for _ in response.aiter_bytes():
+            pass
+    return 'GET /atletas/export', response
+
+async def post_atleta(c, a, rng):
+    response = await c.post('/atletas/', json=novo_atleta(a, rng))
+    if response.status_code == 201:
+        a.novos_atletas.append(response.json()['id'])
+    return 'POST /atletas/', response
+
+async def post_atletas_bulk(c, a, rng):
+    # na categoria do lote, e não em novos_atletas: o DELETE em lote remove estes atletas
+    lote = [{**novo_atleta(a, rng), 'categoria': {'nome': a.categoria_lote}} for _ in range(BULK_SIZE)]
+    return 'POST /atletas/bulk', await c.post('/atletas/bulk', json=lote)
+
+async def patch_atletas_bulk(c, a, rng):
+    return 'PATCH /atletas/bulk', await c.patch(
+        '/atletas/bulk', params={'categoria': a.categoria_lote}, json={'idade': rng.randint(16, 60)}
+    )
+
+async def delete_atletas_bulk(c, a, rng):
+    return 'DELETE /atletas/bulk', await c.delete('/atletas/bulk', params={'categoria': a.categoria_lote})
+
+async def patch_atleta(c, a, rng):
+    if not a.novos_atletas:
+        return await post_atleta(c, a, rng)
+    return 'PATCH /atletas/{id}', await c.patch(
+        f'/atletas/{rng.choice(a.novos_atletas)}', json={'idade': rng.randint(16, 60)}
+    )
+
+async def delete_atleta(c, a, rng):
+    if not a.novos_atletas:
+        return await post_atleta(c, a, rng)
+    return 'DELETE /atletas/{id}', await c.delete(f'/atletas/{a.novos_atletas.pop(rng.randrange(len(a.novos_atletas)))}')
+
+async def list_categorias(c, a, rng):
+    return 'GET /categorias/', await c.get('/categorias/')
+
+async def get_categoria(c, a, rng):
+    return 'GET /categorias/{id}', await c.get(f"/categorias/{rng.choice(a.categorias)['id']}")
+
+async def get_categoria_nome(c, a, rng):
+    return 'GET /categorias/nome/{nome}', await c.get(f"/categorias/nome/{rng.choice(a.categorias)['nome']}")
+
+async def post_categoria(c, a, rng):
+    response = await c.post('/categorias/', json={'nome': f'b{rng.getrandbits(32):08x}'})
+    if response.status_code == 201:
+        a.novas_categorias.append(response.json()['id'])
+    return 'POST /categorias/', response
+
+async def patch_categoria(c, a, rng):
+    if not a.novas_categorias:
+        return await post_categoria(c, a, rng)
+    return 'PATCH /categorias/{id}', await c.patch(
+        f'/categorias/{rng.choice(a.novas_categorias)}', json={'nome': f'b{rng.getrandbits(32):08x}'}
+    )
+
+async def delete_categoria(c, a, rng):
+    if not a.novas_categorias:
+        return await post_categoria(c, a, rng)
+    return 'DELETE /categorias/{id}', await c.delete(f'/categorias/{a.novas_categorias.pop()}')
+
+async def list_centros(c, a, rng):
+    return 'GET /centro_treinamento/', await c.get('/centro_treinamento/')
+
+async def get_centro(c, a, rng):
+    return 'GET /centro_treinamento/{id}', await c.get(f"/centro_treinamento/{rng.choice(a.centros)['id']}")
+
+async def get_centro_nome(c, a, rng):
+    return 'GET /centro_treinamento/nome/{nome}', await c.get(f"/centro_treinamento/nome/{rng.choice(a.centros)['nome']}")
+
+async def get_centro_proprietario(c, a, rng):
+    return 'GET /centro_treinamento/proprietario/{proprietario}', await c.get(
+        f"/centro_treinamento/proprietario/{rng.choice(a.centros)['proprietario']}"
+    )
+
+async def post_centro(c, a, rng):
+    response = await c.post('/centro_treinamento/', json={
+        'nome': f'CT b{rng.getrandbits(48):012x}', 'endereco': 'Rua Bench, 1', 'proprietario': 'Bench',
+    })
+    if response.status_code == 201:
+        a.novos_centros.append(response.json()['id'])
+    return 'POST /centro_treinamento/', response
+
+async def patch_centro(c, a, rng):
+    if not a.novos_centros:
+        return await post_centro(c, a, rng)
+    return 'PATCH /centro_treinamento/{id}', await c.patch(
+        f'/centro_treinamento/{rng.choice(a.novos_centros)}', json={'endereco': f'Rua Bench, {rng.randint(1, 999)}'}
+    )
+
+async def delete_centro(c, a, rng):
+    if not a.novos_centros:
+        return await post_centro(c, a, rng)
+    return 'DELETE /centro_treinamento/{id}', await c.delete(f'/centro_treinamento/{a.novos_centros.pop()}')
+
+def _get(rota: str, path: str):
+    async def op(c, a, rng):
+        return rota, await c.get(path)
+    op.__name__ = rota
+    return op
+
+
+# (peso, operação): leituras pontuais de atletas dominam, como no tráfego real
+MIX = (
+    (20, get_atleta),
+    (12, get_atleta_cpf),
+    (4, get_atleta_nome),
+    (1, batch_get_atletas),
+    (8, list_atletas),
+    (4, list_atletas_cursor),
+    (10, search_atletas),
+    (0.01, export_atletas),
+    (5, post_atleta),
+    (0.5, post_atletas_bulk),
+    (0.2, patch_atletas_bulk),
+    (0.1, delete_atletas_bulk),
+    (3, patch_atleta),
+    (2, delete_atleta),
+    (2, list_categorias),
+    (3, get_categoria),
+    (2, get_categoria_nome),
+    (0.2, post_categoria),
+    (0.2, patch_categoria),
+    (0.2, delete_categoria),
+    (2, list_centros),
+    (3, get_centro),
+    (2, get_centro_nome),
+    (1, get_centro_proprietario),
+    (0.2, post_centro),
+    (0.2, patch_centro),
+    (0.2, delete_centro),
+    (2, _get('GET /stats/', '/stats/')),
+    (1, _get('GET /stats/categorias', '/stats/categorias')),
+    (1, _get('GET /stats/centros_treinamento', '/stats/centros_treinamento')),
+    (1, _get('GET /stats/sexo', '/stats/sexo')),
+    (0.5, _get('GET /internal/pool', '/internal/pool')),
+    (0.5, _get('GET /internal/cache', '/internal/cache')),
+    (0.5, _get('GET /internal/metrics', '/internal/metrics')),
+    (0.2, _get('GET /internal/slow-queries', '/internal/slow-queries')),
+    (1, _get('GET /internal/ready', '/internal/ready')),
+)
+
+
+async def worker(client, amostra, medicoes, rng, deadline) -> None:
+    pesos = [peso for peso, _ in MIX]
+    operacoes = [op for _, op in MIX]
+    while time.perf_counter() < deadline:
+        op = rng.choices(operacoes, pesos)[0]
+        inicio = time.perf_counter()
+        try:
+            rota, response = await op(client, amostra, rng)
+            medicoes.registrar(rota, inicio, response.status_code)
+        except httpx.HTTPError as exc:
+            medicoes.registrar(op.__name__, inicio, type(exc).__name__)
+
+
+def resumo(latencias: list[float], status: Counter, duracao: float) -> dict:
+    return {
+        'requisicoes': len(latencias),
+        'vazao_rps': round(len(latencias) / duracao, 1),
+        'erros': sum(n for codigo, n in status.items() if not codigo.isdigit() or int(codigo) >= 500),
+        'status': dict(sorted(status.items())),
+        'p50_ms': round(percentile(latencias, 0.50), 2),
+        'p95_ms': round(percentile(latencias, 0.95), 2),
+        'p99_ms': round(percentile(latencias, 0.99), 2),
+        'media_ms': round(statistics.fmean(latencias), 2),
+        'max_ms': round(max(latencias), 2),
+    }
+
+
+async def main(base_url: str, duration: float, concurrency: int, seed: int, output: str | None) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        amostra = await carregar_amostra(client)
+        medicoes = Medicoes()
+        inicio = time.perf_counter()
+        deadline = inicio + duration
+        await asyncio.gather(*(
+            worker(client, amostra, medicoes, random.Random(seed + i), deadline) for i in range(concurrency)
+        ))
+        duracao = time.perf_counter() - inicio
+
+    todas = [ms for amostras in medicoes.latencias.values() for ms in amostras]
+    todos_status = sum(medicoes.status.values(), Counter())
+    relatorio = {
+        'base_url': base_url,
+        'duracao_s': round(duracao, 2),
+        'concorrencia': concurrency,
+        'semente': seed,
+        'total': resumo(todas, todos_status, duracao),
+        'rotas': {
+            rota: resumo(medicoes.latencias[rota], medicoes.status[rota], duracao)
+            for rota in sorted(medicoes.latencias)
+        },
+    }
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+    print(texto)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Grava o relatório JSON também neste arquivo')
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.duration, args.concurrency, args.seed, args.output))
@@ -0,0 +1,100 @@
+"""Popula o banco com categorias, centros de treinamento e atletas para os benchmarks.
+
+Cada lote vai por COPY (copy_records_to_table do asyncpg) para uma tabela
+temporária e entra em atletas com um único INSERT ... ON CONFLICT DO
+NOTHING, então 1 milhão de atletas leva segundos, os triggers de estatísticas
+disparam uma vez por lote e uma base já populada não quebra a carga. Com
+--reset, as três tabelas são truncadas antes.
+
+    python -m benchmarks.seed --atletas 1000000 --reset
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from itertools import islice
+
+import asyncpg
+
+from benchmarks import dataset
+from benchmarks.common import dsn
+
+
+async def copy_atletas(conn: asyncpg.Connection, rows, batch_size: int) -> int:
+    columns = ', '.join(dataset.ATLETAS_COLUMNS)
+    await conn.execute(f'CREATE TEMP TABLE atletas_seed AS SELECT {columns} FROM atletas WITH NO DATA')
+    total = 0
+    while batch := list(islice(rows, batch_size)):
+        await conn.copy_records_to_table('atletas_seed', records=batch, columns=dataset.ATLETAS_COLUMNS)
+        status = await conn.execute(
+            f'INSERT INTO atletas ({columns}) SELECT {columns} FROM atletas_seed ON CONFLICT DO NOTHING'
+        )
+        await conn.execute('TRUNCATE atletas_seed')
+        total += int(status.split()[-1])
+    await conn.execute('DROP TABLE atletas_seed')
+    return total
+
+
+async def main(categorias: int, centros: int, atletas: int, seed: int, batch_size: int, reset: bool) -> None:
+    rng = random.Random(seed)
+    conn = await asyncpg.connect(dsn())
+    try:
+        start = time.perf_counter()
+        if reset:
+            await conn.execute('TRUNCATE atletas, centros_treinamento, categorias RESTART IDENTITY CASCADE')
+
+        async with conn.transaction():
+            # os nomes de categoria e centro são únicos: numa base não vazia, reaproveita os existentes
+            await conn.executemany(
+                'INSERT INTO categorias (id, nome, created_at) VALUES ($1, $2, $3) ON CONFLICT DO NOTHING',
+                dataset.categorias(categorias, rng, dataset.REFERENCIA),
+            )
+            await conn.executemany(
+                'INSERT INTO centros_treinamento (id, nome, endereco, proprietario, created_at)'
+                ' VALUES ($1, $2, $3, $4, $5) ON CONFLICT DO NOTHING',
+                dataset.centros(centros, rng, dataset.REFERENCIA),
+            )
+            categoria_ids = [
+                row['pk_id'] for row in await conn.fetch(
+                    'SELECT pk_id FROM categorias WHERE nome = ANY($1::text[]) ORDER BY pk_id',
+                    [dataset.categoria_nome(i) for i in range(categorias)],
+                )
+            ]
+            centro_ids = [
+                row['pk_id'] for row in await conn.fetch(
+                    'SELECT pk_id FROM centros_treinamento WHERE nome = ANY($1::text[]) ORDER BY pk_id',
+                    [dataset.centro_nome(i) for i in range(centros)],
+                )
+            ]
+
+        inseridos = 0
+        if atletas:
+            inseridos = await copy_atletas(
+                conn, dataset.atletas(atletas, rng, categoria_ids, centro_ids), batch_size
+            )
+        await conn.execute('ANALYZE categorias, centros_treinamento, atletas')
+        elapsed = time.perf_counter() - start
+
+        print(json.dumps({
+            'semente': seed,
+            'categorias': len(categoria_ids),
+            'centros_treinamento': len(centro_ids),
+            'atletas': inseridos,
+            'segundos': round(elapsed, 2),
+            'atletas_por_segundo': round(inseridos / elapsed) if elapsed else None,
+        }, indent=2))
+    finally:
+        await conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--categorias', type=int, default=10)
+    parser.add_argument('--centros', type=int, default=50)
+    parser.add_argument('--atletas', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--reset', action='store_true', help='Trunca atletas, centros e categorias antes da carga')
+    args = parser.parse_args()
+    asyncio.run(main(args.categorias, args.centros, args.atletas, args.seed, args.batch_size, args.reset))
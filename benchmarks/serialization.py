@@ -0,0 +1,136 @@
+"""Custo de serialização por schema: caminho do response_model x contrib.serialization.
+
+Monta entidades ORM em memória (sem banco), serializa cada caso pelo caminho
+padrão do FastAPI (validação do response_model + dump_python + JSONResponse)
+e por `dump_json`, confere que os bytes são idênticos e mede o tempo de cada um.
+
+    python -m benchmarks.serialization --rows 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from fastapi_pagination import LimitOffsetPage, Page
+
+from atletas.schema import AtletaResumido, AtletasOut, CategoriaOutResumido, CentroTreinamentoOutResumido
+from categorias.schema import CategoriasOut
+from centro_treinamento.schema import CentroTreinamentoOut
+from contrib.repository.models import AtletasModels, CategoriasModels, CentroTreinamentoModels
+from contrib.serialization import ORJSONResponse, dump_json
+
+
+def build_rows(rows: int) -> list[AtletasModels]:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    categoria = CategoriasModels(id=uuid4(), nome='Scale', created_at=created_at)
+    centro_treinamento = CentroTreinamentoModels(
+        id=uuid4(), nome='CT São João', endereco='Rua A, 1', proprietario='José', created_at=created_at
+    )
+    return [
+        AtletasModels(
+            id=uuid4(),
+            nome=f'Atleta Ção {i}',
+            cpf=f'{i:011d}',
+            idade=18 + i % 40,
+            peso=60 + (i % 400) / 10,
+            altura=1.5 + (i % 50) / 100,
+            sexo='MF'[i % 2],
+            created_at=created_at + timedelta(seconds=i),
+            categoria=categoria,
+            centro_treinamento=centro_treinamento,
+        )
+        for i in range(rows)
+    ]
+
+
+def build_cases(atletas: list[AtletasModels]) -> list[tuple[str, object, object]]:
+    resumidos = [
+        AtletaResumido(
+            nome=atleta.nome,
+            categoria=CategoriaOutResumido(nome=atleta.categoria.nome),
+            centro_treinamento=CentroTreinamentoOutResumido(nome=atleta.centro_treinamento.nome),
+        )
+        for atleta in atletas
+    ]
+    fora_da_faixa = build_rows(1)[0]
+    fora_da_faixa.peso, fora_da_faixa.altura = 1e-05, 1e16
+    return [
+        ('AtletasOut', AtletasOut, atletas[0]),
+        # floats que o json da stdlib escreve em notação científica: exercita o fallback
+        ('AtletasOut (1e-05, 1e+16)', AtletasOut, fora_da_faixa),
+        ('CategoriasOut', CategoriasOut, atletas[0].categoria),
+        ('CentroTreinamentoOut', CentroTreinamentoOut, atletas[0].centro_treinamento),
+        ('list[AtletasOut]', list[AtletasOut], atletas),
+        (
+            'LimitOffsetPage[AtletaResumido]',
+            LimitOffsetPage[AtletaResumido],
+            LimitOffsetPage[AtletaResumido](items=resumidos, total=len(resumidos), limit=len(resumidos), offset=0),
+        ),
+        (
+            'Page[CategoriasOut]',
+            Page[CategoriasOut],
+            Page[CategoriasOut](items=[atletas[0].categoria] * len(atletas), total=len(atletas), page=1, size=len(atletas), pages=1),
+        ),
+    ]
+
+
+async def response_model_path(field, content) -> bytes:
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def orjson_path(field, content) -> bytes:
+    return ORJSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def measure(label: str, schema, content, repeat: int) -> dict:
+    field = create_model_field(name=f'Response_{label}', type_=schema, mode='serialization')
+    esperado = await response_model_path(field, content)
+    rapido = dump_json(schema, content)
+    if rapido != esperado or await orjson_path(field, content) != esperado:
+        raise SystemExit(f'{label}: saída diferente do response_model')
+
+    async def fast():
+        dump_json(schema, content)
+
+    padrao = await timed(lambda: response_model_path(field, content), repeat)
+    orjson_ = await timed(lambda: orjson_path(field, content), repeat)
+    otimizado = await timed(fast, repeat)
+    return {
+        'schema': label,
+        'bytes': len(esperado),
+        'response_model_ms': round(statistics.median(padrao), 4),
+        'response_model_orjson_ms': round(statistics.median(orjson_), 4),
+        'dump_json_ms': round(statistics.median(otimizado), 4),
+        'ganho': round(statistics.median(padrao) / statistics.median(otimizado), 2),
+    }
+
+
+async def main(rows: int, repeat: int) -> None:
+    resultados = [
+        await measure(label, schema, content, repeat)
+        for label, schema, content in build_cases(build_rows(rows))
+    ]
+    print(json.dumps({'linhas': rows, 'repeticoes': repeat, 'resultados': resultados}, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,124 @@
+"""Carga no banco sob rajadas de leituras idênticas, com e sem coalescência.
+
+Roda a aplicação no próprio processo (httpx.ASGITransport) contra o banco de
+DB_URL e dispara, em cada rodada, `--requests` GETs simultâneos distribuídos
+entre `--chaves` registros do mesmo recurso, como num check-in de evento. A
+primeira fase desliga o SingleFlight (cada requisição faz a própria consulta);
+a segunda usa o comportamento normal. As queries por requisição vêm dos
+histogramas de configs.metrics, e a espera pelo pool, de InstrumentedAsyncPool.
+
+Use com RESPONSE_CACHE_BACKEND=none (o padrão), senão o cache responde antes.
+
+    python -m benchmarks.thundering_herd --requests 500 --chaves 5 --rodadas 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+from sqlalchemy import select
+
+from atletas.models import AtletasModels
+from categorias.models import CategoriasModels
+from centro_treinamento.models import CentroTreinamentoModels
+from configs.database import async_session, dispose_engine, get_engine
+from configs.metrics import request_queries
+from contrib.singleflight import lookups
+from benchmarks.common import percentile
+from main import create_app
+
+RECURSOS = {
+    'atletas': AtletasModels,
+    'categorias': CategoriasModels,
+    'centro_treinamento': CentroTreinamentoModels,
+}
+
+
+async def _sem_coalescencia(key, fn):
+    return await fn()
+
+
+def _total_queries() -> float:
+    # soma de db_queries_per_request em todas as rotas
+    return sum(series[-2] for series in request_queries._series.values())
+
+
+async def carregar_ids(recurso: str, chaves: int) -> list[str]:
+    model = RECURSOS[recurso]
+    async with async_session() as session:
+        ids = (await session.execute(select(model.id).order_by(model.pk_id).limit(chaves))).scalars().all()
+    if not ids:
+        raise SystemExit(f'Nenhum registro em {recurso}: rode `make bench-seed` antes')
+    return [str(i) for i in ids]
+
+
+async def fase(client: httpx.AsyncClient, paths: list[str], requests: int, rodadas: int) -> dict:
+    queries_antes = _total_queries()
+    pool_antes = get_engine().pool.snapshot()
+    latencias = []
+    status: dict[int, int] = {}
+
+    async def um(path: str) -> None:
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencias.append((time.perf_counter() - start) * 1000)
+        status[response.status_code] = status.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    for _ in range(rodadas):
+        await asyncio.gather(*(um(paths[i % len(paths)]) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    pool = get_engine().pool.snapshot()
+    total = requests * rodadas
+    queries = _total_queries() - queries_antes
+    return {
+        'requisicoes': total,
+        'queries': int(queries),
+        'queries_por_requisicao': round(queries / total, 4),
+        'checkouts': pool['checkouts'] - pool_antes['checkouts'],
+        'espera_pool_ms': round(pool['espera_total_ms'] - pool_antes['espera_total_ms'], 3),
+        'p50_ms': round(statistics.median(latencias), 3),
+        'p99_ms': round(percentile(latencias, 0.99), 3),
+        'segundos': round(elapsed, 3),
+        'status': status,
+    }
+
+
+async def main(recurso: str, requests: int, chaves: int, rodadas: int) -> None:
+    # o ASGITransport não roda o lifespan: o engine é criado aqui
+    get_engine()
+    paths = [f'/{recurso}/{id}' for id in await carregar_ids(recurso, chaves)]
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        # aquece conexões e statements para que a primeira fase não pague o custo sozinha
+        await fase(client, paths, len(paths), 1)
+
+        lookups.do = _sem_coalescencia
+        try:
+            sem = await fase(client, paths, requests, rodadas)
+        finally:
+            del lookups.do
+        com = await fase(client, paths, requests, rodadas)
+
+    print(json.dumps({
+        'recurso': recurso,
+        'chaves': len(paths),
+        'simultaneas': requests,
+        'sem_coalescencia': sem,
+        'com_coalescencia': com,
+        'reducao_queries': round(sem['queries'] / com['queries'], 2) if com['queries'] else None,
+    }, indent=2))
+    await dispose_engine()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recurso', choices=sorted(RECURSOS), default='atletas')
+    parser.add_argument('--requests', type=int, default=500, help='Requisições simultâneas por rodada')
+    parser.add_argument('--chaves', type=int, default=5, help='Registros distintos consultados')
+    parser.add_argument('--rodadas', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.recurso, args.requests, args.chaves, args.rodadas))
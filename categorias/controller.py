@@ -1,14 +1,26 @@
 from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Body, status, HTTPException
+from fastapi import APIRouter, Body, Header, Query, Response, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi_pagination import Page, paginate
+from fastapi_pagination import add_pagination
 from categorias.models import CategoriasModels
 from categorias.schema import CategoriasIn, CategoriasOut, CategoriasUpdate
-from contrib.dependencies import DatabaseDependency
+from configs.settings import settings
+from contrib.dependencies import DatabaseDependency, ReadDatabaseDependency
+from contrib.etag import make_etag, not_modified, version_criteria
+from contrib.pagination import EstrategiaContagem, PaginaContada, TableCounter, paginate_counted
+from contrib.reference_cache import reference_cache
+from contrib.response_cache import CachedEntity, atleta_cache
+from contrib.serialization import dump_json, json_response
+from contrib.singleflight import lookups
+from contrib.repository.base import delete_by_id, exists_by_id, update_by_id
 
 router = APIRouter()
 
+categorias_counter = TableCounter(CategoriasModels, settings.COUNT_CACHE_RECONCILE_SECONDS)
+
 @router.post(
     '/',
     summary="Criar nova categoria",
@@ -24,6 +36,8 @@ async def post(
     db_session.add(categoria_model)
     await db_session.commit()
     await db_session.refresh(categoria_model)
+    reference_cache.invalidate()
+    categorias_counter.add(1)
 
     return categoria_model
 
@@ -31,13 +45,42 @@ async def post(
     '/',
     summary="Consultar todas as categorias",
     status_code=status.HTTP_200_OK,
-    response_model=Page[CategoriasOut],
+    response_model=PaginaContada[CategoriasOut],
 )
 async def get_all(
-    db_session: DatabaseDependency
-) -> Page[CategoriasOut]:
-    categorias: list[CategoriasModels] = (await db_session.execute(select(CategoriasModels))).scalars().all()
-    return paginate(categorias)
+    db_session: ReadDatabaseDependency,
+    nome: Optional[str] = Query(None, description="Filtra categorias cujo nome começa com o valor informado"),
+    contagem: Optional[EstrategiaContagem] = Query(None, description="Como obter o total; o padrão vem de COUNT_STRATEGY"),
+) -> PaginaContada[CategoriasOut]:
+    query = select(CategoriasModels).order_by(CategoriasModels.pk_id)
+    if nome:
+        query = query.filter(CategoriasModels.nome.istartswith(nome, autoescape=True))
+    page = await paginate_counted(db_session, query, CategoriasModels, categorias_counter, contagem, filtered=bool(nome))
+    return json_response(PaginaContada[CategoriasOut], page)
+
+async def _lookup(db_session: AsyncSession, key: str, criteria) -> Optional[CachedEntity]:
+    """Busca e serializa um registro, compartilhando a consulta entre requisições simultâneas."""
+
+    async def fetch() -> Optional[CachedEntity]:
+        # sessão própria: a consulta compartilhada não depende da requisição que a disparou
+        async with AsyncSession(db_session.bind, expire_on_commit=False) as session:
+            categoria = (await session.execute(select(CategoriasModels).filter(criteria))).scalars().first()
+            if categoria is None:
+                return None
+            return CachedEntity(make_etag(categoria.version), dump_json(CategoriasOut, categoria))
+
+    # o engine entra na chave: um cliente fixado no primário não recebe o resultado de uma réplica
+    return await lookups.do(("categorias", key, db_session.bind), fetch)
+
+async def _lookup_etag(db_session: AsyncSession, key: str, criteria) -> Optional[str]:
+    """ETag atual lida só da coluna de versão, para responder 304 sem carregar nem serializar o registro."""
+
+    async def fetch() -> Optional[str]:
+        async with AsyncSession(db_session.bind) as session:
+            version = await session.scalar(select(CategoriasModels.version).filter(criteria))
+        return make_etag(version) if version is not None else None
+
+    return await lookups.do(("categorias-version", key, db_session.bind), fetch)
 
 @router.get(
     '/{id}',
@@ -47,16 +90,22 @@ async def get_all(
 )
 async def get_by_id(
     id: str,
-    db_session: DatabaseDependency) -> CategoriasOut:
+    db_session: ReadDatabaseDependency,
+    if_none_match: Optional[str] = Header(None)) -> CategoriasOut:
     try:
         categoria_id = UUID(id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Categoria não encontrada no id informado: {id}")
 
-    categoria: CategoriasOut = (await db_session.execute(select(CategoriasModels).filter_by(id=categoria_id))).scalars().first()
-    if not categoria:
+    if if_none_match:
+        etag = await _lookup_etag(db_session, f"id:{categoria_id}", CategoriasModels.id == categoria_id)
+        if etag and (revalidated := not_modified(if_none_match, etag)):
+            return revalidated
+
+    entity = await _lookup(db_session, f"id:{categoria_id}", CategoriasModels.id == categoria_id)
+    if entity is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Categoria não encontrada no id informado: {id}")
-    return categoria
+    return not_modified(if_none_match, entity.etag) or entity.to_response()
 
 @router.get(
     "/nome/{nome}",
@@ -64,20 +113,15 @@ async def get_by_id(
     status_code=status.HTTP_200_OK,
     response_model=CategoriasOut,
 )
-async def get_by_name(nome: str, db_session: DatabaseDependency) -> CategoriasOut:
-    categoria: CategoriasOut = (
-        (await db_session.execute(select(CategoriasModels).filter_by(nome=nome)))
-        .scalars()
-        .first()
-    )
-
-    if not categoria:
+async def get_by_name(nome: str, db_session: ReadDatabaseDependency) -> CategoriasOut:
+    entity = await _lookup(db_session, f"nome:{nome}", CategoriasModels.nome == nome)
+    if entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Categoria não encontrada com o nome: {nome}",
         )
 
-    return categoria
+    return entity.to_response()
 
 @router.patch(
     '/{id}',
@@ -86,23 +130,33 @@ async def get_by_name(nome: str, db_session: DatabaseDependency) -> CategoriasOu
     response_model=CategoriasOut,
 )
 async def patch(
-    id: str, db_session: DatabaseDependency, categoria_up: CategoriasUpdate = Body(...)
+    id: str,
+    db_session: DatabaseDependency,
+    response: Response,
+    categoria_up: CategoriasUpdate = Body(...),
+    if_match: Optional[str] = Header(None),
 ) -> CategoriasOut:
     try:
         categoria_id = UUID(id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Categoria não encontrada no id informado: {id}")
 
-    categoria: CategoriasModels = (await db_session.execute(select(CategoriasModels).filter_by(id=categoria_id))).scalars().first()
+    criteria = version_criteria(CategoriasModels, if_match) if if_match else ()
+    categoria = await update_by_id(
+        db_session, CategoriasModels, categoria_id, categoria_up.model_dump(exclude_unset=True), *criteria
+    )
     if not categoria:
+        if criteria and await exists_by_id(db_session, CategoriasModels, categoria_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"A categoria {id} foi alterada desde a versão informada em If-Match",
+            )
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Categoria não encontrada no id informado: {id}")
-    
-    categoria_update = categoria_up.model_dump(exclude_unset=True)
-    for key, value in categoria_update.items():
-        setattr(categoria, key, value)
-    
-    await db_session.commit()
-    await db_session.refresh(categoria)
+
+    reference_cache.invalidate()
+    # o nome aparece na representação de cada atleta em cache
+    await atleta_cache.clear()
+    response.headers["ETag"] = make_etag(categoria.version)
     return categoria
 
 @router.delete(
@@ -116,9 +170,10 @@ async def delete(id: str, db_session: DatabaseDependency) -> None:
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Categoria não encontrada no id informado: {id}")
 
-    categoria: CategoriasModels = (await db_session.execute(select(CategoriasModels).filter_by(id=categoria_id))).scalars().first()
-    if not categoria:
+    if not await delete_by_id(db_session, CategoriasModels, categoria_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Categoria não encontrada no id informado: {id}")
-    
-    await db_session.delete(categoria)
-    await db_session.commit()
+
+    reference_cache.invalidate()
+    categorias_counter.add(-1)
+
+add_pagination(router)
@@ -1,15 +1,28 @@
+from typing import Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Body, status, HTTPException
+from fastapi import APIRouter, Body, Header, Query, Response, status, HTTPException
+from fastapi_pagination import add_pagination
 from pydantic import UUID4
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from datetime import datetime, timezone
 
 from centro_treinamento.schema import CentroTreinamentoIn, CentroTreinamentoOut, CentroTreinamentoUpdate
-from contrib.dependencies import DatabaseDependency
+from configs.settings import settings
+from contrib.dependencies import DatabaseDependency, ReadDatabaseDependency
+from contrib.etag import make_etag, not_modified, version_criteria
+from contrib.pagination import EstrategiaContagem, PaginaContada, TableCounter, paginate_counted
+from contrib.reference_cache import reference_cache
+from contrib.response_cache import CachedEntity, atleta_cache
+from contrib.serialization import dump_json, json_response
+from contrib.singleflight import lookups
+from contrib.repository.base import delete_by_id, exists_by_id, update_by_id
 from centro_treinamento.models import CentroTreinamentoModels
 
 router = APIRouter()
 
+centros_treinamento_counter = TableCounter(CentroTreinamentoModels, settings.COUNT_CACHE_RECONCILE_SECONDS)
+
 @router.post(
     '/',
     summary="Criar um novo centro de treinamento",
@@ -29,6 +42,8 @@ async def post(
     db_session.add(centro_treinamento_model)
     await db_session.commit()
     await db_session.refresh(centro_treinamento_model)
+    reference_cache.invalidate()
+    centros_treinamento_counter.add(1)
 
     return centro_treinamento_model
 
@@ -36,13 +51,42 @@ async def post(
     '/',
     summary="Consultar todas os centros de treinamento",
     status_code=status.HTTP_200_OK,
-    response_model=list[CentroTreinamentoOut],
+    response_model=PaginaContada[CentroTreinamentoOut],
 )
 async def get_all(
-    db_session: DatabaseDependency
-) -> list[CentroTreinamentoOut]:
-    centros_treinamento: list[CentroTreinamentoOut] = (await db_session.execute(select(CentroTreinamentoModels))).scalars().all()
-    return centros_treinamento
+    db_session: ReadDatabaseDependency,
+    nome: Optional[str] = Query(None, description="Filtra centros de treinamento cujo nome começa com o valor informado"),
+    contagem: Optional[EstrategiaContagem] = Query(None, description="Como obter o total; o padrão vem de COUNT_STRATEGY"),
+) -> PaginaContada[CentroTreinamentoOut]:
+    query = select(CentroTreinamentoModels).order_by(CentroTreinamentoModels.pk_id)
+    if nome:
+        query = query.filter(CentroTreinamentoModels.nome.istartswith(nome, autoescape=True))
+    page = await paginate_counted(db_session, query, CentroTreinamentoModels, centros_treinamento_counter, contagem, filtered=bool(nome))
+    return json_response(PaginaContada[CentroTreinamentoOut], page)
+
+async def _lookup(db_session: AsyncSession, key: str, criteria) -> Optional[CachedEntity]:
+    """Busca e serializa um registro, compartilhando a consulta entre requisições simultâneas."""
+
+    async def fetch() -> Optional[CachedEntity]:
+        # sessão própria: a consulta compartilhada não depende da requisição que a disparou
+        async with AsyncSession(db_session.bind, expire_on_commit=False) as session:
+            centro_treinamento = (await session.execute(select(CentroTreinamentoModels).filter(criteria))).scalars().first()
+            if centro_treinamento is None:
+                return None
+            return CachedEntity(make_etag(centro_treinamento.version), dump_json(CentroTreinamentoOut, centro_treinamento))
+
+    # o engine entra na chave: um cliente fixado no primário não recebe o resultado de uma réplica
+    return await lookups.do(("centro_treinamento", key, db_session.bind), fetch)
+
+async def _lookup_etag(db_session: AsyncSession, key: str, criteria) -> Optional[str]:
+    """ETag atual lida só da coluna de versão, para responder 304 sem carregar nem serializar o registro."""
+
+    async def fetch() -> Optional[str]:
+        async with AsyncSession(db_session.bind) as session:
+            version = await session.scalar(select(CentroTreinamentoModels.version).filter(criteria))
+        return make_etag(version) if version is not None else None
+
+    return await lookups.do(("centro_treinamento-version", key, db_session.bind), fetch)
 
 @router.get(
     '/{id}',
@@ -52,18 +96,23 @@ async def get_all(
 )
 async def get_by_id(
     id: str,
-    db_session: DatabaseDependency) -> CentroTreinamentoOut:
+    db_session: ReadDatabaseDependency,
+    if_none_match: Optional[str] = Header(None)) -> CentroTreinamentoOut:
     try:
         ct_id = UUID(id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Centro de treinamento não encontrado no id informado: {id}")
 
-    centro_treinamento: CentroTreinamentoOut = (await db_session.execute(select(CentroTreinamentoModels).filter_by(id=ct_id))).scalars().first()
-    
-    if not centro_treinamento:
+    if if_none_match:
+        etag = await _lookup_etag(db_session, f"id:{ct_id}", CentroTreinamentoModels.id == ct_id)
+        if etag and (revalidated := not_modified(if_none_match, etag)):
+            return revalidated
+
+    entity = await _lookup(db_session, f"id:{ct_id}", CentroTreinamentoModels.id == ct_id)
+    if entity is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Centro de treinamento não encontrado no id informado: {id}")
-    
-    return centro_treinamento
+
+    return not_modified(if_none_match, entity.etag) or entity.to_response()
 
 @router.get(
     "/nome/{nome}",
@@ -71,20 +120,15 @@ async def get_by_id(
     status_code=status.HTTP_200_OK,
     response_model=CentroTreinamentoOut,
 )
-async def get_by_name(nome: str, db_session: DatabaseDependency) -> CentroTreinamentoOut:
-    centro_treinamento: CentroTreinamentoOut = (
-        (await db_session.execute(select(CentroTreinamentoModels).filter_by(nome=nome)))
-        .scalars()
-        .first()
-    )
-
-    if not centro_treinamento:
+async def get_by_name(nome: str, db_session: ReadDatabaseDependency) -> CentroTreinamentoOut:
+    entity = await _lookup(db_session, f"nome:{nome}", CentroTreinamentoModels.nome == nome)
+    if entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Centro de treinamento não encontrado com o nome: {nome}",
         )
 
-    return centro_treinamento
+    return entity.to_response()
 
 @router.get(
     "/proprietario/{proprietario}",
@@ -92,7 +136,7 @@ async def get_by_name(nome: str, db_session: DatabaseDependency) -> CentroTreina
     status_code=status.HTTP_200_OK,
     response_model=list[CentroTreinamentoOut],
 )
-async def get_by_proprietario(proprietario: str, db_session: DatabaseDependency) -> list[CentroTreinamentoOut]:
+async def get_by_proprietario(proprietario: str, db_session: ReadDatabaseDependency) -> list[CentroTreinamentoOut]:
     centros_treinamento: list[CentroTreinamentoOut] = (
         (await db_session.execute(select(CentroTreinamentoModels).filter_by(proprietario=proprietario)))
         .scalars()
@@ -105,7 +149,7 @@ async def get_by_proprietario(proprietario: str, db_session: DatabaseDependency)
             detail=f"Nenhum centro de treinamento encontrado para o proprietário: {proprietario}",
         )
 
-    return centros_treinamento
+    return json_response(list[CentroTreinamentoOut], centros_treinamento)
 
 @router.patch(
     '/{id}',
@@ -114,23 +158,33 @@ async def get_by_proprietario(proprietario: str, db_session: DatabaseDependency)
     response_model=CentroTreinamentoOut,
 )
 async def patch(
-    id: str, db_session: DatabaseDependency, ct_up: CentroTreinamentoUpdate = Body(...)
+    id: str,
+    db_session: DatabaseDependency,
+    response: Response,
+    ct_up: CentroTreinamentoUpdate = Body(...),
+    if_match: Optional[str] = Header(None),
 ) -> CentroTreinamentoOut:
     try:
         ct_id = UUID(id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Centro de treinamento não encontrado no id informado: {id}")
 
-    centro_treinamento: CentroTreinamentoModels = (await db_session.execute(select(CentroTreinamentoModels).filter_by(id=ct_id))).scalars().first()
+    criteria = version_criteria(CentroTreinamentoModels, if_match) if if_match else ()
+    centro_treinamento = await update_by_id(
+        db_session, CentroTreinamentoModels, ct_id, ct_up.model_dump(exclude_unset=True), *criteria
+    )
     if not centro_treinamento:
+        if criteria and await exists_by_id(db_session, CentroTreinamentoModels, ct_id):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"O centro de treinamento {id} foi alterado desde a versão informada em If-Match",
+            )
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Centro de treinamento não encontrado no id informado: {id}")
-    
-    ct_update = ct_up.model_dump(exclude_unset=True)
-    for key, value in ct_update.items():
-        setattr(centro_treinamento, key, value)
-    
-    await db_session.commit()
-    await db_session.refresh(centro_treinamento)
+
+    reference_cache.invalidate()
+    # o nome aparece na representação de cada atleta em cache
+    await atleta_cache.clear()
+    response.headers["ETag"] = make_etag(centro_treinamento.version)
     return centro_treinamento
 
 @router.delete(
@@ -144,9 +198,10 @@ async def delete(id: str, db_session: DatabaseDependency) -> None:
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Centro de treinamento não encontrado no id informado: {id}")
 
-    centro_treinamento: CentroTreinamentoModels = (await db_session.execute(select(CentroTreinamentoModels).filter_by(id=ct_id))).scalars().first()
-    if not centro_treinamento:
+    if not await delete_by_id(db_session, CentroTreinamentoModels, ct_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Centro de treinamento não encontrado no id informado: {id}")
-    
-    await db_session.delete(centro_treinamento)
-    await db_session.commit()
\ No newline at end of file
+
+    reference_cache.invalidate()
+    centros_treinamento_counter.add(-1)
+
+add_pagination(router)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from contrib.models import BaseModel
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import DateTime, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 class CentroTreinamentoModels(BaseModel):
@@ -11,4 +11,6 @@ class CentroTreinamentoModels(BaseModel):
     endereco: Mapped[str] = mapped_column(String(60), nullable=False)
     proprietario: Mapped[str] = mapped_column(String(30), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default='1')
     atletas: Mapped[list['AtletasModels']] = relationship(back_populates='centro_treinamento')
\ No newline at end of file
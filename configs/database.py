@@ -1,15 +1,121 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from configs.metrics import instrument_engine
+from configs.pool import InstrumentedAsyncPool
+from configs.replicas import ReplicaRouter
 from configs.settings import settings
+from configs.slow_queries import slow_query_log
 
-engine = create_async_engine(settings.DB_URL,echo=False)
+
+def pool_limits() -> tuple[int, int]:
+    """(pool_size, max_overflow) de cada engine neste processo.
+
+    Com DB_CONNECTION_BUDGET, o orçamento de conexões com cada banco é dividido
+    entre os WEB_CONCURRENCY workers: cada um fica com até DB_POOL_SIZE conexões
+    fixas e o restante da sua parte como overflow.
+    """
+    if settings.DB_CONNECTION_BUDGET is None:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    per_worker = max(1, settings.DB_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY))
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    return pool_size, per_worker - pool_size
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    pool_size, max_overflow = pool_limits()
+    # opção exclusiva do asyncpg; os testes usam SQLite com aiosqlite
+    connect_args = {'prepared_statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE} if '+asyncpg' in url else {}
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=connect_args,
+    )
+    return slow_query_log.instrument(instrument_engine(engine))
+
+
+# Os engines são criados sob demanda, no processo que vai usá-los (no lifespan de
+# cada worker), nunca no import: um processo pré-carregado e depois forkado não
+# compartilha conexões nem estado do event loop com os filhos.
+engine: Optional[AsyncEngine] = None
 async_session = sessionmaker(
-    engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
+replica_router = ReplicaRouter([], health_interval=settings.DB_REPLICA_HEALTH_INTERVAL)
+
+
+def init_engine() -> AsyncEngine:
+    """Cria o engine do primário e das réplicas, se ainda não existirem, e liga as sessões a eles."""
+    global engine
+    if engine is None:
+        engine = _create_engine(settings.DB_URL)
+        replica_router.set_engines([_create_engine(url) for url in settings.DB_REPLICA_URLS])
+        async_session.configure(bind=engine)
+    return engine
+
+
+def get_engine() -> AsyncEngine:
+    return engine if engine is not None else init_engine()
+
+
+async def dispose_engine() -> None:
+    global engine
+    if engine is None:
+        return
+    engines = [engine, *(replica.engine for replica in replica_router.replicas)]
+    engine = None
+    replica_router.set_engines([])
+    async_session.configure(bind=None)
+    for current in engines:
+        await current.dispose()
+
+
+def _reset_after_fork() -> None:
+    # o filho herdou os sockets do pai: descarta os pools sem fechá-los (fechar
+    # derrubaria as conexões do pai) e deixa o lifespan do filho criar os seus
+    global engine
+    if engine is None:
+        return
+    for current in [engine, *(replica.engine for replica in replica_router.replicas)]:
+        current.sync_engine.dispose(close=False)
+    engine = None
+    replica_router.set_engines([])
+    async_session.configure(bind=None)
+
+
+# fork só existe em POSIX; no Windows os workers são sempre processos novos
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 async def get_session() -> AsyncGenerator:
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+@asynccontextmanager
+async def read_session(primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """Sessão somente leitura em uma réplica saudável, ou no primário se não houver."""
+    replica = None if primary else replica_router.pick()
+    factory = replica.session if replica else async_session
+    async with factory() as session:
+        try:
+            yield session
+        except DBAPIError as exc:
+            if replica and exc.connection_invalidated:
+                replica_router.mark_down(replica)
+            raise
+        except OSError:
+            if replica:
+                replica_router.mark_down(replica)
+            raise
@@ -0,0 +1,110 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class RequestStats:
+    """Acumula o trabalho de banco feito durante uma requisição."""
+
+    __slots__ = ('scope', 'queries', 'db_time', 'pool_wait')
+
+    def __init__(self, scope: dict) -> None:
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+    @property
+    def route(self) -> str:
+        # o roteador grava a rota encontrada no próprio scope da requisição
+        return getattr(self.scope.get('route'), 'path', 'unmatched')
+
+
+# Preenchido pelo MetricsMiddleware; None fora de uma requisição (lifespan, scripts).
+# O AsyncSession roda o driver em greenlets que herdam o contexto da task, então
+# os hooks síncronos do engine enxergam o mesmo objeto.
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar('request_stats', default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [contagem por bucket..., soma, total]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            base = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = f'{base},' if base else ''
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{base}}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{base}}} {series[-1]}')
+        return lines
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 4, 5, 8, 13, 21, 50, 100)
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Latência das requisições HTTP.', ('method', 'route', 'status'), LATENCY_BUCKETS
+)
+request_queries = Histogram(
+    'db_queries_per_request', 'Queries executadas por requisição.', ('method', 'route'), QUERY_BUCKETS
+)
+request_db_time = Histogram(
+    'db_time_per_request_seconds', 'Tempo gasto em queries por requisição.', ('method', 'route'), LATENCY_BUCKETS
+)
+request_pool_wait = Histogram(
+    'db_pool_wait_per_request_seconds', 'Espera por conexões do pool por requisição.', ('method', 'route'), LATENCY_BUCKETS
+)
+HISTOGRAMS = (request_duration, request_queries, request_db_time, request_pool_wait)
+
+
+def observe_request(method: str, status: int, duration: float, stats: RequestStats) -> None:
+    route = stats.route
+    request_duration.observe((method, route, str(status)), duration)
+    request_queries.observe((method, route), stats.queries)
+    request_db_time.observe((method, route), stats.db_time)
+    request_pool_wait.observe((method, route), stats.pool_wait)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - context._metrics_start
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    return engine
@@ -0,0 +1,53 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from configs.metrics import request_stats
+
+
+class PoolWaitStats:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede quanto tempo cada checkout esperou por uma conexão."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.wait_stats.record(wait)
+            if (stats := request_stats.get()) is not None:
+                stats.pool_wait += wait
+
+    def snapshot(self) -> dict:
+        stats = self.wait_stats
+        return {
+            'tamanho': self.size(),
+            'em_uso': self.checkedout(),
+            'disponiveis': self.checkedin(),
+            'overflow': max(self.overflow(), 0),
+            'max_overflow': self._max_overflow,
+            'checkouts': stats.checkouts,
+            'timeouts': stats.timeouts,
+            'espera_total_ms': round(stats.total_wait * 1000, 3),
+            'espera_media_ms': round(stats.total_wait * 1000 / stats.checkouts, 3) if stats.checkouts else 0.0,
+            'espera_maxima_ms': round(stats.max_wait * 1000, 3),
+        }
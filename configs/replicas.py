@@ -0,0 +1,71 @@
+import asyncio
+import itertools
+import time
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+HEALTH_CHECK_TIMEOUT = 2.0
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.checked_at = time.monotonic()
+
+
+class ReplicaRouter:
+    """Distribui leituras entre réplicas em round-robin, pulando as que falharam.
+
+    Os health checks rodam em segundo plano, a cada `health_interval` segundos
+    por réplica, para que nenhuma requisição espere por eles.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], health_interval: float) -> None:
+        self.replicas = [Replica(engine) for engine in engines]
+        self._health_interval = health_interval
+        self._counter = itertools.count()
+        self._checks: set[asyncio.Task] = set()
+
+    def set_engines(self, engines: list[AsyncEngine]) -> None:
+        self.replicas = [Replica(engine) for engine in engines]
+        self._checks = set()
+
+    def pick(self) -> Optional[Replica]:
+        if not self.replicas:
+            return None
+
+        now = time.monotonic()
+        start = next(self._counter)
+        chosen = None
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if now - replica.checked_at > self._health_interval:
+                self._schedule_check(replica, now)
+            if chosen is None and replica.healthy:
+                chosen = replica
+
+        return chosen
+
+    def mark_down(self, replica: Replica) -> None:
+        replica.healthy = False
+        replica.checked_at = time.monotonic()
+
+    def _schedule_check(self, replica: Replica, now: float) -> None:
+        # marca antes de agendar para que requisições concorrentes não disparem o mesmo check
+        replica.checked_at = now
+        task = asyncio.get_running_loop().create_task(self._check(replica))
+        self._checks.add(task)
+        task.add_done_callback(self._checks.discard)
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text('SELECT 1')), HEALTH_CHECK_TIMEOUT)
+            replica.healthy = True
+        except Exception:
+            replica.healthy = False
+        replica.checked_at = time.monotonic()
@@ -0,0 +1,112 @@
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from configs.metrics import request_stats
+from configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+
+def _shape(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}[{len(value)}]'
+    return type(value).__name__
+
+
+def parameter_shapes(parameters, executemany: bool) -> list[str]:
+    """Tipos dos parâmetros, sem os valores (que podem conter CPFs e outros dados pessoais)."""
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, dict):
+        return [f'{key}: {_shape(value)}' for key, value in parameters.items()]
+    return [_shape(value) for value in parameters or ()]
+
+
+class SlowQueryLog:
+    """Guarda, num buffer circular, os statements que passaram de `threshold` segundos.
+
+    Uma fração (`explain_sample_rate`) dos SELECTs lentos ganha um plano de
+    `EXPLAIN (ANALYZE, BUFFERS)`, executado na mesma conexão dentro de um
+    savepoint. O ANALYZE roda o statement de novo, por isso a amostragem e a
+    restrição a SELECTs.
+    """
+
+    def __init__(self, threshold: float, explain_sample_rate: float, max_entries: int) -> None:
+        self.threshold = threshold
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: deque[dict] = deque(maxlen=max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def entries(self) -> list[dict]:
+        return list(reversed(self._entries))
+
+    def instrument(self, engine: AsyncEngine) -> AsyncEngine:
+        if self.enabled:
+            event.listen(engine.sync_engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine.sync_engine, 'after_cursor_execute', self._after_cursor_execute)
+        return engine
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - context._slow_query_start
+        if duration < self.threshold:
+            return
+
+        stats = request_stats.get()
+        route = stats.route if stats is not None else None
+        plano = None
+        if (
+            conn.dialect.name == 'postgresql'
+            and not executemany
+            and not context.is_server_side
+            and statement.lstrip()[:6].upper() == 'SELECT'
+            and random.random() < self.explain_sample_rate
+        ):
+            plano = self._explain(conn, statement, parameters)
+
+        logger.warning('Statement lento (%.1f ms) em %s: %s', duration * 1000, route, statement)
+        self._entries.append({
+            'registrado_em': datetime.now(timezone.utc),
+            'rota': route,
+            'duracao_ms': round(duration * 1000, 3),
+            'sql': statement,
+            'parametros': parameter_shapes(parameters, executemany),
+            'executemany': executemany,
+            'plano': plano,
+        })
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[str]:
+        # cursor DBAPI cru: não passa pelos eventos do engine nem pela sessão
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            try:
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            finally:
+                cursor.execute(f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}')
+                cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        except Exception:
+            logger.warning('Falha ao capturar o EXPLAIN de um statement lento', exc_info=True)
+            return None
+        finally:
+            cursor.close()
+
+
+slow_query_log = SlowQueryLog(
+    threshold=settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    max_entries=settings.SLOW_QUERY_LOG_SIZE,
+)
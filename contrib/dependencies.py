@@ -1,6 +1,39 @@
-from typing import Annotated
+import math
+import time
+from typing import Annotated, AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends 
-from configs.database import get_session
+from fastapi import Depends, Request, Response
+from configs.database import async_session, read_session
+from configs.settings import settings
 
-DatabaseDependency = Annotated[AsyncSession, Depends(get_session)]
\ No newline at end of file
+READ_PRIMARY_COOKIE = 'read_primary_until'
+READ_PRIMARY_INFO = 'read_primary'
+
+
+async def get_write_session(response: Response) -> AsyncGenerator:
+    # fixa as leituras do cliente no primário por alguns segundos para que ele
+    # veja a própria escrita mesmo com atraso de replicação
+    if settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            f'{time.time() + settings.DB_READ_YOUR_WRITES_SECONDS:.3f}',
+            max_age=math.ceil(settings.DB_READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+        )
+    async with async_session() as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator:
+    try:
+        pinned = float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        pinned = False
+    async with read_session(primary=pinned) as session:
+        # consultado pelos handlers com cache de respostas, que não o usam para um cliente fixado
+        session.info[READ_PRIMARY_INFO] = pinned
+        yield session
+
+
+DatabaseDependency = Annotated[AsyncSession, Depends(get_write_session)]
+ReadDatabaseDependency = Annotated[AsyncSession, Depends(get_read_session)]
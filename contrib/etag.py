@@ -0,0 +1,48 @@
+from typing import Optional
+from fastapi import Response, status
+from sqlalchemy import false, or_
+
+
+def make_etag(*versions: int) -> str:
+    """ETag forte a partir das versões das linhas que compõem a representação."""
+    return '"' + '.'.join(str(version) for version in versions) + '"'
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(',') if tag.strip()]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparação fraca: W/"1" equivale a "1"
+    return any(tag == '*' or tag.removeprefix('W/') == etag for tag in _tags(if_none_match))
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return None
+
+
+def parse_if_match(if_match: str) -> Optional[list[tuple[int, ...]]]:
+    """Versões esperadas em um If-Match; None quando é `*` (qualquer versão serve).
+
+    ETags fracas ou que não foram geradas por `make_etag` nunca casam e são ignoradas.
+    """
+    expected = []
+    for tag in _tags(if_match):
+        if tag == '*':
+            return None
+        if tag.startswith('"') and tag.endswith('"'):
+            try:
+                expected.append(tuple(int(version) for version in tag[1:-1].split('.')))
+            except ValueError:
+                continue
+    return expected
+
+
+def version_criteria(model, if_match: str) -> tuple:
+    """Critério de WHERE para um If-Match sobre uma entidade versionada isoladamente."""
+    expected = parse_if_match(if_match)
+    if expected is None:
+        return ()
+    return (or_(false(), *(model.version == versions[0] for versions in expected if len(versions) == 1)),)
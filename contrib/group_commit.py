@@ -0,0 +1,99 @@
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Callable, Generic, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_STOP = object()
+
+
+class GroupCommit(Generic[T, R]):
+    """Junta itens enviados por requisições simultâneas e grava cada grupo de uma vez.
+
+    `submit` enfileira o item e aguarda o resultado. Um único worker, criado no
+    primeiro envio, espera até `max_wait` segundos (ou até `max_rows` itens)
+    depois do primeiro item do grupo e chama `flush` com o grupo inteiro.
+    `flush` devolve um resultado por item, na mesma ordem; uma exceção na lista
+    é levantada apenas para o item correspondente. Enquanto um grupo é gravado,
+    o seguinte acumula na fila, então os grupos crescem com a carga.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[list[Union[R, BaseException]]]],
+        max_rows: int,
+        max_wait: float,
+    ) -> None:
+        self._flush = flush
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            # contexto vazio: o worker não herda as variáveis da requisição que o criou
+            self._worker = contextvars.Context().run(loop.create_task, self._run(self._queue))
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Grava o que ainda está na fila e encerra o worker."""
+        if self._worker is None:
+            return
+        worker, self._worker = self._worker, None
+        if not worker.done():
+            self._queue.put_nowait(_STOP)
+            await worker
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            stop = False
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_rows:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    entry = queue.get_nowait()
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            await self._write(batch)
+            if stop:
+                return
+
+    async def _write(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self._flush([item for item, _ in batch])
+        except Exception as exc:
+            logger.error('Falha ao gravar um grupo de %d itens', len(batch), exc_info=True)
+            results = [exc] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            # a requisição pode ter sido cancelada; o item já foi gravado mesmo assim
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
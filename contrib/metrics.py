@@ -0,0 +1,64 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from configs.metrics import HISTOGRAMS, RequestStats, observe_request, request_stats
+
+
+class MetricsMiddleware:
+    """Mede latência, queries, tempo de banco e espera pelo pool de cada requisição.
+
+    Middleware ASGI puro (sem BaseHTTPMiddleware) para que o contexto da
+    requisição chegue intacto ao endpoint e às sessões do SQLAlchemy. O rótulo
+    é o template da rota (`/atletas/{id}`), preenchido pelo roteador no scope,
+    para que a cardinalidade não cresça com ids e nomes.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        stats = RequestStats(scope)
+        token = request_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            request_stats.reset(token)
+            observe_request(scope['method'], status_code, duration, stats)
+
+
+def render(pools: dict[str, dict]) -> str:
+    """Histogramas por rota e contadores dos pools no formato texto do Prometheus."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    gauges = (
+        ('db_pool_size', 'gauge', 'Conexões mantidas pelo pool.', 'tamanho'),
+        ('db_pool_checked_out', 'gauge', 'Conexões em uso.', 'em_uso'),
+        ('db_pool_overflow', 'gauge', 'Conexões abertas além de pool_size.', 'overflow'),
+        ('db_pool_checkouts_total', 'counter', 'Checkouts de conexão.', 'checkouts'),
+        ('db_pool_timeouts_total', 'counter', 'Checkouts que estouraram pool_timeout.', 'timeouts'),
+    )
+    for name, kind, documentation, key in gauges:
+        lines.append(f'# HELP {name} {documentation}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{name}{{pool="{pool}"}} {snapshot[key]}' for pool, snapshot in pools.items())
+    lines.append('# HELP db_pool_wait_seconds_total Tempo total de espera por conexões.')
+    lines.append('# TYPE db_pool_wait_seconds_total counter')
+    lines.extend(
+        f'db_pool_wait_seconds_total{{pool="{pool}"}} {snapshot["espera_total_ms"] / 1000}'
+        for pool, snapshot in pools.items()
+    )
+    return '\n'.join(lines) + '\n'
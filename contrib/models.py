@@ -7,4 +7,4 @@ from uuid import uuid4
 
 
 class BaseModel(DeclarativeBase):
-    id: Mapped[UUID] = mapped_column(PD_UUID(as_uuid=True), default=uuid4, nullable=False)
\ No newline at end of file
+    id: Mapped[UUID] = mapped_column(PD_UUID(as_uuid=True), default=uuid4, nullable=False, unique=True, index=True)
\ No newline at end of file
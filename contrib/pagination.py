@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from enum import Enum
+from typing import Annotated, Callable, Generic, Optional, TypeVar
+from fastapi_pagination import LimitOffsetPage, Page
+from fastapi_pagination.api import create_page, resolve_params
+from fastapi_pagination.ext.sqlalchemy import create_count_query, create_paginate_query
+from pydantic import Field
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from configs.settings import settings
+
+T = TypeVar('T')
+
+_ESTIMATE = text('SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(CAST(:tabela AS text) AS regclass)')
+
+
+class EstrategiaContagem(str, Enum):
+    exact = 'exact'
+    estimated = 'estimated'
+    cached = 'cached'
+
+
+_DESCRICAO = 'Como o total foi obtido: exact (COUNT), estimated (estatísticas do planner) ou cached (contador em memória)'
+
+
+class PaginaContada(Page[T], Generic[T]):
+    contagem: Annotated[EstrategiaContagem, Field(description=_DESCRICAO)]
+
+
+class LimitOffsetPaginaContada(LimitOffsetPage[T], Generic[T]):
+    contagem: Annotated[EstrategiaContagem, Field(description=_DESCRICAO)]
+
+
+class TableCounter:
+    """Total de linhas de uma tabela mantido em memória pelos handlers de escrita.
+
+    POSTs e DELETEs deste processo ajustam o valor com `add`; a cada
+    `reconcile_interval` segundos ele é refeito com um COUNT, o que cobre as
+    escritas de outros workers e as que correram junto com a última contagem.
+    """
+
+    def __init__(self, model, reconcile_interval: float) -> None:
+        self._model = model
+        self._reconcile_interval = reconcile_interval
+        self._total: Optional[int] = None
+        self._counted_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def add(self, delta: int) -> None:
+        if self._total is not None:
+            self._total += delta
+
+    def _is_stale(self) -> bool:
+        return self._counted_at is None or time.monotonic() - self._counted_at > self._reconcile_interval
+
+    async def get(self, db_session: AsyncSession) -> int:
+        if self._is_stale():
+            async with self._lock:
+                # outra requisição pode ter recontado enquanto esta esperava
+                if self._is_stale():
+                    self._total = await db_session.scalar(select(func.count()).select_from(self._model))
+                    self._counted_at = time.monotonic()
+        return max(self._total, 0)
+
+
+async def estimate(db_session: AsyncSession, model) -> Optional[int]:
+    """Linhas de `model` segundo pg_class.reltuples, ou None se não houver estimativa."""
+    if db_session.bind.dialect.name != 'postgresql':
+        return None
+    reltuples = await db_session.scalar(_ESTIMATE, {'tabela': model.__tablename__})
+    # -1 (PostgreSQL 14+) ou 0 (versões anteriores) até o primeiro ANALYZE/VACUUM;
+    # nesse caso a tabela costuma ser pequena e o COUNT exato sai barato
+    if reltuples is None or reltuples <= 0:
+        return None
+    return reltuples
+
+
+async def estimate_rows(db_session: AsyncSession, query) -> Optional[int]:
+    """Linhas que o planner espera de `query` (EXPLAIN, sem executar), ou None fora do PostgreSQL."""
+    if db_session.bind.dialect.name != 'postgresql':
+        return None
+    compiled = query.order_by(None).compile(dialect=db_session.bind.dialect)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    conn = await db_session.connection()
+    plan = (await conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', parameters)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def paginate_counted(
+    db_session: AsyncSession,
+    query,
+    model,
+    counter: TableCounter,
+    estrategia: Optional[EstrategiaContagem] = None,
+    filtered: bool = False,
+    transformer: Optional[Callable] = None,
+):
+    """Pagina `query` como o paginate do fastapi_pagination, com o total obtido por `estrategia`.
+
+    O contador vale para a tabela inteira de `model`, então listagens filtradas
+    com `cached` usam o COUNT exato; com `estimated`, a estimativa vem de
+    pg_class.reltuples sem filtro e do EXPLAIN da consulta com filtro. Fora do
+    PostgreSQL e em tabelas sem estatísticas o total também é exato. A
+    estratégia usada vai no campo `contagem` da página.
+    """
+    estrategia = EstrategiaContagem(estrategia or settings.COUNT_STRATEGY)
+    total = None
+    if estrategia == EstrategiaContagem.estimated:
+        total = await (estimate_rows(db_session, query) if filtered else estimate(db_session, model))
+    elif estrategia == EstrategiaContagem.cached and not filtered:
+        total = await counter.get(db_session)
+
+    if total is None:
+        estrategia = EstrategiaContagem.exact
+        # as chaves estrangeiras são NOT NULL, então os JOINs das listagens sem filtro não alteram o total
+        count_query = create_count_query(query) if filtered else select(func.count()).select_from(model)
+        total = await db_session.scalar(count_query)
+
+    params = resolve_params()
+    raw_params = params.to_raw_params().as_limit_offset()
+    result = await db_session.execute(create_paginate_query(query, raw_params))
+    rows = result.all() if transformer else result.scalars().all()
+    if estrategia != EstrategiaContagem.exact and (rows or raw_params.offset == 0):
+        # uma página incompleta é a última: ali o total aproximado é corrigido pelo que veio
+        seen = (raw_params.offset or 0) + len(rows)
+        total = seen if len(rows) < raw_params.limit else max(total, seen)
+    items = transformer(rows) if transformer else rows
+    return create_page(items, total=total, params=params, contagem=estrategia)
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import NamedTuple, Optional
+from uuid import UUID
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from categorias.models import CategoriasModels
+from centro_treinamento.models import CentroTreinamentoModels
+from configs.settings import settings
+
+# Intervalo mínimo entre recargas provocadas por nomes ausentes, para que
+# nomes inválidos repetidos não virem uma consulta por requisição.
+MISS_RELOAD_INTERVAL = 1.0
+
+
+class Referencia(NamedTuple):
+    pk_id: int
+    id: UUID
+
+
+class ReferenceCache:
+    """Cache em processo de nome -> (pk_id, id) de categorias e centros de treinamento.
+
+    É invalidado pelos handlers de escrita dos dois recursos; o TTL cobre as
+    escritas feitas por outros workers.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._categorias: dict[str, Referencia] = {}
+        self._centros_treinamento: dict[str, Referencia] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self._ttl
+
+    async def warm(self, db_session: AsyncSession) -> None:
+        async with self._lock:
+            await self._load(db_session)
+
+    async def _load(self, db_session: AsyncSession) -> None:
+        query = union_all(
+            select(literal('categoria').label('tipo'), CategoriasModels.nome, CategoriasModels.pk_id, CategoriasModels.id),
+            select(
+                literal('centro_treinamento').label('tipo'),
+                CentroTreinamentoModels.nome,
+                CentroTreinamentoModels.pk_id,
+                CentroTreinamentoModels.id,
+            ),
+        )
+        categorias: dict[str, Referencia] = {}
+        centros_treinamento: dict[str, Referencia] = {}
+        for tipo, nome, pk_id, id in (await db_session.execute(query)).all():
+            target = categorias if tipo == 'categoria' else centros_treinamento
+            target[nome] = Referencia(pk_id, id)
+
+        self._categorias = categorias
+        self._centros_treinamento = centros_treinamento
+        self._loaded_at = time.monotonic()
+
+    async def _refresh(self, db_session: AsyncSession, force_before: Optional[float] = None) -> None:
+        async with self._lock:
+            # outra corrotina pode ter recarregado enquanto esperávamos o lock
+            if self._is_stale() or (force_before is not None and self._loaded_at < force_before):
+                await self._load(db_session)
+
+    async def resolve(
+        self, db_session: AsyncSession, categoria: str, centro_treinamento: str
+    ) -> tuple[Optional[Referencia], Optional[Referencia]]:
+        if self._is_stale():
+            await self._refresh(db_session)
+
+        found = self._categorias.get(categoria), self._centros_treinamento.get(centro_treinamento)
+        if None in found and (self._loaded_at is None or time.monotonic() - self._loaded_at > MISS_RELOAD_INTERVAL):
+            await self._refresh(db_session, force_before=time.monotonic())
+            found = self._categorias.get(categoria), self._centros_treinamento.get(centro_treinamento)
+
+        return found
+
+
+reference_cache = ReferenceCache(ttl=settings.REFERENCE_CACHE_TTL)
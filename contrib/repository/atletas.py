@@ -0,0 +1,41 @@
+from uuid import UUID
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from atletas.models import AtletasModels
+from categorias.models import CategoriasModels
+from centro_treinamento.models import CentroTreinamentoModels
+
+# 10 colunas por linha mantém cada INSERT bem abaixo do limite de 32767 parâmetros do asyncpg
+INSERT_CHUNK_SIZE = 1000
+
+
+async def resolve_references(
+    db_session: AsyncSession, categorias: set[str], centros_treinamento: set[str]
+) -> tuple[dict[str, int], dict[str, int]]:
+    query = union_all(
+        select(literal('categoria').label('tipo'), CategoriasModels.nome, CategoriasModels.pk_id)
+        .filter(CategoriasModels.nome.in_(categorias)),
+        select(literal('centro_treinamento').label('tipo'), CentroTreinamentoModels.nome, CentroTreinamentoModels.pk_id)
+        .filter(CentroTreinamentoModels.nome.in_(centros_treinamento)),
+    )
+    resolved: dict[str, dict[str, int]] = {'categoria': {}, 'centro_treinamento': {}}
+    for tipo, nome, pk_id in (await db_session.execute(query)).all():
+        resolved[tipo][nome] = pk_id
+
+    return resolved['categoria'], resolved['centro_treinamento']
+
+
+async def insert_atletas(db_session: AsyncSession, rows: list[dict]) -> dict[str, UUID]:
+    """Insere os atletas ignorando CPFs já cadastrados; retorna cpf -> id dos inseridos."""
+    inserted: dict[str, UUID] = {}
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        stmt = (
+            insert(AtletasModels)
+            .values(rows[start:start + INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=[AtletasModels.cpf])
+            .returning(AtletasModels.cpf, AtletasModels.id)
+        )
+        inserted.update((await db_session.execute(stmt)).tuples().all())
+
+    return inserted
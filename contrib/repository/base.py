@@ -0,0 +1,82 @@
+from typing import Any, Optional, TypeVar
+from uuid import UUID
+from sqlalchemy import ColumnElement, Row, delete, exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from contrib.models import BaseModel
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+async def update_by_id(
+    db_session: AsyncSession,
+    model: type[ModelT],
+    id: UUID,
+    values: dict[str, Any],
+    *criteria: ColumnElement[bool],
+) -> Optional[ModelT]:
+    """Atualiza pelo `id` público com um único UPDATE ... RETURNING e faz o commit.
+
+    Incrementa `version` e renova `updated_at`. Critérios extras (por exemplo a
+    versão esperada de um If-Match) entram no mesmo WHERE. Retorna None quando
+    nenhuma linha corresponde.
+    """
+    if not values:
+        return (await db_session.execute(select(model).filter_by(id=id).filter(*criteria))).scalars().first()
+
+    stmt = (
+        update(model)
+        .filter_by(id=id)
+        .filter(*criteria)
+        .values(**values, version=model.version + 1, updated_at=func.now())
+        .returning(model)
+    )
+    instance = (await db_session.execute(stmt)).scalars().first()
+    if instance is not None:
+        await db_session.commit()
+    return instance
+
+
+async def delete_by_id(
+    db_session: AsyncSession, model: type[ModelT], id: UUID, *returning: Any
+) -> Optional[Row]:
+    """Remove pelo `id` público com um único DELETE ... RETURNING e faz o commit.
+
+    Retorna as colunas pedidas em `returning` (por padrão `pk_id`) ou None
+    quando nenhuma linha corresponde ao id.
+    """
+    stmt = delete(model).filter_by(id=id).returning(*(returning or (model.pk_id,)))
+    row = (await db_session.execute(stmt)).first()
+    if row is not None:
+        await db_session.commit()
+    return row
+
+
+async def update_where(
+    db_session: AsyncSession, model: type[ModelT], values: dict[str, Any], *criteria: ColumnElement[bool]
+) -> int:
+    """Atualiza todas as linhas que atendem a `criteria` com um único UPDATE e faz o commit.
+
+    Como em `update_by_id`, incrementa `version` e renova `updated_at`. Retorna
+    a quantidade de linhas afetadas.
+    """
+    stmt = (
+        update(model)
+        .filter(*criteria)
+        .values(**values, version=model.version + 1, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    result = await db_session.execute(stmt)
+    await db_session.commit()
+    return result.rowcount
+
+
+async def delete_where(db_session: AsyncSession, model: type[ModelT], *criteria: ColumnElement[bool]) -> int:
+    """Remove todas as linhas que atendem a `criteria` com um único DELETE e faz o commit."""
+    stmt = delete(model).filter(*criteria).execution_options(synchronize_session=False)
+    result = await db_session.execute(stmt)
+    await db_session.commit()
+    return result.rowcount
+
+
+async def exists_by_id(db_session: AsyncSession, model: type[ModelT], id: UUID) -> bool:
+    return bool(await db_session.scalar(select(exists().where(model.id == id))))
@@ -1,3 +1,4 @@
 from categorias.models import CategoriasModels
 from atletas.models import AtletasModels
-from centro_treinamento.models import CentroTreinamentoModels
\ No newline at end of file
+from centro_treinamento.models import CentroTreinamentoModels
+from stats.models import AtletasPorCategoriaModels, AtletasPorCentroTreinamentoModels, AtletasPorSexoModels, AtletasStatsDeltaModels
\ No newline at end of file
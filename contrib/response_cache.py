@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional, Protocol
+from urllib.parse import urlparse
+from fastapi import Response
+from configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Valor gravado no lugar de uma chave invalidada. Enquanto ele vale, `add` não
+# grava nada na chave: uma busca que começou antes da escrita, ou que leu uma
+# réplica atrasada, em qualquer worker, não devolve ao cache a versão anterior.
+# Por isso a lápide dura ao menos a janela de read-your-writes, que é o atraso
+# de replicação que a aplicação admite.
+_TOMBSTONE = b''
+INVALIDATION_GRACE = max(5.0, settings.DB_READ_YOUR_WRITES_SECONDS)
+# lápide do namespace inteiro, deixada por `clear`
+_CLEARED = '!cleared'
+
+
+class CachedEntity(NamedTuple):
+    etag: str
+    body: bytes
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, media_type='application/json', headers={'ETag': self.etag})
+
+    def dumps(self) -> bytes:
+        return self.etag.encode() + b'\n' + self.body
+
+    @classmethod
+    def loads(cls, raw: bytes) -> 'CachedEntity':
+        etag, _, body = raw.partition(b'\n')
+        return cls(etag.decode(), body)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def add(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def clear(self, prefix: str) -> None: ...
+
+
+class LRUBackend:
+    """Backend em memória do processo, limitado a `max_entries` chaves."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> None:
+        if await self.get(key) is None:
+            await self.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisBackend:
+    """Cliente mínimo do protocolo RESP2 (Redis, Valkey, KeyDB ou qualquer stand-in compatível).
+
+    Usa só GET, SET ... PX, DEL e SCAN, sobre um pool pequeno de conexões asyncio.
+    """
+
+    def __init__(self, url: str, max_connections: int = 10) -> None:
+        parsed = urlparse(url)
+        self._host = parsed.hostname or 'localhost'
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip('/') or 0)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        if self._password:
+            await self._roundtrip(reader, writer, 'AUTH', self._password)
+        if self._db:
+            await self._roundtrip(reader, writer, 'SELECT', str(self._db))
+        return reader, writer
+
+    @staticmethod
+    def _encode(*args: str | bytes) -> bytes:
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        return b''.join(parts)
+
+    async def _read_reply(self, reader: asyncio.StreamReader):
+        line = (await reader.readline()).rstrip(b'\r\n')
+        if not line:
+            raise ConnectionError('conexão com o Redis encerrada')
+        kind, payload = line[:1], line[1:]
+        if kind == b'+':
+            return payload
+        if kind == b'-':
+            raise RedisError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            size = int(payload)
+            if size == -1:
+                return None
+            data = await reader.readexactly(size + 2)
+            return data[:-2]
+        if kind == b'*':
+            size = int(payload)
+            if size == -1:
+                return None
+            return [await self._read_reply(reader) for _ in range(size)]
+        raise RedisError(f'resposta RESP desconhecida: {line!r}')
+
+    async def _roundtrip(self, reader, writer, *args):
+        writer.write(self._encode(*args))
+        await writer.drain()
+        return await self._read_reply(reader)
+
+    async def execute(self, *args: str | bytes):
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                reply = await self._roundtrip(*conn, *args)
+            except RedisError:
+                self._idle.append(conn)
+                raise
+            except BaseException:
+                conn[1].close()
+                raise
+            self._idle.append(conn)
+            return reply
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute('GET', key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.execute('SET', key, value, 'PX', str(int(ttl * 1000)))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> None:
+        await self.execute('SET', key, value, 'PX', str(int(ttl * 1000)), 'NX')
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.execute('DEL', *keys)
+
+    async def clear(self, prefix: str) -> None:
+        cursor = b'0'
+        while True:
+            cursor, keys = await self.execute('SCAN', cursor, 'MATCH', f'{prefix}*', 'COUNT', '1000')
+            if keys:
+                await self.execute('DEL', *keys)
+            if cursor == b'0':
+                break
+
+
+class ResponseCache:
+    """Cache de respostas serializadas de uma entidade, com ETag, indexado por várias chaves."""
+
+    def __init__(self, namespace: str, backend: Optional[CacheBackend], ttl: float) -> None:
+        self._prefix = f'{namespace}:'
+        self._backend = backend
+        self._ttl = ttl
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._backend is not None
+
+    async def get(self, key: str) -> Optional[CachedEntity]:
+        if self._backend is None:
+            return None
+        try:
+            raw = await self._backend.get(self._prefix + key)
+        except Exception:
+            # o cache nunca pode derrubar uma leitura: falha conta como miss
+            self.errors += 1
+            logger.warning('Falha ao ler do cache %s', self._prefix, exc_info=True)
+            raw = None
+        if not raw:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedEntity.loads(raw)
+
+    @property
+    def generation(self) -> int:
+        """Muda a cada invalidação feita por este processo; capturado antes de uma busca, vai para `set`."""
+        return self._generation
+
+    async def set(self, keys: Iterable[str], entity: CachedEntity, generation: int) -> None:
+        if self._backend is None or generation != self._generation:
+            # houve uma escrita durante a busca: a entidade pode ser anterior a ela
+            return
+        raw = entity.dumps()
+        try:
+            if await self._backend.get(self._prefix + _CLEARED) is not None:
+                return
+            for key in keys:
+                await self._backend.add(self._prefix + key, raw, self._ttl)
+        except Exception:
+            self.errors += 1
+            logger.warning('Falha ao gravar no cache %s', self._prefix, exc_info=True)
+
+    async def invalidate(self, *keys: str) -> None:
+        if self._backend is None:
+            return
+        self._generation += 1
+        try:
+            for key in keys:
+                await self._backend.set(self._prefix + key, _TOMBSTONE, INVALIDATION_GRACE)
+        except Exception:
+            self.errors += 1
+            logger.error('Falha ao invalidar o cache %s', self._prefix, exc_info=True)
+
+    async def clear(self) -> None:
+        if self._backend is None:
+            return
+        self._generation += 1
+        try:
+            await self._backend.clear(self._prefix)
+            await self._backend.set(self._prefix + _CLEARED, _TOMBSTONE, INVALIDATION_GRACE)
+        except Exception:
+            self.errors += 1
+            logger.error('Falha ao limpar o cache %s', self._prefix, exc_info=True)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'backend': settings.RESPONSE_CACHE_BACKEND,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    if settings.RESPONSE_CACHE_BACKEND == 'memory':
+        return LRUBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if settings.RESPONSE_CACHE_BACKEND == 'redis':
+        return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    return None
+
+
+atleta_cache = ResponseCache('atletas', _build_backend(), ttl=settings.RESPONSE_CACHE_TTL)
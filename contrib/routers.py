@@ -2,9 +2,13 @@ from fastapi import APIRouter
 from atletas.controller import router as atletas
 from categorias.controller import router as categorias
 from centro_treinamento.controller import router as centro_treinamento
+from internal.controller import router as internal
+from stats.controller import router as stats
 
 
 api_router = APIRouter()
 api_router.include_router(atletas, prefix='/atletas', tags=['atletas'])
 api_router.include_router(categorias, prefix='/categorias', tags=['categorias'])
-api_router.include_router(centro_treinamento, prefix='/centro_treinamento', tags=['centro_treinamento'])
\ No newline at end of file
+api_router.include_router(centro_treinamento, prefix='/centro_treinamento', tags=['centro_treinamento'])
+api_router.include_router(stats, prefix='/stats', tags=['stats'])
+api_router.include_router(internal, prefix='/internal', tags=['internal'])
\ No newline at end of file
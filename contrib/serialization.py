@@ -0,0 +1,75 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+# json.dumps escreve floats fora de [1e-4, 1e16) como 1e-05, 1e-07 e 1e+16, enquanto
+# pydantic-core e orjson escrevem 0.00001, 1e-7 e 1e16. Quando o corpo tem um
+# número com essa cara, o caminho rápido cai para o json da stdlib e a saída
+# continua idêntica byte a byte à do JSONResponse. O padrão só olha números logo
+# após ':', ',' ou '[', para não casar com o hexadecimal dos UUIDs.
+_DIVERGENT_FLOAT = re.compile(rb'[:,\[]-?(?:\d+(?:\.\d+)?[eE]|0\.0000)')
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+@lru_cache(maxsize=None)
+def _has_floats(schema: Any) -> bool:
+    # schemas sem campos float (ex.: AtletaResumido) dispensam a verificação do corpo
+    return '"number"' in json.dumps(adapter(schema).json_schema(mode="serialization"))
+
+
+def prepare(schema: Any) -> None:
+    """Constrói de antemão o TypeAdapter e a verificação de floats de `schema`."""
+    _has_floats(schema)
+
+
+def dump_json(schema: Any, obj: Any) -> bytes:
+    """Serializa `obj` (entidade ORM, linha ou instância de `schema`) como o `response_model` faria.
+
+    Usa um TypeAdapter construído uma vez por schema e gera o JSON direto no
+    pydantic-core, sem o dump_python + json.dumps do caminho padrão.
+    """
+    type_adapter = adapter(schema)
+    value = type_adapter.validate_python(obj, from_attributes=True)
+    body = type_adapter.dump_json(value)
+    if _has_floats(schema) and _DIVERGENT_FLOAT.search(body):
+        return _stdlib_dumps(type_adapter.dump_python(value, mode="json"))
+    return body
+
+
+def json_response(
+    schema: Any,
+    obj: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    # um Response devolvido pelo handler não passa pelo response_model nem herda
+    # os headers do parâmetro `response`, por isso eles vêm explícitos aqui
+    return Response(
+        content=dump_json(schema, obj), status_code=status_code, media_type="application/json", headers=headers
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse codificado com orjson, com a mesma saída do json da stdlib."""
+
+    def render(self, content: Any) -> bytes:
+        body = orjson.dumps(content)
+        if _DIVERGENT_FLOAT.search(body):
+            return _stdlib_dumps(content)
+        return body
@@ -0,0 +1,46 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    A primeira chamada de `do` para uma chave dispara `fn` numa task; as que
+    chegam enquanto ela roda aguardam a mesma task e recebem o mesmo resultado
+    (ou a mesma exceção). Nada é guardado depois que a task termina: é
+    coalescência de requisições simultâneas, não cache.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        # shield: o cancelamento de uma requisição (cliente desconectou) não
+        # cancela a consulta que as outras estão aguardando
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # marca a exceção como lida mesmo que todos os interessados tenham sido cancelados
+            task.exception()
+
+    def stats(self) -> dict:
+        return {'em_andamento': len(self._calls), 'execucoes': self.calls, 'compartilhadas': self.shared}
+
+
+# compartilhado pelos controllers; as chaves começam pelo recurso
+lookups = SingleFlight()
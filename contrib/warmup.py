@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from uuid import UUID
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from atletas.models import AtletasModels
+from categorias.models import CategoriasModels
+from centro_treinamento.models import CentroTreinamentoModels
+from contrib.reference_cache import reference_cache
+from contrib.serialization import prepare
+
+logger = logging.getLogger(__name__)
+
+_NENHUM = UUID(int=0)
+RETRY_INTERVAL = 5.0
+SHUTDOWN_TIMEOUT = 10.0
+
+# Mesmo SQL dos handlers de consulta pontual e das contagens da paginação: executados
+# uma vez por conexão, entram no cache de compilação do SQLAlchemy e no cache de
+# prepared statements do asyncpg (DB_STATEMENT_CACHE_SIZE) de cada conexão.
+HOT_STATEMENTS = (
+    select(AtletasModels).filter(AtletasModels.id == _NENHUM),
+    select(AtletasModels).filter(AtletasModels.cpf == ''),
+    select(AtletasModels).filter(AtletasModels.nome == ''),
+    select(func.count()).select_from(AtletasModels),
+    select(CategoriasModels).filter(CategoriasModels.id == _NENHUM),
+    select(CategoriasModels).filter(CategoriasModels.nome == ''),
+    select(CentroTreinamentoModels).filter(CentroTreinamentoModels.id == _NENHUM),
+    select(CentroTreinamentoModels).filter(CentroTreinamentoModels.nome == ''),
+)
+# Um atleta de verdade, carregado pela sessão: é o que dispara os selectin de categoria e
+# centro_treinamento, cujo SQL só o loader do ORM monta (os filtros acima não devolvem linhas).
+LOADER_STATEMENT = select(AtletasModels).limit(1)
+
+
+class WarmupState:
+    """Andamento do aquecimento de um processo, exposto em /internal/ready."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.ready = False
+        self.error: Optional[str] = None
+        self.etapas_ms: dict[str, float] = {}
+        self.cold_start_ms: Optional[float] = None
+        self.stopping = asyncio.Event()
+
+    def snapshot(self) -> dict:
+        return {
+            'pronto': self.ready,
+            'erro': self.error,
+            'etapas_ms': self.etapas_ms,
+            'cold_start_ms': self.cold_start_ms,
+        }
+
+
+async def _warm_connection(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        async with AsyncSession(bind=conn) as db_session:
+            for stmt in HOT_STATEMENTS:
+                await db_session.execute(stmt)
+            (await db_session.execute(LOADER_STATEMENT)).scalars().all()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    # checkouts simultâneos: cada corrotina abre uma conexão diferente, que volta ao pool aberta
+    await asyncio.gather(*(_warm_connection(engine) for _ in range(connections)))
+
+
+def warm_serializers(app: FastAPI) -> None:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.response_model is not None:
+            prepare(route.response_model)
+    app.openapi()
+
+
+async def run(app: FastAPI, engines: list[AsyncEngine], connections: int, session_factory) -> None:
+    state: WarmupState = app.state.warmup
+
+    async def etapa(nome: str, coro) -> None:
+        start = time.perf_counter()
+        await coro
+        state.etapas_ms[nome] = round((time.perf_counter() - start) * 1000, 3)
+
+    async def referencias() -> None:
+        async with session_factory() as db_session:
+            await reference_cache.warm(db_session)
+
+    async def serializers() -> None:
+        warm_serializers(app)
+
+    while True:
+        try:
+            for i, engine in enumerate(engines):
+                nome = 'pool' if i == 0 else f'pool_replica_{i - 1}'
+                await etapa(nome, warm_pool(engine, min(connections, engine.pool.size())))
+            await etapa('referencias', referencias())
+            await etapa('serializacao', serializers())
+            break
+        except Exception as exc:
+            # o processo continua no ar, mas fora do balanceamento, até o banco responder
+            state.error = repr(exc)
+            logger.exception('Falha no aquecimento; nova tentativa em %.0f s', RETRY_INTERVAL)
+            try:
+                await asyncio.wait_for(state.stopping.wait(), RETRY_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+    state.error = None
+    state.cold_start_ms = round((time.perf_counter() - state.started_at) * 1000, 3)
+    state.ready = True
+    logger.info('Aquecimento concluído em %.1f ms: %s', state.cold_start_ms, state.etapas_ms)
+
+
+async def stop(app: FastAPI, task: asyncio.Task) -> None:
+    """Interrompe as novas tentativas e espera a atual terminar.
+
+    Cancelar no meio do aquecimento interromperia conexões sendo abertas ou
+    fechadas; o cancelamento fica só para uma tentativa presa além do limite.
+    """
+    app.state.warmup.stopping.set()
+    try:
+        await asyncio.wait_for(task, SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning('Aquecimento interrompido no desligamento')
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import PlainTextResponse
+from configs.database import get_engine, replica_router
+from configs.slow_queries import slow_query_log
+from contrib import metrics
+from contrib.response_cache import atleta_cache
+from contrib.serialization import json_response
+from internal.schema import CacheStatusOut, PoolStatusOut, ProntidaoOut, SlowQueryOut
+
+router = APIRouter()
+
+
+@router.get(
+    '/ready',
+    summary="Verificar se o processo terminou o aquecimento",
+    status_code=status.HTTP_200_OK,
+    response_model=ProntidaoOut,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {'model': ProntidaoOut}},
+)
+async def ready(request: Request) -> ProntidaoOut:
+    state = request.app.state.warmup
+    return json_response(
+        ProntidaoOut,
+        state.snapshot(),
+        status_code=status.HTTP_200_OK if state.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@router.get(
+    '/pool',
+    summary="Consultar o estado do pool de conexões",
+    status_code=status.HTTP_200_OK,
+    response_model=PoolStatusOut,
+)
+async def pool_status() -> PoolStatusOut:
+    return PoolStatusOut(**get_engine().pool.snapshot())
+
+
+@router.get(
+    '/cache',
+    summary="Consultar os contadores do cache de respostas de atletas",
+    status_code=status.HTTP_200_OK,
+    response_model=CacheStatusOut,
+)
+async def cache_status() -> CacheStatusOut:
+    return CacheStatusOut(**atleta_cache.stats())
+
+
+@router.get(
+    '/metrics',
+    summary="Exportar métricas por rota no formato do Prometheus",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+)
+async def prometheus_metrics() -> PlainTextResponse:
+    pools = {'primary': get_engine().pool.snapshot()}
+    pools.update(
+        (f'replica_{i}', replica.engine.pool.snapshot()) for i, replica in enumerate(replica_router.replicas)
+    )
+    return PlainTextResponse(metrics.render(pools), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@router.get(
+    '/slow-queries',
+    summary="Listar os statements lentos mais recentes",
+    status_code=status.HTTP_200_OK,
+    response_model=list[SlowQueryOut],
+)
+async def slow_queries() -> list[SlowQueryOut]:
+    return [SlowQueryOut(**entry) for entry in slow_query_log.entries()]
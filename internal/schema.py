@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Annotated, Optional
+from pydantic import Field
+from contrib.schema import BaseSchema
+
+
+class PoolStatusOut(BaseSchema):
+    tamanho: Annotated[int, Field(description='Tamanho configurado do pool')]
+    em_uso: Annotated[int, Field(description='Conexões em uso (checked out)')]
+    disponiveis: Annotated[int, Field(description='Conexões ociosas no pool')]
+    overflow: Annotated[int, Field(description='Conexões abertas acima do tamanho do pool')]
+    max_overflow: Annotated[int, Field(description='Limite de conexões de overflow')]
+    checkouts: Annotated[int, Field(description='Total de checkouts desde a criação do pool')]
+    timeouts: Annotated[int, Field(description='Checkouts que estouraram DB_POOL_TIMEOUT')]
+    espera_total_ms: Annotated[float, Field(description='Tempo total de espera por conexões')]
+    espera_media_ms: Annotated[float, Field(description='Tempo médio de espera por checkout')]
+    espera_maxima_ms: Annotated[float, Field(description='Maior espera observada por um checkout')]
+
+
+class CacheStatusOut(BaseSchema):
+    backend: Annotated[str, Field(description='Backend configurado em RESPONSE_CACHE_BACKEND')]
+    hits: Annotated[int, Field(description='Leituras respondidas pelo cache')]
+    misses: Annotated[int, Field(description='Leituras que precisaram ir ao banco')]
+    errors: Annotated[int, Field(description='Falhas de comunicação com o backend')]
+    hit_ratio: Annotated[float, Field(description='Proporção de hits sobre o total de leituras')]
+
+
+class SlowQueryOut(BaseSchema):
+    registrado_em: Annotated[datetime, Field(description='Momento em que o statement terminou')]
+    rota: Annotated[Optional[str], Field(description='Template da rota que executou o statement')]
+    duracao_ms: Annotated[float, Field(description='Duração do statement')]
+    sql: Annotated[str, Field(description='Statement com os placeholders, sem os valores')]
+    parametros: Annotated[list[str], Field(description='Tipos dos parâmetros vinculados')]
+    executemany: Annotated[bool, Field(description='Se o statement rodou como executemany')]
+    plano: Annotated[Optional[str], Field(description='Saída do EXPLAIN (ANALYZE, BUFFERS), quando amostrado')]
+
+
+class ProntidaoOut(BaseSchema):
+    pronto: Annotated[bool, Field(description='Se o aquecimento do processo terminou')]
+    erro: Annotated[Optional[str], Field(description='Última falha do aquecimento, enquanto ele é refeito')]
+    etapas_ms: Annotated[dict[str, float], Field(description='Duração de cada etapa do aquecimento')]
+    cold_start_ms: Annotated[Optional[float], Field(description='Tempo entre a criação da aplicação e a prontidão')]
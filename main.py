@@ -0,0 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from atletas.controller import insert_group
+from configs.database import async_session, dispose_engine, init_engine, replica_router
+from configs.settings import settings
+from contrib import warmup
+from contrib.metrics import MetricsMiddleware
+from contrib.routers import api_router
+from contrib.serialization import ORJSONResponse
+from stats import rollup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # o aquecimento roda em segundo plano: o processo já aceita conexões, mas
+    # /internal/ready só responde 200 quando pool, statements e schemas estão prontos
+    engines = [init_engine(), *(replica.engine for replica in replica_router.replicas)]
+    task = asyncio.create_task(
+        warmup.run(app, engines, settings.DB_WARMUP_CONNECTIONS, async_session)
+    )
+    stats_stopping = asyncio.Event()
+    stats_task = asyncio.create_task(rollup.run(engines[0], settings.STATS_ROLLUP_INTERVAL, stats_stopping))
+    yield
+    await warmup.stop(app, task)
+    # grava os POSTs de atletas que ainda estão esperando o próximo grupo
+    await insert_group.close()
+    await rollup.stop(stats_task, stats_stopping)
+    await dispose_engine()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title='WorkoutApi', lifespan=lifespan, default_response_class=ORJSONResponse)
+    app.state.warmup = warmup.WarmupState()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(api_router)
+    return app
@@ -0,0 +1,37 @@
+"""Sobe a API com vários workers do uvicorn, um por núcleo por padrão.
+
+Cada worker é um processo novo que cria o próprio engine no lifespan
+(configs.database.init_engine). O pool de cada um sai de DB_CONNECTION_BUDGET
+dividido pelo número de workers, repassado a eles em WEB_CONCURRENCY. SIGINT e
+SIGTERM encerram os workers pelo lifespan: o group commit pendente é gravado e
+as conexões são fechadas.
+
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    # os workers herdam o ambiente e leem WEB_CONCURRENCY em configs.settings
+    os.environ['WEB_CONCURRENCY'] = str(args.workers)
+    uvicorn.run(
+        'main:create_app',
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=30,
+    )
+
+
+if __name__ == '__main__':
+    main()
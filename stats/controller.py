@@ -0,0 +1,132 @@
+from fastapi import APIRouter, status
+from sqlalchemy import func, union_all
+from sqlalchemy.future import select
+from categorias.models import CategoriasModels
+from centro_treinamento.models import CentroTreinamentoModels
+from contrib.dependencies import ReadDatabaseDependency
+from stats.models import (
+    AtletasPorCategoriaModels,
+    AtletasPorCentroTreinamentoModels,
+    AtletasPorSexoModels,
+    AtletasStatsDeltaModels,
+)
+from stats.schema import EstatisticasOut, MediasPorSexo, TotalPorCategoria, TotalPorCentroTreinamento
+
+router = APIRouter()
+
+# As consultas leem as tabelas de resumo (uma linha por categoria, centro ou
+# sexo) mais os deltas que os triggers de atletas registraram desde a última
+# consolidação (STATS_ROLLUP_INTERVAL): nenhuma delas percorre atletas.
+
+
+def _pendentes(coluna):
+    return (
+        select(coluna.label('chave'), func.sum(AtletasStatsDeltaModels.total).label('total'))
+        .group_by(coluna)
+        .subquery()
+    )
+
+
+async def _por_categoria(db_session) -> list[TotalPorCategoria]:
+    pendentes = _pendentes(AtletasStatsDeltaModels.categoria_id)
+    rows = await db_session.execute(
+        select(
+            CategoriasModels.nome,
+            (func.coalesce(AtletasPorCategoriaModels.total, 0) + func.coalesce(pendentes.c.total, 0)).label('total'),
+        )
+        .outerjoin(AtletasPorCategoriaModels, AtletasPorCategoriaModels.categoria_id == CategoriasModels.pk_id)
+        .outerjoin(pendentes, pendentes.c.chave == CategoriasModels.pk_id)
+        .order_by(CategoriasModels.nome)
+    )
+    return [TotalPorCategoria(categoria=row.nome, total=row.total) for row in rows]
+
+
+async def _por_centro_treinamento(db_session) -> list[TotalPorCentroTreinamento]:
+    pendentes = _pendentes(AtletasStatsDeltaModels.centro_treinamento_id)
+    rows = await db_session.execute(
+        select(
+            CentroTreinamentoModels.nome,
+            (
+                func.coalesce(AtletasPorCentroTreinamentoModels.total, 0) + func.coalesce(pendentes.c.total, 0)
+            ).label('total'),
+        )
+        .outerjoin(
+            AtletasPorCentroTreinamentoModels,
+            AtletasPorCentroTreinamentoModels.centro_treinamento_id == CentroTreinamentoModels.pk_id,
+        )
+        .outerjoin(pendentes, pendentes.c.chave == CentroTreinamentoModels.pk_id)
+        .order_by(CentroTreinamentoModels.nome)
+    )
+    return [TotalPorCentroTreinamento(centro_treinamento=row.nome, total=row.total) for row in rows]
+
+
+async def _por_sexo(db_session) -> list[MediasPorSexo]:
+    linhas = union_all(*(
+        select(model.sexo, model.total, model.soma_idade, model.soma_peso, model.soma_altura)
+        for model in (AtletasPorSexoModels, AtletasStatsDeltaModels)
+    )).subquery()
+    total = func.sum(linhas.c.total)
+    rows = await db_session.execute(
+        select(
+            linhas.c.sexo,
+            total.label('total'),
+            func.sum(linhas.c.soma_idade).label('soma_idade'),
+            func.sum(linhas.c.soma_peso).label('soma_peso'),
+            func.sum(linhas.c.soma_altura).label('soma_altura'),
+        )
+        .group_by(linhas.c.sexo)
+        .having(total > 0)
+        .order_by(linhas.c.sexo)
+    )
+    # as somas chegam como Decimal (numeric); as médias saem em float, como no schema
+    return [
+        MediasPorSexo(
+            sexo=row.sexo,
+            total=row.total,
+            media_idade=round(float(row.soma_idade) / row.total, 2),
+            media_peso=round(float(row.soma_peso) / row.total, 2),
+            media_altura=round(float(row.soma_altura) / row.total, 2),
+        )
+        for row in rows
+    ]
+
+
+@router.get(
+    '/',
+    summary="Consultar todas as estatísticas de atletas",
+    status_code=status.HTTP_200_OK,
+    response_model=EstatisticasOut,
+)
+async def get_all(db_session: ReadDatabaseDependency) -> EstatisticasOut:
+    return EstatisticasOut(
+        categorias=await _por_categoria(db_session),
+        centros_treinamento=await _por_centro_treinamento(db_session),
+        sexos=await _por_sexo(db_session),
+    )
+
+@router.get(
+    '/categorias',
+    summary="Quantidade de atletas por categoria",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TotalPorCategoria],
+)
+async def get_por_categoria(db_session: ReadDatabaseDependency) -> list[TotalPorCategoria]:
+    return await _por_categoria(db_session)
+
+@router.get(
+    '/centros_treinamento',
+    summary="Quantidade de atletas por centro de treinamento",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TotalPorCentroTreinamento],
+)
+async def get_por_centro_treinamento(db_session: ReadDatabaseDependency) -> list[TotalPorCentroTreinamento]:
+    return await _por_centro_treinamento(db_session)
+
+@router.get(
+    '/sexo',
+    summary="Quantidade e médias de idade, peso e altura por sexo",
+    status_code=status.HTTP_200_OK,
+    response_model=list[MediasPorSexo],
+)
+async def get_por_sexo(db_session: ReadDatabaseDependency) -> list[MediasPorSexo]:
+    return await _por_sexo(db_session)
@@ -0,0 +1,57 @@
+from decimal import Decimal
+from contrib.models import BaseModel
+from sqlalchemy import BigInteger, ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Tabelas de resumo de atletas (ver as migrations c26c4ea641a0 e 5b1e9f3a7c42).
+# Guardam contagens e somas, não médias. Os triggers de atletas só acrescentam
+# deltas em AtletasStatsDeltaModels; atletas_stats_rollup() os consolida aqui.
+
+
+class AtletasPorCategoriaModels(BaseModel):
+    __tablename__ = 'stats_atletas_por_categoria'
+    id = None
+
+    categoria_id: Mapped[int] = mapped_column(ForeignKey('categorias.pk_id', ondelete='CASCADE'), primary_key=True)
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+
+
+class AtletasPorCentroTreinamentoModels(BaseModel):
+    __tablename__ = 'stats_atletas_por_centro_treinamento'
+    id = None
+
+    centro_treinamento_id: Mapped[int] = mapped_column(
+        ForeignKey('centros_treinamento.pk_id', ondelete='CASCADE'), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+
+
+class AtletasPorSexoModels(BaseModel):
+    __tablename__ = 'stats_atletas_por_sexo'
+    id = None
+
+    sexo: Mapped[str] = mapped_column(String(1), primary_key=True)
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+    soma_idade: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+    # numeric: somas e subtrações repetidas de deltas não acumulam erro de arredondamento
+    soma_peso: Mapped[Decimal] = mapped_column(Numeric, nullable=False, server_default='0')
+    soma_altura: Mapped[Decimal] = mapped_column(Numeric, nullable=False, server_default='0')
+
+
+class AtletasStatsDeltaModels(BaseModel):
+    """Log só de inserção: uma linha por (categoria, centro, sexo) alterado em cada statement.
+
+    Escritas concorrentes em atletas nunca disputam uma mesma linha aqui, ao
+    contrário das poucas linhas de resumo.
+    """
+    __tablename__ = 'stats_atletas_delta'
+    id = None
+
+    pk_id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    categoria_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    centro_treinamento_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    sexo: Mapped[str] = mapped_column(String(1), nullable=False)
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    soma_idade: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    soma_peso: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+    soma_altura: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_TIMEOUT = 10.0
+
+_ROLLUP = text('SELECT atletas_stats_rollup()')
+
+
+async def run(engine: AsyncEngine, interval: float, stopping: asyncio.Event) -> None:
+    """Consolida o log de deltas nas tabelas de resumo a cada `interval` segundos.
+
+    Todos os workers rodam o laço; a função do banco pega um advisory lock e
+    as rodadas simultâneas de outros workers terminam sem fazer nada.
+    """
+    if engine.dialect.name != 'postgresql':
+        return
+    while True:
+        try:
+            await asyncio.wait_for(stopping.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(_ROLLUP)
+        except Exception:
+            logger.exception('Falha ao consolidar as estatísticas de atletas')
+        # a última rodada acontece depois do sinal: o log fica vazio no desligamento
+        if stopping.is_set():
+            return
+
+
+async def stop(task: asyncio.Task, stopping: asyncio.Event) -> None:
+    stopping.set()
+    try:
+        await asyncio.wait_for(task, SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning('Consolidação das estatísticas interrompida no desligamento')
@@ -0,0 +1,24 @@
+from typing import Annotated, Optional
+from pydantic import Field
+from contrib.schema import BaseSchema
+
+
+class TotalPorCategoria(BaseSchema):
+    categoria: Annotated[str, Field(description='Nome da categoria', example='Scale')]
+    total: Annotated[int, Field(description='Quantidade de atletas na categoria', example=42)]
+
+class TotalPorCentroTreinamento(BaseSchema):
+    centro_treinamento: Annotated[str, Field(description='Nome do centro de treinamento', example='CT King')]
+    total: Annotated[int, Field(description='Quantidade de atletas no centro de treinamento', example=42)]
+
+class MediasPorSexo(BaseSchema):
+    sexo: Annotated[str, Field(description='Gênero do atleta', example='M')]
+    total: Annotated[int, Field(description='Quantidade de atletas', example=42)]
+    media_idade: Annotated[Optional[float], Field(None, description='Idade média', example=27.5)]
+    media_peso: Annotated[Optional[float], Field(None, description='Peso médio', example=75.2)]
+    media_altura: Annotated[Optional[float], Field(None, description='Altura média', example=1.76)]
+
+class EstatisticasOut(BaseSchema):
+    categorias: list[TotalPorCategoria]
+    centros_treinamento: list[TotalPorCentroTreinamento]
+    sexos: list[MediasPorSexo]
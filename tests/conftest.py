@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+import configs.database as database
+from atletas import controller as atletas_controller
+from atletas.models import AtletasModels
+from categorias import controller as categorias_controller
+from categorias.models import CategoriasModels
+from centro_treinamento import controller as centro_treinamento_controller
+from centro_treinamento.models import CentroTreinamentoModels
+from configs.settings import settings
+from contrib.models import BaseModel
+from contrib.pagination import TableCounter
+from contrib.reference_cache import reference_cache
+from contrib.repository import models  # noqa: F401 (registra todas as tabelas no metadata)
+from main import create_app
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # o SQLite só verifica chaves estrangeiras com este pragma, ligado por conexão
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+@pytest.fixture
+async def engine(tmp_path, monkeypatch):
+    """Engine do primário num SQLite novo por teste, com as tabelas criadas a partir dos models."""
+    monkeypatch.setattr(settings, 'DB_URL', f'sqlite+aiosqlite:///{tmp_path / "workout.db"}')
+    monkeypatch.setattr(settings, 'DB_REPLICA_URLS', [])
+    # estado em memória dos processos, que não pode vazar de um banco para outro
+    reference_cache.invalidate()
+    for module, name, model in (
+        (atletas_controller, 'atletas_counter', AtletasModels),
+        (categorias_controller, 'categorias_counter', CategoriasModels),
+        (centro_treinamento_controller, 'centros_treinamento_counter', CentroTreinamentoModels),
+    ):
+        monkeypatch.setattr(module, name, TableCounter(model, settings.COUNT_CACHE_RECONCILE_SECONDS))
+
+    engine = database.init_engine()
+    event.listen(engine.sync_engine, 'connect', _enable_foreign_keys)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    yield engine
+    await atletas_controller.insert_group.close()
+    await database.dispose_engine()
+
+
+@pytest.fixture
+async def referencias(engine):
+    """Uma categoria e um centro de treinamento, os nomes usados por `atleta_payload`."""
+    async with database.async_session() as session:
+        categoria = CategoriasModels(nome='Scale', created_at=datetime.now(timezone.utc))
+        centro_treinamento = CentroTreinamentoModels(
+            nome='CT King', endereco='Rua X, 100', proprietario='Marcos', created_at=datetime.now(timezone.utc)
+        )
+        session.add_all([categoria, centro_treinamento])
+        await session.commit()
+    return categoria, centro_treinamento
+
+
+@pytest.fixture
+async def client(engine):
+    # o ASGITransport não roda o lifespan: o engine vem da fixture `engine`
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+        yield client
+
+
+def atleta_payload(cpf: str, **fields) -> dict:
+    return {
+        'nome': 'Joao',
+        'cpf': cpf,
+        'idade': 25,
+        'peso': 75.5,
+        'altura': 1.7,
+        'sexo': 'M',
+        'categoria': {'nome': 'Scale'},
+        'centro_treinamento': {'nome': 'CT King'},
+        **fields,
+    }
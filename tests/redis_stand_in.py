@@ -0,0 +1,123 @@
+import asyncio
+import fnmatch
+import time
+from typing import Optional
+
+
+class RedisStandIn:
+    """Servidor RESP2 em memória com o subconjunto de comandos que o RedisBackend usa.
+
+    Atende AUTH, SELECT, GET, SET (com PX e NX), DEL e SCAN (com MATCH e COUNT)
+    e guarda os comandos recebidos em `commands`.
+    """
+
+    def __init__(self, password: Optional[str] = None) -> None:
+        self.password = password
+        self.data: dict[bytes, tuple[Optional[float], bytes]] = {}
+        # ordem de criação das chaves, nunca encolhe: o cursor do SCAN é uma posição
+        # nela, então remoções entre páginas não pulam chaves, como no Redis
+        self._order: list[bytes] = []
+        self.commands: list[list[bytes]] = []
+        self.connections = 0
+        self._server: Optional[asyncio.Server] = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        auth = f':{self.password}@' if self.password else ''
+        return f'redis://{auth}{host}:{port}/1'
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        # o RedisBackend mantém as conexões abertas no pool; wait_closed espera por elas
+        for writer in self._writers:
+            writer.close()
+        await self._server.wait_closed()
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[list[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        assert line.startswith(b'*'), line
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    @staticmethod
+    def _bulk(value: Optional[bytes]) -> bytes:
+        return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def _reply(self, args: list[bytes], authenticated: bool) -> tuple[bytes, bool]:
+        command, *rest = args
+        command = command.upper()
+        if command == b'AUTH':
+            if rest[0].decode() != self.password:
+                return b'-WRONGPASS invalid password\r\n', False
+            return b'+OK\r\n', True
+        if self.password and not authenticated:
+            return b'-NOAUTH Authentication required.\r\n', False
+        if command == b'SELECT':
+            return b'+OK\r\n', authenticated
+        if command == b'GET':
+            return self._bulk(self._get(rest[0])), authenticated
+        if command == b'SET':
+            key, value, *options = rest
+            options = [option.upper() for option in options]
+            if b'NX' in options and self._get(key) is not None:
+                return b'$-1\r\n', authenticated
+            expires_at = None
+            if b'PX' in options:
+                expires_at = time.monotonic() + int(rest[2 + options.index(b'PX') + 1]) / 1000
+            if key not in self.data:
+                self._order.append(key)
+            self.data[key] = (expires_at, value)
+            return b'+OK\r\n', authenticated
+        if command == b'DEL':
+            removed = sum(self.data.pop(key, None) is not None for key in rest)
+            return b':%d\r\n' % removed, authenticated
+        if command == b'SCAN':
+            cursor = int(rest[0])
+            options = dict(zip((option.upper() for option in rest[1::2]), rest[2::2]))
+            count = int(options.get(b'COUNT', 10))
+            page = self._order[cursor:cursor + count]
+            next_cursor = cursor + count if cursor + count < len(self._order) else 0
+            pattern = options.get(b'MATCH', b'*').decode()
+            matched = [
+                key for key in dict.fromkeys(page)
+                if self._get(key) is not None and fnmatch.fnmatchcase(key.decode(), pattern)
+            ]
+            body = b''.join(self._bulk(key) for key in matched)
+            return b'*2\r\n%s*%d\r\n%s' % (self._bulk(str(next_cursor).encode()), len(matched), body), authenticated
+        return b'-ERR unknown command\r\n', authenticated
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        authenticated = False
+        try:
+            while (args := await self._read_command(reader)) is not None:
+                self.commands.append(args)
+                reply, authenticated = self._reply(args, authenticated)
+                writer.write(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
@@ -0,0 +1,127 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+import configs.database as database
+from atletas import controller
+from categorias.models import CategoriasModels
+from conftest import atleta_payload
+from contrib.repository.atletas import insert_atletas, resolve_references
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_importacao_informa_o_resultado_de_cada_linha(client, referencias):
+    assert (await client.post('/atletas/', json=atleta_payload('11111111111'))).status_code == 201
+
+    response = await client.post('/atletas/bulk', json=[
+        atleta_payload('22222222222'),
+        atleta_payload('11111111111'),
+        atleta_payload('22222222222'),
+        atleta_payload('33333333333', idade='muitos'),
+        atleta_payload('44444444444', categoria={'nome': 'Inexiste'}),
+        atleta_payload('55555555555', centro_treinamento={'nome': 'Inexiste'}),
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['total'], body['inseridos'], body['conflitos'], body['erros']) == (6, 1, 2, 3)
+    resultados = body['resultados']
+    assert [r['linha'] for r in resultados] == [1, 2, 3, 4, 5, 6]
+    assert [r['status'] for r in resultados] == ['inserido', 'conflito', 'conflito', 'erro', 'erro', 'erro']
+    assert resultados[0]['id']
+    assert resultados[1]['detalhe'] == 'Atleta já cadastrado com o cpf: 11111111111'
+    assert resultados[2]['detalhe'] == 'CPF repetido no lote: 22222222222'
+    assert resultados[3]['detalhe'].startswith('idade:')
+    assert resultados[4]['detalhe'] == 'A categoria Inexiste não foi encontrada.'
+    assert resultados[5]['detalhe'] == 'O centro de treinamento Inexiste não foi encontrado.'
+
+    response = await client.get(f"/atletas/{resultados[0]['id']}")
+    assert response.json()['cpf'] == '22222222222'
+
+
+async def test_importacao_ndjson_numera_as_linhas_do_arquivo(client, referencias):
+    body = '\n'.join([
+        json.dumps(atleta_payload('11111111111')),
+        '',
+        '{"nome": ',
+        json.dumps(atleta_payload('22222222222')),
+    ])
+    response = await client.post(
+        '/atletas/bulk', content=body, headers={'Content-Type': 'application/x-ndjson'}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['total'], body['inseridos'], body['erros']) == (3, 2, 1)
+    assert [(r['linha'], r['status']) for r in body['resultados']] == [
+        (1, 'inserido'), (3, 'erro'), (4, 'inserido'),
+    ]
+    assert body['resultados'][1]['detalhe'].startswith('JSON inválido')
+
+
+@pytest.mark.parametrize('content', [b'{}', b'nao e json'])
+async def test_corpo_que_nao_e_lista_responde_422(client, referencias, content):
+    response = await client.post('/atletas/bulk', content=content, headers={'Content-Type': 'application/json'})
+
+    assert response.status_code == 422
+
+
+async def test_lote_acima_do_limite_responde_413(client, referencias, monkeypatch):
+    monkeypatch.setattr(controller, 'BULK_MAX_ROWS', 2)
+
+    response = await client.post('/atletas/bulk', json=[atleta_payload(f'1000000000{i}') for i in range(3)])
+
+    assert response.status_code == 413
+    assert (await client.get('/atletas/')).json()['total'] == 0
+
+
+async def test_categoria_removida_durante_a_importacao_vira_erro_na_linha(client, referencias, monkeypatch):
+    async with database.async_session() as session:
+        session.add(CategoriasModels(nome='Velha', created_at=datetime.now(timezone.utc)))
+        await session.commit()
+
+    async def resolve_e_remove(db_session, categorias, centros_treinamento):
+        resolvidas = await resolve_references(db_session, categorias, centros_treinamento)
+        # outra requisição remove a categoria entre a resolução dos nomes e o INSERT
+        async with database.async_session() as session:
+            await session.execute(delete(CategoriasModels).filter_by(nome='Velha'))
+            await session.commit()
+        return resolvidas
+
+    monkeypatch.setattr(controller, 'resolve_references', resolve_e_remove)
+    response = await client.post('/atletas/bulk', json=[
+        atleta_payload('11111111111'),
+        atleta_payload('22222222222', categoria={'nome': 'Velha'}),
+        atleta_payload('33333333333'),
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['inseridos'], body['erros']) == (2, 1)
+    assert [r['status'] for r in body['resultados']] == ['inserido', 'erro', 'inserido']
+    assert body['resultados'][1]['detalhe'] == 'A categoria Velha não foi encontrada.'
+    assert (await client.get('/atletas/', params={'contagem': 'exact'})).json()['total'] == 2
+
+
+async def test_linha_que_falha_sozinha_nao_descarta_o_lote(client, referencias, monkeypatch):
+    async def insert_com_falha(db_session, rows):
+        if any(row['cpf'] == '22222222222' for row in rows):
+            raise IntegrityError('INSERT', {}, Exception('violação de restrição'))
+        return await insert_atletas(db_session, rows)
+
+    monkeypatch.setattr(controller, 'insert_atletas', insert_com_falha)
+    response = await client.post('/atletas/bulk', json=[
+        atleta_payload('11111111111'),
+        atleta_payload('22222222222'),
+        atleta_payload('11111111111'),
+        atleta_payload('33333333333'),
+    ])
+
+    body = response.json()
+    assert [r['status'] for r in body['resultados']] == ['inserido', 'erro', 'conflito', 'inserido']
+    assert body['resultados'][1]['detalhe'] == 'Erro de integridade: violação de restrição'
+    assert (body['inseridos'], body['conflitos'], body['erros']) == (2, 1, 1)
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import configs.database as database
+from centro_treinamento.models import CentroTreinamentoModels
+from conftest import atleta_payload
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def atletas(client, referencias) -> list[dict]:
+    """Dois atletas no CT King e um no CT Queen, todos na categoria Scale."""
+    async with database.async_session() as session:
+        session.add(CentroTreinamentoModels(
+            nome='CT Queen', endereco='Rua Z, 1', proprietario='Ana', created_at=datetime.now(timezone.utc)
+        ))
+        await session.commit()
+    payloads = [
+        atleta_payload('11111111111'),
+        atleta_payload('22222222222'),
+        atleta_payload('33333333333', centro_treinamento={'nome': 'CT Queen'}),
+    ]
+    criados = []
+    for payload in payloads:
+        response = await client.post('/atletas/', json=payload)
+        assert response.status_code == 201
+        criados.append(response.json())
+    return criados
+
+
+@pytest.mark.parametrize('method', ['PATCH', 'DELETE'])
+async def test_sem_filtro_responde_400(client, atletas, method):
+    response = await client.request(method, '/atletas/bulk', json={'idade': 30})
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Informe a categoria ou o centro de treinamento dos atletas'
+    assert (await client.get('/atletas/', params={'contagem': 'exact'})).json()['total'] == 3
+
+
+async def test_patch_sem_campos_responde_400(client, atletas):
+    response = await client.patch('/atletas/bulk', params={'categoria': 'Scale'}, json={})
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Informe ao menos um campo para alterar'
+
+
+async def test_patch_para_centro_inexistente_responde_400(client, atletas):
+    response = await client.patch(
+        '/atletas/bulk', params={'categoria': 'Scale'}, json={'centro_treinamento': {'nome': 'CT Nenhum'}}
+    )
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'O centro de treinamento CT Nenhum não foi encontrado.'
+
+
+async def test_patch_altera_so_os_atletas_filtrados(client, atletas):
+    response = await client.patch(
+        '/atletas/bulk', params={'centro_treinamento': 'CT King'}, json={'idade': 40}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {'afetados': 2}
+    idades = [(await client.get(f"/atletas/{atleta['id']}")).json()['idade'] for atleta in atletas]
+    assert idades == [40, 40, 25]
+
+
+async def test_patch_move_os_atletas_de_centro(client, atletas):
+    response = await client.patch(
+        '/atletas/bulk',
+        params={'categoria': 'Scale', 'centro_treinamento': 'CT King'},
+        json={'centro_treinamento': {'nome': 'CT Queen'}},
+    )
+
+    assert response.json() == {'afetados': 2}
+    for atleta in atletas:
+        response = await client.get(f"/atletas/{atleta['id']}")
+        assert response.json()['centro_treinamento']['nome'] == 'CT Queen'
+
+
+async def test_filtro_por_nome_inexistente_nao_afeta_ninguem(client, atletas):
+    response = await client.delete('/atletas/bulk', params={'categoria': 'Nenhuma'})
+
+    assert response.status_code == 200
+    assert response.json() == {'afetados': 0}
+
+
+async def test_delete_remove_so_os_atletas_filtrados(client, atletas):
+    response = await client.delete('/atletas/bulk', params={'centro_treinamento': 'CT King'})
+
+    assert response.json() == {'afetados': 2}
+    assert [(await client.get(f"/atletas/{atleta['id']}")).status_code for atleta in atletas] == [404, 404, 200]
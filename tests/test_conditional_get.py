@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import event
+
+from conftest import atleta_payload
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def statements(engine) -> list[str]:
+    """SQL executado no primário a partir do momento em que a fixture é pedida."""
+    executados = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        executados.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', registrar)
+    yield executados
+    event.remove(engine.sync_engine, 'before_cursor_execute', registrar)
+
+
+@pytest.fixture
+async def atleta(client, referencias) -> dict:
+    return (await client.post('/atletas/', json=atleta_payload('12345678901'))).json()
+
+
+def _paths(atleta: dict) -> dict:
+    return {'id': f"/atletas/{atleta['id']}", 'cpf': f"/atletas/cpf/{atleta['cpf']}"}
+
+
+@pytest.mark.parametrize('por', ['id', 'cpf'])
+async def test_if_none_match_atual_so_le_as_versoes(client, engine, atleta, statements, por):
+    path = _paths(atleta)[por]
+    etag = (await client.get(path)).headers['etag']
+
+    checkouts = engine.pool.snapshot()['checkouts']
+    statements.clear()
+    response = await client.get(path, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+    assert engine.pool.snapshot()['checkouts'] - checkouts == 1
+    # uma única consulta, só com as colunas de versão: nem o atleta inteiro nem o selectin das relações
+    assert len(statements) == 1
+    colunas = statements[0].split('FROM')[0]
+    assert colunas.count('.version') == 3 and 'nome' not in colunas
+
+
+@pytest.mark.parametrize('por', ['id', 'cpf'])
+async def test_if_none_match_antigo_devolve_o_corpo(client, engine, atleta, por):
+    path = _paths(atleta)[por]
+    etag = (await client.get(path)).headers['etag']
+
+    response = await client.get(path, headers={'If-None-Match': '"0.0.0"'})
+
+    assert response.status_code == 200
+    assert response.headers['etag'] == etag
+    assert response.json()['cpf'] == atleta['cpf']
+
+
+async def test_if_none_match_de_atleta_inexistente_responde_404(client, atleta):
+    response = await client.get('/atletas/cpf/00000000000', headers={'If-None-Match': '"1.1.1"'})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize('recurso', ['categorias', 'centro_treinamento'])
+async def test_if_none_match_de_referencia_so_le_a_versao(client, engine, referencias, statements, recurso):
+    id = (await client.get(f'/{recurso}/')).json()['items'][0]['id']
+    etag = (await client.get(f'/{recurso}/{id}')).headers['etag']
+    statements.clear()
+
+    response = await client.get(f'/{recurso}/{id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert len(statements) == 1
+    assert statements[0].split('FROM')[0].strip().endswith('.version')
+
+    response = await client.get(f'/{recurso}/{id}', headers={'If-None-Match': '"0"'})
+    assert response.status_code == 200
+    assert response.headers['etag'] == etag
@@ -0,0 +1,104 @@
+import pytest
+
+from conftest import atleta_payload
+from contrib.etag import etag_matches, make_etag, parse_if_match
+
+pytestmark = pytest.mark.anyio
+
+
+def test_parse_if_match():
+    assert parse_if_match('*') is None
+    assert parse_if_match('"1.2.3", W/"4.5.6", "x", "7"') == [(1, 2, 3), (7,)]
+
+
+def test_if_none_match_usa_comparacao_fraca():
+    assert etag_matches('W/"1.1.1"', make_etag(1, 1, 1))
+    assert etag_matches('"0.0.0", "1.1.1"', '"1.1.1"')
+    assert etag_matches('*', '"1.1.1"')
+    assert not etag_matches('"1.1"', '"1.1.1"')
+
+
+@pytest.fixture
+async def atleta(client, referencias) -> dict:
+    response = await client.post('/atletas/', json=atleta_payload('12345678901'))
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.parametrize('if_none_match', ['"1.1.1"', 'W/"1.1.1"', '"9.9.9", "1.1.1"', '*'])
+async def test_get_com_etag_atual_responde_304(client, atleta, if_none_match):
+    response = await client.get(f"/atletas/{atleta['id']}", headers={'If-None-Match': if_none_match})
+
+    assert response.status_code == 304
+    assert response.headers['etag'] == '"1.1.1"'
+    assert response.content == b''
+
+
+async def test_patch_com_if_match_atual_altera(client, atleta):
+    response = await client.patch(
+        f"/atletas/{atleta['id']}", json={'idade': 30}, headers={'If-Match': '"1.1.1"'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers['etag'] == '"2.1.1"'
+    assert response.json()['idade'] == 30
+
+
+async def test_patch_com_if_match_antigo_responde_412(client, atleta):
+    await client.patch(f"/atletas/{atleta['id']}", json={'idade': 30})
+
+    response = await client.patch(
+        f"/atletas/{atleta['id']}", json={'idade': 40}, headers={'If-Match': '"1.1.1"'}
+    )
+
+    assert response.status_code == 412
+    assert (await client.get(f"/atletas/{atleta['id']}")).json()['idade'] == 30
+
+
+@pytest.mark.parametrize('if_match', ['*', '"9.9.9", "1.1.1"'])
+async def test_patch_com_if_match_que_casa(client, atleta, if_match):
+    response = await client.patch(f"/atletas/{atleta['id']}", json={'idade': 30}, headers={'If-Match': if_match})
+
+    assert response.status_code == 200
+
+
+async def test_patch_com_if_match_em_atleta_inexistente_responde_404(client, atleta):
+    response = await client.patch(
+        '/atletas/00000000-0000-0000-0000-000000000000', json={'idade': 30}, headers={'If-Match': '"1.1.1"'}
+    )
+
+    assert response.status_code == 404
+
+
+async def test_renomear_a_categoria_muda_a_etag_do_atleta(client, atleta, referencias):
+    categoria, _ = referencias
+    response = await client.patch(f'/categorias/{categoria.id}', json={'nome': 'RX'})
+    assert response.status_code == 200
+
+    response = await client.get(f"/atletas/{atleta['id']}", headers={'If-None-Match': '"1.1.1"'})
+    assert response.status_code == 200
+    assert response.headers['etag'] == '"1.2.1"'
+    assert response.json()['categoria']['nome'] == 'RX'
+
+    response = await client.patch(
+        f"/atletas/{atleta['id']}", json={'idade': 30}, headers={'If-Match': '"1.1.1"'}
+    )
+    assert response.status_code == 412
+
+
+@pytest.mark.parametrize('recurso, payload', [
+    ('categorias', {'nome': 'RX'}),
+    ('centro_treinamento', {'endereco': 'Rua Y, 200'}),
+])
+async def test_patch_de_referencia_com_if_match(client, referencias, recurso, payload):
+    id = (await client.get(f'/{recurso}/')).json()['items'][0]['id']
+
+    response = await client.patch(f'/{recurso}/{id}', json=payload, headers={'If-Match': '"1"'})
+    assert response.status_code == 200
+    assert response.headers['etag'] == '"2"'
+
+    response = await client.patch(f'/{recurso}/{id}', json=payload, headers={'If-Match': '"1"'})
+    assert response.status_code == 412
+
+    response = await client.get(f'/{recurso}/{id}', headers={'If-None-Match': '"2"'})
+    assert response.status_code == 304
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete
+
+import configs.database as database
+from atletas import controller
+from categorias.models import CategoriasModels
+from configs.settings import settings
+from conftest import atleta_payload
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def grupos(monkeypatch) -> list[list[dict]]:
+    """Liga o group commit e registra os grupos gravados."""
+    monkeypatch.setattr(settings, 'ATLETAS_GROUP_COMMIT', True)
+    # espera longa o bastante para os POSTs simultâneos caírem no mesmo grupo
+    monkeypatch.setattr(controller.insert_group, 'max_wait', 0.2)
+    registrados = []
+
+    async def flush(rows):
+        registrados.append(rows)
+        return await controller._insert_group(rows)
+
+    monkeypatch.setattr(controller.insert_group, '_flush', flush)
+    return registrados
+
+
+async def _post_simultaneos(client, payloads) -> list:
+    return await asyncio.gather(*(client.post('/atletas/', json=payload) for payload in payloads))
+
+
+async def test_posts_simultaneos_entram_num_unico_grupo(client, referencias, grupos):
+    responses = await _post_simultaneos(client, [atleta_payload(f'1111111111{i}') for i in range(3)])
+
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len(grupos) == 1 and len(grupos[0]) == 3
+    for response in responses:
+        assert (await client.get(f"/atletas/{response.json()['id']}")).status_code == 200
+
+
+async def test_cpf_repetido_no_grupo_responde_303(client, referencias, grupos):
+    assert (await client.post('/atletas/', json=atleta_payload('11111111111'))).status_code == 201
+
+    responses = await _post_simultaneos(client, [
+        atleta_payload('11111111111'), atleta_payload('22222222222'), atleta_payload('22222222222'),
+    ])
+
+    assert [response.status_code for response in responses] == [303, 201, 303]
+    assert (await client.get('/atletas/', params={'contagem': 'exact'})).json()['total'] == 2
+
+
+async def test_referencia_removida_so_falha_a_requisicao_afetada(client, referencias, grupos):
+    async with database.async_session() as session:
+        session.add(CategoriasModels(nome='Velha', created_at=datetime.now(timezone.utc)))
+        await session.commit()
+    # carrega o cache de referências com a categoria que será removida
+    assert (await client.post('/atletas/', json=atleta_payload('99999999999'))).status_code == 201
+    async with database.async_session() as session:
+        await session.execute(delete(CategoriasModels).filter_by(nome='Velha'))
+        await session.commit()
+
+    responses = await _post_simultaneos(client, [
+        atleta_payload('11111111111'),
+        atleta_payload('22222222222', categoria={'nome': 'Velha'}),
+        atleta_payload('33333333333'),
+        atleta_payload('33333333333'),
+    ])
+
+    # o grupo inteiro falha na chave estrangeira e é refeito linha a linha
+    assert len(grupos[-1]) == 4
+    assert [response.status_code for response in responses] == [201, 400, 201, 303]
+    assert responses[1].json()['detail'] == (
+        'A categoria Velha ou o centro de treinamento CT King não foi encontrado.'
+    )
+    assert (await client.get('/atletas/', params={'contagem': 'exact'})).json()['total'] == 3
+    # a falha invalidou o cache: o próximo POST já vê que a categoria não existe
+    response = await client.post('/atletas/', json=atleta_payload('44444444444', categoria={'nome': 'Velha'}))
+    assert response.json()['detail'] == 'A categoria Velha não foi encontrada.'
@@ -0,0 +1,23 @@
+from collections import deque
+from datetime import datetime, timezone
+
+import pytest
+
+from configs.slow_queries import slow_query_log
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_log_de_statements_lentos_e_so_leitura(client, monkeypatch):
+    entry = {
+        'registrado_em': datetime.now(timezone.utc), 'rota': '/atletas/{id}', 'duracao_ms': 512.0,
+        'sql': 'SELECT 1', 'parametros': [], 'executemany': False, 'plano': None,
+    }
+    monkeypatch.setattr(slow_query_log, '_entries', deque([entry]))
+
+    response = await client.delete('/internal/slow-queries')
+    assert response.status_code == 405
+
+    response = await client.get('/internal/slow-queries')
+    assert response.status_code == 200
+    assert [item['sql'] for item in response.json()] == ['SELECT 1']
@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import configs.database as database
+from categorias.models import CategoriasModels
+from configs.settings import settings
+from conftest import atleta_payload
+from contrib import pagination
+from contrib.pagination import TableCounter
+
+pytestmark = pytest.mark.anyio
+
+
+async def _criar_categorias(client, *nomes: str) -> None:
+    for nome in nomes:
+        assert (await client.post('/categorias/', json={'nome': nome})).status_code == 201
+
+
+async def _inserir_categoria_direto(nome: str) -> None:
+    # escrita que o contador deste processo não vê, como a de outro worker
+    async with database.async_session() as session:
+        session.add(CategoriasModels(nome=nome, created_at=datetime.now(timezone.utc)))
+        await session.commit()
+
+
+async def test_contador_reconcilia_com_count(engine):
+    counter = TableCounter(CategoriasModels, reconcile_interval=3600)
+    async with database.async_session() as session:
+        assert await counter.get(session) == 0
+        await _inserir_categoria_direto('A')
+        counter.add(1)
+        assert await counter.get(session) == 1
+        await _inserir_categoria_direto('B')
+        assert await counter.get(session) == 1
+
+        counter = TableCounter(CategoriasModels, reconcile_interval=0)
+        assert await counter.get(session) == 2
+
+
+@pytest.mark.parametrize('contagem', ['exact', 'cached'])
+async def test_total_sem_filtro(client, engine, contagem):
+    await _criar_categorias(client, 'A', 'B', 'C')
+
+    response = await client.get('/categorias/', params={'contagem': contagem, 'size': 1})
+
+    assert response.status_code == 200
+    assert (response.json()['total'], response.json()['contagem']) == (3, contagem)
+
+
+async def test_cached_segue_as_escritas_do_processo(client, engine):
+    await _criar_categorias(client, 'A', 'B')
+    params = {'contagem': 'cached', 'size': 1}
+    assert (await client.get('/categorias/', params=params)).json()['total'] == 2
+
+    await _inserir_categoria_direto('Outro')
+    assert (await client.get('/categorias/', params=params)).json()['total'] == 2
+
+    await _criar_categorias(client, 'C')
+    assert (await client.get('/categorias/', params=params)).json()['total'] == 3
+    id = (await client.get('/categorias/', params={'nome': 'A'})).json()['items'][0]['id']
+    assert (await client.delete(f'/categorias/{id}')).status_code == 204
+    assert (await client.get('/categorias/', params=params)).json()['total'] == 2
+
+
+async def test_cached_acompanha_post_e_delete_de_atletas(client, referencias):
+    params = {'contagem': 'cached', 'limit': 1}
+    assert (await client.get('/atletas/', params=params)).json()['total'] == 0
+
+    atletas = [(await client.post('/atletas/', json=atleta_payload(f'1111111111{i}'))).json() for i in range(3)]
+    assert (await client.get('/atletas/', params=params)).json()['total'] == 3
+
+    assert (await client.delete(f"/atletas/{atletas[0]['id']}")).status_code == 204
+    response = await client.delete('/atletas/bulk', params={'categoria': 'Scale'})
+    assert response.json() == {'afetados': 2}
+    assert (await client.get('/atletas/', params=params)).json()['total'] == 0
+
+
+async def test_padrao_vem_de_count_strategy(client, engine, monkeypatch):
+    monkeypatch.setattr(settings, 'COUNT_STRATEGY', 'cached')
+
+    assert (await client.get('/categorias/')).json()['contagem'] == 'cached'
+
+
+@pytest.mark.parametrize('contagem', ['cached', 'estimated'])
+async def test_listagem_filtrada_sem_estimativa_usa_count(client, engine, contagem):
+    await _criar_categorias(client, 'Scale', 'Scaled', 'RX')
+
+    response = await client.get('/categorias/', params={'nome': 'sca', 'contagem': contagem, 'size': 1})
+
+    assert (response.json()['total'], response.json()['contagem']) == (2, 'exact')
+
+
+async def test_estimated_fora_do_postgresql_usa_count(client, referencias):
+    await client.post('/atletas/', json=atleta_payload('11111111111'))
+
+    for path, params in (('/atletas/', {'contagem': 'estimated'}), ('/atletas/search', {'categoria': 'Scale'})):
+        response = await client.get(path, params={**params, 'limit': 1})
+        assert (response.json()['total'], response.json()['contagem']) == (1, 'exact')
+
+
+@pytest.mark.parametrize('params, total', [
+    ({'size': 1}, 1000),
+    # a página incompleta é a última: o total vira o que foi visto
+    ({'size': 50}, 2),
+    ({'size': 1, 'page': 2}, 1000),
+    # página além do fim: nada a corrigir
+    ({'size': 1, 'page': 9}, 1000),
+])
+async def test_estimativa_corrigida_pela_pagina_incompleta(client, engine, monkeypatch, params, total):
+    async def estimate(db_session, model):
+        return 1000
+
+    monkeypatch.setattr(pagination, 'estimate', estimate)
+    await _criar_categorias(client, 'A', 'B')
+
+    response = await client.get('/categorias/', params={**params, 'contagem': 'estimated'})
+
+    assert (response.json()['total'], response.json()['contagem']) == (total, 'estimated')
+
+
+async def test_estimativa_abaixo_do_visto_e_corrigida(client, engine, monkeypatch):
+    async def estimate(db_session, model):
+        return 1
+
+    monkeypatch.setattr(pagination, 'estimate', estimate)
+    await _criar_categorias(client, 'A', 'B', 'C')
+
+    response = await client.get('/categorias/', params={'size': 2, 'page': 1, 'contagem': 'estimated'})
+
+    assert response.json()['total'] == 2
+
+
+@pytest.mark.parametrize('path', ['/categorias/', '/centro_treinamento/', '/atletas/', '/atletas/search'])
+async def test_contagem_invalida_responde_422(client, engine, path):
+    assert (await client.get(path, params={'contagem': 'aproximada'})).status_code == 422
@@ -0,0 +1,217 @@
+import pytest
+
+import configs.database as database
+from configs.settings import settings
+from conftest import atleta_payload
+from contrib.dependencies import READ_PRIMARY_COOKIE
+from contrib.response_cache import CachedEntity, LRUBackend, RedisBackend, RedisError, ResponseCache, atleta_cache
+from redis_stand_in import RedisStandIn
+
+pytestmark = pytest.mark.anyio
+
+ENTIDADE = CachedEntity('"1.1.1"', b'{}')
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(atleta_cache, '_backend', LRUBackend(100))
+
+
+@pytest.fixture
+def replica(engine):
+    """Uma réplica apontando para o mesmo arquivo SQLite, descartada pela fixture `engine`."""
+    replica_engine = database._create_engine(settings.DB_URL)
+    database.replica_router.set_engines([replica_engine])
+    return replica_engine
+
+
+@pytest.fixture
+async def redis():
+    server = RedisStandIn(password='segredo')
+    await server.start()
+    yield server
+    await server.stop()
+
+
+async def _criar_atleta(client, cpf='12345678901') -> dict:
+    response = await client.post('/atletas/', json=atleta_payload(cpf))
+    assert response.status_code == 201
+    return response.json()
+
+
+async def test_patch_invalida_o_cache(client, referencias, memory_cache):
+    atleta = await _criar_atleta(client)
+    await client.get(f"/atletas/{atleta['id']}")
+    assert (await atleta_cache.get(f"id:{atleta['id']}")) is not None
+
+    response = await client.patch(f"/atletas/{atleta['id']}", json={'nome': 'Joao Novo'})
+    assert response.status_code == 200
+    assert (await atleta_cache.get(f"id:{atleta['id']}")) is None
+
+    for path in (f"/atletas/{atleta['id']}", f"/atletas/cpf/{atleta['cpf']}"):
+        response = await client.get(path)
+        assert response.json()['nome'] == 'Joao Novo'
+        assert response.headers['etag'] == '"2.1.1"'
+
+
+async def test_delete_invalida_o_cache(client, referencias, memory_cache):
+    atleta = await _criar_atleta(client)
+    assert (await client.get(f"/atletas/cpf/{atleta['cpf']}")).status_code == 200
+
+    assert (await client.delete(f"/atletas/{atleta['id']}")).status_code == 204
+    assert (await client.get(f"/atletas/{atleta['id']}")).status_code == 404
+    assert (await client.get(f"/atletas/cpf/{atleta['cpf']}")).status_code == 404
+
+
+async def test_cliente_fixado_no_primario_nao_usa_o_cache(client, referencias, memory_cache):
+    atleta = await _criar_atleta(client)
+    client.cookies.set(READ_PRIMARY_COOKIE, '9999999999')
+
+    assert (await client.get(f"/atletas/{atleta['id']}")).status_code == 200
+    assert (await atleta_cache.get(f"id:{atleta['id']}")) is None
+
+
+async def test_busca_anterior_a_invalidacao_nao_grava_no_cache():
+    cache = ResponseCache('teste', LRUBackend(100), ttl=60)
+    generation = cache.generation
+    # a escrita invalida a chave enquanto a busca ainda está em andamento
+    await cache.invalidate('id:1')
+    await cache.set(['id:1'], ENTIDADE, generation)
+    assert (await cache.get('id:1')) is None
+
+    await cache.set(['id:1'], ENTIDADE, cache.generation)
+    assert (await cache.get('id:1')) is None
+
+
+async def test_invalidacao_de_outro_worker_bloqueia_a_gravacao():
+    backend = LRUBackend(100)
+    worker_a = ResponseCache('teste', backend, ttl=60)
+    worker_b = ResponseCache('teste', backend, ttl=60)
+
+    generation = worker_a.generation
+    await worker_b.invalidate('id:1')
+    await worker_a.set(['id:1'], ENTIDADE, generation)
+    assert (await worker_a.get('id:1')) is None
+
+    await backend.delete('teste:id:1')
+    await worker_a.set(['id:1'], ENTIDADE, worker_a.generation)
+    assert (await worker_b.get('id:1')) == ENTIDADE
+
+
+@pytest.mark.parametrize('path', ['/atletas/{id}', '/atletas/cpf/{cpf}', '/atletas/nome/{nome}'])
+async def test_leitura_com_cache_ligado_continua_na_replica(client, engine, referencias, memory_cache, replica, path):
+    atleta = await _criar_atleta(client)
+    primario, secundario = engine.pool.snapshot()['checkouts'], replica.pool.snapshot()['checkouts']
+
+    assert (await client.get(path.format(**atleta))).status_code == 200
+
+    assert engine.pool.snapshot()['checkouts'] == primario
+    assert replica.pool.snapshot()['checkouts'] - secundario == 1
+    assert (await atleta_cache.get(f"id:{atleta['id']}")) is not None
+
+
+async def test_limpeza_bloqueia_a_gravacao_de_buscas_atrasadas():
+    cache = ResponseCache('teste', LRUBackend(100), ttl=60)
+    await cache.clear()
+
+    # mesmo uma busca iniciada depois da limpeza pode ter lido uma réplica atrasada
+    await cache.set(['id:1'], ENTIDADE, cache.generation)
+    assert (await cache.get('id:1')) is None
+
+
+async def test_redis_grava_le_e_invalida(redis):
+    cache = ResponseCache('teste', RedisBackend(redis.url), ttl=60)
+
+    await cache.set(['id:1', 'cpf:1'], ENTIDADE, cache.generation)
+    assert (await cache.get('id:1')) == ENTIDADE
+    assert (await cache.get('cpf:1')) == ENTIDADE
+
+    await cache.invalidate('id:1', 'cpf:1')
+    assert (await cache.get('id:1')) is None
+    # a lápide fica no Redis com validade: é ela que barra gravações de outros workers
+    expires_at, value = redis.data[b'teste:id:1']
+    assert value == b'' and expires_at is not None
+    assert [b'AUTH', b'segredo'] in redis.commands and [b'SELECT', b'1'] in redis.commands
+
+
+async def test_redis_add_nao_sobrescreve(redis):
+    backend = RedisBackend(redis.url)
+    cache = ResponseCache('teste', backend, ttl=60)
+    await cache.set(['id:1'], ENTIDADE, cache.generation)
+
+    await cache.set(['id:1'], CachedEntity('"2.1.1"', b'{"novo":1}'), cache.generation)
+
+    assert (await cache.get('id:1')) == ENTIDADE
+    assert any(command[0] == b'SET' and command[-1] == b'NX' for command in redis.commands)
+
+
+async def test_redis_lapide_de_outro_worker_bloqueia_a_gravacao(redis):
+    worker_a = ResponseCache('teste', RedisBackend(redis.url), ttl=60)
+    worker_b = ResponseCache('teste', RedisBackend(redis.url), ttl=60)
+
+    generation = worker_a.generation
+    await worker_b.invalidate('id:1')
+    await worker_a.set(['id:1'], ENTIDADE, generation)
+    assert (await worker_a.get('id:1')) is None
+
+    # a geração local de worker_a não mudou: só a lápide no Redis impediu a gravação
+    assert worker_a.generation == generation
+    del redis.data[b'teste:id:1']
+    await worker_a.set(['id:1'], ENTIDADE, generation)
+    assert (await worker_b.get('id:1')) == ENTIDADE
+
+
+async def test_redis_geracao_descarta_busca_anterior_a_escrita(redis):
+    cache = ResponseCache('teste', RedisBackend(redis.url), ttl=60)
+    generation = cache.generation
+    await cache.invalidate('id:1')
+    del redis.data[b'teste:id:1']
+
+    await cache.set(['id:1'], ENTIDADE, generation)
+
+    assert b'teste:id:1' not in redis.data
+
+
+async def test_redis_clear_remove_so_o_namespace(redis):
+    backend = RedisBackend(redis.url)
+    cache = ResponseCache('teste', backend, ttl=60)
+    # mais chaves que o COUNT de uma página do SCAN
+    for i in range(2500):
+        await backend.set(f'teste:id:{i}', ENTIDADE.dumps(), 60)
+    await backend.set('outro:id:1', b'x', 60)
+
+    await cache.clear()
+
+    assert set(redis.data) == {b'outro:id:1', b'teste:!cleared'}
+    await cache.set(['id:1'], ENTIDADE, cache.generation)
+    assert (await cache.get('id:1')) is None
+
+
+async def test_redis_reaproveita_as_conexoes(redis):
+    backend = RedisBackend(redis.url)
+    for i in range(5):
+        await backend.get(f'teste:{i}')
+
+    assert redis.connections == 1
+
+
+async def test_redis_erro_vira_miss_sem_derrubar_a_leitura(redis):
+    cache = ResponseCache('teste', RedisBackend(redis.url.replace('segredo', 'errada')), ttl=60)
+
+    with pytest.raises(RedisError):
+        await cache._backend.get('teste:id:1')
+    assert (await cache.get('id:1')) is None
+    assert cache.errors == 1
+
+
+async def test_patch_invalida_o_cache_no_redis(client, referencias, redis, monkeypatch):
+    monkeypatch.setattr(atleta_cache, '_backend', RedisBackend(redis.url))
+    atleta = await _criar_atleta(client)
+    await client.get(f"/atletas/{atleta['id']}")
+    assert (await atleta_cache.get(f"cpf:{atleta['cpf']}")) is not None
+
+    assert (await client.patch(f"/atletas/{atleta['id']}", json={'nome': 'Joao Novo'})).status_code == 200
+
+    assert redis.data[f"atletas:cpf:{atleta['cpf']}".encode()][1] == b''
+    response = await client.get(f"/atletas/cpf/{atleta['cpf']}")
+    assert response.json()['nome'] == 'Joao Novo'
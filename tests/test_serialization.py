@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from atletas.models import AtletasModels
+from atletas.schema import AtletasOut
+from categorias.models import CategoriasModels
+from centro_treinamento.models import CentroTreinamentoModels
+from conftest import atleta_payload
+from contrib.serialization import ORJSONResponse, dump_json
+
+pytestmark = pytest.mark.anyio
+
+# dentro e fora de [1e-4, 1e16), onde o json da stdlib passa à notação científica
+FLOATS = [75.5, 0.1, 1e-4, 1e-05, 1e-07, 0.00001234, 1e15, 1e16, 1.5e300, 123456789.123]
+
+
+def _atleta(peso: float, altura: float) -> AtletasModels:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return AtletasModels(
+        id=UUID('1e5e0000-0000-4000-8000-00000000e160'),
+        nome='Atleta Ção',
+        cpf='12345678901',
+        idade=25,
+        peso=peso,
+        altura=altura,
+        sexo='M',
+        created_at=created_at,
+        categoria=CategoriasModels(nome='Scale', created_at=created_at),
+        centro_treinamento=CentroTreinamentoModels(
+            nome='CT São João', endereco='Rua A, 1', proprietario='José', created_at=created_at
+        ),
+    )
+
+
+async def _response_model(schema, content) -> bytes:
+    field = create_model_field(name='Response', type_=schema, mode='serialization')
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+@pytest.mark.parametrize('peso', FLOATS)
+@pytest.mark.parametrize('altura', [1.7, 1e-05])
+async def test_dump_json_igual_ao_response_model(peso, altura):
+    atleta = _atleta(peso, altura)
+
+    assert dump_json(AtletasOut, atleta) == await _response_model(AtletasOut, atleta)
+
+
+@pytest.mark.parametrize('valor', FLOATS + [-1e16, 0.0, 3])
+def test_orjson_response_igual_ao_json_response(valor):
+    content = {'valor': valor, 'lista': [valor], 'id': '1e5e0000-0000-4000-8000-00000000e160', 'nome': 'Ção'}
+
+    assert ORJSONResponse(content).body == JSONResponse(content).body
+
+
+async def test_endpoint_serve_floats_no_formato_da_stdlib(client, referencias):
+    response = await client.post('/atletas/', json=atleta_payload('12345678901', peso=1e-05, altura=1e16))
+    assert response.status_code == 201
+    atleta = response.json()
+
+    response = await client.get(f"/atletas/{atleta['id']}")
+    assert response.headers['content-type'] == 'application/json'
+    assert response.content == JSONResponse(response.json()).body
+    assert b'"peso":1e-05,"altura":1e+16' in response.content
+
+    response = await client.get('/atletas/', params={'contagem': 'exact'})
+    assert response.json()['items'] == [{
+        'nome': 'Joao', 'categoria': {'nome': 'Scale'}, 'centro_treinamento': {'nome': 'CT King'},
+    }]
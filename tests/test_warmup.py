@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import event
+
+from conftest import atleta_payload
+from contrib import warmup
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_warm_pool_roda_os_selectin_das_relacoes(client, engine, referencias):
+    atleta = (await client.post('/atletas/', json=atleta_payload('12345678901'))).json()
+    executados = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        executados.append(' '.join(statement.split()))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', registrar)
+    try:
+        await warmup.warm_pool(engine, 1)
+        assert any('FROM categorias WHERE categorias.pk_id IN' in sql for sql in executados)
+        assert any('FROM centros_treinamento WHERE centros_treinamento.pk_id IN' in sql for sql in executados)
+
+        # a consulta pontual, com os loaders das relações, já está no cache de compilação
+        compilados = len(engine.sync_engine._compiled_cache)
+        response = await client.get(f"/atletas/{atleta['id']}")
+        assert response.status_code == 200
+        assert len(engine.sync_engine._compiled_cache) == compilados
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', registrar)